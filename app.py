@@ -1,13 +1,127 @@
-"""This module initializes the app"""
+"""This module initializes the app
 
-import sys
+Usage:
+    python app.py [--db PATH] [--profile-startup] [--trace-sql [PATH]] [--test_config]
+"""
+
+import argparse
+import json
 import logging
+import os
+import sys
+import time
+
+STARTED_AT = time.perf_counter()
+
+# pylint: disable=wrong-import-position
 from PyQt5 import QtGui
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QEvent, QObject
+from PyQt5.QtWidgets import QApplication, QShortcut
 
+from controllers.db_worker import DbWorker
 from controllers.main_controller import MainWindowController
 from views.main_view import MainWindowView
-from model.main_model import Model
+from model.main_model import DB_PATH, Model
+from model.tracing import SqlTracer
+# pylint: enable=wrong-import-position
+
+IMPORTED_AT = time.perf_counter()
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# writes the sql metrics collected so far when the app runs with --trace-sql
+DUMP_TRACE_SHORTCUT = "Ctrl+Shift+T"
+
+
+class StartupProfiler(QObject):
+    """
+    A class used to measure the start-up phases of the app: imports, model open, ui build and first paint.
+    The timings are printed as json in milliseconds once the main window is painted for the first time
+    and the model is open. The model is opened on the db thread, so it overlaps with the other phases.
+
+    Methods
+    -------
+    phase(self, name)
+    watch_model(self, db_worker)
+    watch_first_paint(self, widget)
+    report(self)
+    """
+
+    def __init__(self, started_at, imported_at):
+        """
+        Parameters
+        ----------
+        started_at: float
+            time.perf_counter() before the imports
+        imported_at: float
+            time.perf_counter() after the imports
+        """
+
+        super().__init__()
+        self.started_at = started_at
+        self.timings = {"imports": self._msecs(started_at, imported_at)}
+        self._phase_started_at = imported_at
+
+    @staticmethod
+    def _msecs(start, end):
+        """Returns the time between two perf_counter() values in milliseconds"""
+
+        return round((end - start) * 1000, 1)
+
+    def phase(self, name):
+        """Ends a phase that started at the end of the previous one
+
+        Parameters
+        ----------
+        name: str
+        """
+
+        now = time.perf_counter()
+        self.timings[name] = self._msecs(self._phase_started_at, now)
+        self._phase_started_at = now
+
+    def watch_model(self, db_worker):
+        """Measures the time until the model is open on the db thread
+
+        Parameters
+        ----------
+        db_worker: object
+            instance of class DbWorker that was just created
+        """
+
+        opening_started_at = time.perf_counter()
+
+        def on_model_open(_result):
+            self.timings["model open"] = self._msecs(opening_started_at, time.perf_counter())
+            self.report()
+
+        # write jobs run after the job that opens the model
+        db_worker.submit(lambda _model: None, on_result=on_model_open, write=True)
+
+    def watch_first_paint(self, widget):
+        """Measures the time until the widget is painted for the first time
+
+        Parameters
+        ----------
+        widget: object
+            the main window, before it is shown
+        """
+
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):  # pylint: disable=invalid-name
+        """Ends the first paint phase on the first paint event of the watched widget"""
+
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            self.phase("first paint")
+            self.report()
+        return False
+
+    def report(self):
+        """Prints the timings once all phases are measured"""
+
+        if "first paint" in self.timings and "model open" in self.timings:
+            self.timings["total"] = self._msecs(self.started_at, time.perf_counter())
+            print(json.dumps({"startup_ms": self.timings}), flush=True)
 
 
 class App(QApplication):
@@ -20,43 +134,91 @@ class App(QApplication):
 
     Methods
     -------
+    dump_trace(self)
     close_event(self)
     """
 
-    def __init__(self, sys_argv):
+    def __init__(self, sys_argv, test_mode=False, profiler=None, tracer=None, db_path=DB_PATH):
+        """
+        Parameters
+        ----------
+        sys_argv: list
+            arguments for QApplication
+        test_mode: bool
+            True if the app was started with --test_config
+        profiler: object
+            instance of class StartupProfiler or None
+        tracer: object
+            instance of class SqlTracer or None
+        db_path: str
+            path to the db file
+        """
+
         super().__init__(sys_argv)
+        self.tracer = tracer
 
-        test_mode = False
-        if sys_argv[1] == "--test_config":
-            test_mode = True
-        self.app = QApplication(sys_argv)
-        self.model = Model()
-        self.controller = MainWindowController(self.model)
-        self.main_view = MainWindowView(self.controller, test_mode)
+        # the model is opened on the db thread, the GUI thread never touches the db
+        self.db_worker = DbWorker(lambda: Model(db_path, tracer=tracer))
+        if profiler is not None:
+            profiler.watch_model(self.db_worker)
 
+        self.controller = MainWindowController(None, self.db_worker)
+        self.main_view = MainWindowView(self.controller, test_mode)
         self.controller.on_start_up()
 
+        if profiler is not None:
+            profiler.phase("ui build")
+            profiler.watch_first_paint(self.main_view)
         self.main_view.show()
 
-        if sys_argv[1] == "--test_config":
-            print(f"Got our argument from command line: {sys_argv[1]}")
+        if tracer is not None:
+            QShortcut(QtGui.QKeySequence(DUMP_TRACE_SHORTCUT), self.main_view, self.dump_trace)
+
+        if test_mode:
+            print("Got our argument from command line: --test_config")
 
-        self.app.aboutToQuit.connect(self.close_event)
+        self.aboutToQuit.connect(self.close_event)
+
+    def dump_trace(self):
+        """Writes the sql metrics collected so far to the json file of the tracer"""
+
+        if self.tracer is not None:
+            path = self.tracer.dump()
+            logging.info(f'Sql metrics are written to {path}')
 
     def close_event(self):
-        """Call the function clean from model.py"""
-        self.model.clean()
+        """Waits for the db jobs, closes the db connection and writes the sql metrics"""
+        self.db_worker.close()
+        self.dump_trace()
 
 
-if __name__ == "__main__":
+def main():
+    """Parses the command line and runs the app"""
+
+    parser = argparse.ArgumentParser(description="To do list app")
+    parser.add_argument("--test_config", action="store_true", help="start the app in test mode")
+    parser.add_argument("--db", default=DB_PATH, metavar="PATH", help="path to the db file")
+    parser.add_argument("--profile-startup", action="store_true", help="print the timings of the start-up phases")
+    parser.add_argument(
+        "--trace-sql", nargs="?", const="sql_trace.json", metavar="PATH",
+        help=f"record the latency of the db methods and statements, written on exit and on {DUMP_TRACE_SHORTCUT}",
+    )
+    # the other arguments are passed on to Qt
+    args, qt_args = parser.parse_known_args()
+
     logging.basicConfig(filename='todolist.log', encoding='utf-8', level=logging.DEBUG)
-    app = App(sys.argv)
-    app.setWindowIcon(QtGui.QIcon("app_icon.png"))
+    profiler = StartupProfiler(STARTED_AT, IMPORTED_AT) if args.profile_startup else None
+    tracer = SqlTracer(args.trace_sql) if args.trace_sql else None
+    app = App(sys.argv[:1] + qt_args, args.test_config, profiler, tracer, args.db)
+    app.setWindowIcon(QtGui.QIcon(os.path.join(APP_DIR, "app_icon.png")))
 
-    SSH_FILE = "/Users/katestepanova/repos/to_do_list_app/style.qss"
-    with open(SSH_FILE, "r", encoding='utf-8') as fh:
+    with open(os.path.join(APP_DIR, "style.qss"), "r", encoding='utf-8') as fh:
         _style = fh.read()
         print("Style is loaded")
         app.setStyleSheet(_style)
 
     sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
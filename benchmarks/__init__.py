@@ -0,0 +1 @@
+"""Benchmarks for the app. Each module can be run with `python -m benchmarks.<module>`."""
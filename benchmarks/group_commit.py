@@ -0,0 +1,75 @@
+"""This module compares the speed of task changes with one commit per change and with grouped commits.
+
+Usage:
+    python -m benchmarks.group_commit [--tasks 2000]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from model.db_pool import ConnectionPool
+from model.main_model import Model
+
+
+def run_case(db_path, tasks, journal_mode, synchronous, grouped):
+    """Creates and completes tasks and returns the number of changes per second
+
+    Parameters
+    ----------
+    db_path: str
+    tasks: int
+        number of tasks to create and complete
+    journal_mode: str
+    synchronous: str
+    grouped: bool
+        True to make all changes inside one Model.transaction()
+    """
+
+    model = Model(pool=ConnectionPool(db_path, synchronous=synchronous, journal_mode=journal_mode))
+
+    start = time.perf_counter()
+    if grouped:
+        with model.transaction():
+            _make_changes(model, tasks)
+    else:
+        _make_changes(model, tasks)
+    elapsed = time.perf_counter() - start
+
+    model.clean()
+    return round(tasks * 2 / elapsed, 1)
+
+
+def _make_changes(model, tasks):
+    """Creates the tasks and completes each of them"""
+
+    for idx in range(tasks):
+        task = model.create_task(f"task {idx}")
+        model.complete_task(task.task_id)
+
+
+def main():
+    """Runs the benchmark cases and prints the results as json"""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = {
+        "rollback journal, commit per change (before)": ("DELETE", "FULL", False),
+        "wal, commit per change": ("WAL", "NORMAL", False),
+        "wal, grouped commit": ("WAL", "NORMAL", True),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for idx, (case, settings) in enumerate(cases.items()):
+            db_path = os.path.join(tmp_dir, f"case_{idx}.db")
+            results[case] = run_case(db_path, args.tasks, *settings)
+
+    print(json.dumps({"tasks": args.tasks, "changes_per_second": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
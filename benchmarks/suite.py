@@ -0,0 +1,383 @@
+"""This module times the key paths of the app on synthetic dbs of different sizes.
+
+It builds a db for every size with varied names, notes, tags, due dates and states, then times
+Model queries and changes, the construction and start-up of the controller and filling the main
+window with tasks. The window runs on the offscreen Qt platform, so no display is needed.
+The results are printed as json and can be compared with the results of an earlier run.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000 100000 1000000] [--output results.json]
+                               [--compare previous.json] [--data-dir dbs]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position
+from PyQt5.QtWidgets import QApplication
+
+from controllers.main_controller import MainWindowController
+from model.dates import due_range, today_ordinal
+from model.main_model import PAGE_SIZE, Model
+from views.main_view import MainWindowView
+from views.task_filter_model import DEFAULT_SORT
+# pylint: enable=wrong-import-position
+
+SIZES = (1000, 100000, 1000000)
+WORDS = (
+    "buy", "call", "send", "write", "fix", "plan", "read", "book", "pay", "clean",
+    "report", "invoice", "groceries", "dentist", "meeting", "slides", "garden", "car", "tickets", "review",
+)
+TAGS = ("errands", "finance", "health", "reading", "travel", "family", "shopping", "learning")
+# a case that got slower than the previous run by more than this factor is marked as a regression
+REGRESSION_FACTOR = 1.2
+
+
+def synthetic_tasks(count, today, seed=0):
+    """Yields task rows for Model.create_tasks_bulk
+
+    Parameters
+    ----------
+    count: int
+        number of tasks
+    today: int
+        the ordinal of the day that the due dates are spread around
+    seed: int
+        the same seed gives the same tasks
+    """
+
+    rng = random.Random(seed)
+    tag_ids = range(1, 4 + len(TAGS))
+    now = int(time.time())
+    year = 365 * 24 * 3600
+
+    for idx in range(count):
+        name = f"{' '.join(rng.sample(WORDS, rng.randint(1, 3)))} {idx}"
+        # every third task has no due date, the others are due within two months before or after today
+        due_date = None if rng.random() < 0.33 else today + rng.randint(-60, 60)
+        completed = int(rng.random() < 0.3)
+        notes = " ".join(rng.sample(WORDS, 4)) if rng.random() < 0.4 else "NULL"
+        removed = int(rng.random() < 0.05)
+        time_added = now - rng.randint(0, year)
+        yield name, due_date, completed, notes, removed, time_added, rng.choice(tag_ids)
+
+
+def build_database(db_path, count, seed=0):
+    """Creates a db with count synthetic tasks unless it exists already
+
+    Parameters
+    ----------
+    db_path: str
+    count: int
+        number of tasks
+    seed: int
+    """
+
+    if os.path.exists(db_path):
+        return
+
+    model = Model(db_path)
+    for tag in TAGS:
+        model.create_tag(tag)
+    model.create_tasks_bulk(synthetic_tasks(count, today_ordinal(), seed), batch_size=5000)
+    model.app_db.execute("ANALYZE")
+    model.clean()
+
+
+def measure(function, repeat, setup=None):
+    """Calls a function repeat times and returns its timings in milliseconds
+
+    Parameters
+    ----------
+    function: callable
+        called without arguments, or with the result of setup
+    repeat: int
+    setup: callable
+        called before every run of the function and not timed
+    """
+
+    timings = []
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        function(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "runs": repeat,
+    }
+
+
+def model_cases(model, today):
+    """Returns the Model operations to time by their names
+
+    Parameters
+    ----------
+    model: object
+        instance of class Model
+    today: int
+        the ordinal of the current day
+    """
+
+    first_page = model.get_tasks_page("incomplete")
+    last_task_id = model.get_last_task_id()
+    rng = random.Random(1)
+
+    def create_and_complete():
+        task = model.create_task("benchmark task")
+        model.complete_task(task.task_id)
+
+    return {
+        "first page of incomplete tasks": lambda: model.get_tasks_page("incomplete"),
+        "next page of incomplete tasks": lambda: model.get_tasks_page("incomplete", first_page[-1]),
+        "first page of completed tasks": lambda: model.get_tasks_page("completed"),
+        "first page of overdue tasks": lambda: model.get_tasks_page("overdue", params=(today,)),
+        "first page of tasks due this week": lambda: model.get_tasks_page("due", params=due_range("week", today)),
+        "task counters": lambda: model.get_task_counters(today),
+        "overdue count": lambda: model.get_overdue_count(today),
+        "task info": lambda: model.get_task_info(rng.randint(1, last_task_id)),
+        "search a common word": lambda: model.search_tasks("meeting"),
+        "search a prefix": lambda: model.search_tasks("gro"),
+        "search without matches": lambda: model.search_tasks("zzz"),
+        "tags": model.get_all_tags,
+        "create and complete a task": create_and_complete,
+    }
+
+
+def run_model_cases(db_path, repeat):
+    """Times opening the db and the Model operations
+
+    Parameters
+    ----------
+    db_path: str
+    repeat: int
+    """
+
+    results = {"open model": measure(lambda: Model(db_path).clean(), repeat)}
+
+    model = Model(db_path)
+    for case, function in model_cases(model, today_ordinal()).items():
+        results[case] = measure(function, repeat)
+    model.clean()
+
+    return results
+
+
+def window_cases(app, window, model):
+    """Returns the main window operations to time by their names, with the setup of every operation
+
+    Parameters
+    ----------
+    app: object
+        instance of class QApplication
+    window: object
+        instance of class MainWindowView that is shown and started up
+    model: object
+        instance of class Model that the controller of the window uses
+    """
+
+    page = model.get_tasks_page("incomplete")
+    next_page = model.get_tasks_page("incomplete", page[-1])
+
+    def show_page():
+        window.set_tasks(page, True)
+        window.task_list.viewport().repaint()
+
+    def scroll_to_next_page():
+        show_page()
+        window.append_tasks(next_page, True)
+        window.task_list.scrollToBottom()
+        window.task_list.viewport().repaint()
+
+    def load_next_page(_cleared):
+        window.controller.load_task_list("incomplete")
+        window.controller.fetch_more_tasks(page[-1])
+        app.processEvents()
+
+    def switch_cached_lists():
+        window.controller.load_task_list("completed")
+        window.controller.load_task_list("incomplete")
+        app.processEvents()
+
+    def sort_cached_list():
+        window.filter_models["incomplete"].set_sort("Due date", True)
+        window.filter_models["incomplete"].set_sort(DEFAULT_SORT, False)
+
+    return {
+        "show and paint a page": (show_page, None),
+        "append and paint the next page": (scroll_to_next_page, None),
+        # the pages of the cached lists are dropped before every run, so that they are queried
+        "load two pages through the controller": (load_next_page, window.controller.clear_cached_lists),
+        "switch between cached lists": (switch_cached_lists, None),
+        "group by due date and sort back": (sort_cached_list, None),
+    }
+
+
+def run_ui_cases(app, db_path, repeat):
+    """Times the controller start-up and filling the main window with tasks
+
+    Parameters
+    ----------
+    app: object
+        instance of class QApplication
+    db_path: str
+    repeat: int
+    """
+
+    model = Model(db_path)
+    windows = []
+
+    def create_controller():
+        return MainWindowController(model)
+
+    def create_window():
+        window = MainWindowView(create_controller(), False)
+        windows.append(window)
+        return window
+
+    def start_up(window):
+        window.controller.on_start_up()
+        app.processEvents()
+
+    results = {
+        "controller construction": measure(create_controller, repeat),
+        "main window construction": measure(create_window, repeat),
+        "controller on_start_up": measure(start_up, repeat, setup=create_window),
+    }
+
+    window = create_window()
+    window.controller.on_start_up()
+    window.show()
+    app.processEvents()
+    for case, (function, setup) in window_cases(app, window, model).items():
+        results[case] = measure(function, repeat, setup)
+
+    for window in windows:
+        window.close()
+        window.deleteLater()
+    app.processEvents()
+    model.clean()
+
+    return results
+
+
+def compare(results, previous):
+    """Returns the cases whose median got slower than in the previous results
+
+    Parameters
+    ----------
+    results: dict
+        results of this run
+    previous: dict
+        results of an earlier run in the same format
+
+    Returns
+    -------
+    dict
+        "size/case" -> median of this run divided by the previous median
+    """
+
+    regressions = {}
+    for size, cases in results["sizes"].items():
+        for case, timing in cases.items():
+            before = previous.get("sizes", {}).get(size, {}).get(case)
+            if before is None or before["median_ms"] == 0:
+                continue
+            ratio = timing["median_ms"] / before["median_ms"]
+            if ratio > REGRESSION_FACTOR:
+                regressions[f"{size}/{case}"] = round(ratio, 2)
+
+    return regressions
+
+
+def run_suite(sizes, data_dir, repeat, seed=0):
+    """Builds the dbs and runs all cases for every size
+
+    Parameters
+    ----------
+    sizes: iterable
+        numbers of tasks
+    data_dir: str
+        directory for the synthetic dbs. A db that exists already is reused.
+    repeat: int
+        number of runs of every case
+    seed: int
+    """
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "page_size": PAGE_SIZE,
+        },
+        "sizes": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            db_path = os.path.join(data_dir, f"tasks_{size}_seed{seed}.db")
+            start = time.perf_counter()
+            build_database(db_path, size, seed)
+            build_ms = round((time.perf_counter() - start) * 1000, 1)
+
+            # the cases change the db, they run on a copy so that the built db stays the same between runs
+            work_path = os.path.join(tmp_dir, f"tasks_{size}.db")
+            shutil.copyfile(db_path, work_path)
+            cases = run_model_cases(work_path, repeat)
+            cases.update(run_ui_cases(app, work_path, repeat))
+            results["sizes"][str(size)] = cases
+            results.setdefault("build_ms", {})[str(size)] = build_ms
+
+    return results
+
+
+def main():
+    """Runs the benchmark suite and prints the results as json"""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="numbers of tasks")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs of every case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="keeps the synthetic dbs to reuse them in the next runs")
+    parser.add_argument("--output", help="writes the results to this json file as well")
+    parser.add_argument("--compare", help="json file of an earlier run to look for regressions")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        results = run_suite(args.sizes, args.data_dir, args.repeat, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = run_suite(args.sizes, data_dir, args.repeat, args.seed)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            results["regressions"] = compare(results, json.load(fh))
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(output + "\n")
+
+    return 1 if results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
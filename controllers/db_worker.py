@@ -0,0 +1,283 @@
+"""This module runs the db operations of the controller as jobs, on the GUI thread or in background threads"""
+
+import logging
+import threading
+import types
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+def run_job(model, job, args):
+    """Runs one job against a model and returns its result
+
+    Parameters
+    ----------
+    model: object
+        instance of class Model
+    job: str or callable
+        name of a Model method or a function that takes the model as the first argument
+    args: tuple
+        arguments for the job
+    """
+
+    if isinstance(job, str):
+        result = getattr(model, job)(*args)
+    else:
+        result = job(model, *args)
+
+    # generators must be consumed on the thread that owns the connection
+    if isinstance(result, types.GeneratorType):
+        result = list(result)
+    return result
+
+
+class SyncDbExecutor:
+    """
+    A class used to run jobs directly on the calling thread. It is used when the controller
+    works without a DbWorker, e.g. in tests, and has the same submit() interface.
+
+    Attributes
+    ----------
+    writes_submitted: int
+        number of write jobs submitted so far
+    writes_finished: int
+        number of write jobs finished so far, a write finishes right away here
+
+    Methods
+    -------
+    submit(self, job, args, on_result, write)
+    """
+
+    def __init__(self, model):
+        """
+        Parameters
+        ----------
+        model: object
+            instance of class Model
+        """
+
+        self.model = model
+        self.writes_submitted = 0
+        self.writes_finished = 0
+
+    def submit(self, job, args=(), on_result=None, write=False):
+        """Runs the job and passes its result to on_result right away"""
+
+        if write:
+            self.writes_submitted += 1
+            self.writes_finished += 1
+        result = run_job(self.model, job, args)
+        if on_result is not None:
+            on_result(result)
+
+
+class JobSignals(QObject):
+    """Signals of one job. They are emitted from a worker thread and delivered on the GUI thread."""
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class DbJob(QRunnable):
+    """A job that runs on a thread of the DbWorker pools with the model of that thread"""
+
+    def __init__(self, worker, job, args):
+        super().__init__()
+        self.worker = worker
+        self.job = job
+        self.args = args
+        self.signals = JobSignals()
+
+    def run(self):
+        """Runs the job and emits its result or the raised exception"""
+
+        try:
+            result = run_job(self.worker.thread_model(), self.job, self.args)
+        except Exception as error:  # pylint: disable=broad-except
+            # the traceback holds the frames of this thread, including its model
+            self.signals.failed.emit(error.with_traceback(None))
+            return
+        self.signals.finished.emit(result)
+
+
+class ThreadJob(QRunnable):
+    """A job that calls a function on the pool thread it runs on.
+
+    DbWorker uses it to open the model on the writer thread and to close the connections
+    of every pool thread on that thread. The barrier keeps each job busy until all of them
+    have started, which makes every thread of a pool take exactly one job.
+    """
+
+    def __init__(self, function, barrier=None):
+        super().__init__()
+        self.function = function
+        self.barrier = barrier
+
+    def run(self):
+        """Calls the function"""
+
+        try:
+            self.function()
+        finally:
+            if self.barrier is not None:
+                try:
+                    self.barrier.wait(timeout=5)
+                except threading.BrokenBarrierError:
+                    logging.warning("Not all db threads took a job")
+
+
+class DbWorker(QObject):
+    """
+    A class used to run db operations off the GUI thread.
+
+    Writes run one after another on a single thread, reads run on a pool of threads and
+    may overlap with each other and with a write. All jobs share one Model, created with
+    model_factory on the writer thread. Its ConnectionPool gives the writer thread the
+    writer connection and every reader thread its own reader connection.
+    Results are delivered to the callbacks through queued signals on the GUI thread.
+
+    Attributes
+    ----------
+    writes_submitted: int
+        number of write jobs submitted so far
+    writes_finished: int
+        number of write jobs whose result or error was delivered on the GUI thread so far.
+        A read that saw the same count before and after it ran missed no finished write.
+
+    Signals
+    -------
+    job_failed(object)
+        emitted with the exception raised by a job
+
+    Methods
+    -------
+    thread_model(self)
+    submit(self, job, args, on_result, write)
+    wait(self)
+    close_thread_connections(self)
+    close(self)
+    """
+
+    job_failed = pyqtSignal(object)
+
+    def __init__(self, model_factory, readers=2, parent=None):
+        """
+        Parameters
+        ----------
+        model_factory: callable
+            returns a new instance of class Model, called once on the writer thread.
+            Its pool must allow at least `readers` reader connections.
+        readers: int
+            number of threads for the read jobs
+        """
+
+        super().__init__(parent)
+        self.model_factory = model_factory
+        self._model = None
+        self._model_ready = threading.Event()
+        # signals of the jobs that are not finished yet, they must live until their result is delivered
+        self._pending = set()
+        self.writes_submitted = 0
+        self.writes_finished = 0
+
+        self.write_pool = QThreadPool(self)
+        self.write_pool.setMaxThreadCount(1)
+        # keep the writer thread and its connection for the whole session
+        self.write_pool.setExpiryTimeout(-1)
+
+        self.read_pool = QThreadPool(self)
+        self.read_pool.setMaxThreadCount(readers)
+        # reader threads are kept as well, so close() can close their connections on their own threads
+        self.read_pool.setExpiryTimeout(-1)
+
+        self.write_pool.start(ThreadJob(self._open_model))
+
+    def _open_model(self):
+        """Creates the model on the writer thread, so the writer connection belongs to it"""
+
+        try:
+            self._model = self.model_factory()
+        finally:
+            self._model_ready.set()
+
+    def thread_model(self):
+        """Returns the shared model, waiting until the writer thread has opened it"""
+
+        self._model_ready.wait()
+        if self._model is None:
+            raise RuntimeError("The db could not be opened")
+        return self._model
+
+    def submit(self, job, args=(), on_result=None, write=False):
+        """Queues a job
+
+        Parameters
+        ----------
+        job: str or callable
+            name of a Model method or a function that takes the model as the first argument
+        args: tuple
+            arguments for the job
+        on_result: callable
+            called on the GUI thread with the result of the job
+        write: bool
+            True for jobs that change the db. They are run one at a time in the order they were submitted.
+        """
+
+        db_job = DbJob(self, job, args)
+        signals = db_job.signals
+        self._pending.add(signals)
+
+        if write:
+            self.writes_submitted += 1
+            # counted before on_result runs, so the reads that on_result submits see the write as finished
+            signals.finished.connect(self._count_finished_write)
+            signals.failed.connect(self._count_finished_write)
+        if on_result is not None:
+            signals.finished.connect(on_result)
+        signals.failed.connect(self._on_job_failed)
+        signals.finished.connect(lambda _result: self._pending.discard(signals))
+        signals.failed.connect(lambda _error: self._pending.discard(signals))
+
+        pool = self.write_pool if write else self.read_pool
+        pool.start(db_job)
+
+    def _count_finished_write(self, _result):
+        """Counts a write job whose result or error was delivered"""
+
+        self.writes_finished += 1
+
+    def _on_job_failed(self, error):
+        """Logs the exception of a failed job and passes it on"""
+
+        logging.error(f'Db job failed: {error!r}')
+        self.job_failed.emit(error)
+
+    def wait(self, msecs=-1):
+        """Waits until all queued jobs are finished
+
+        Parameters
+        ----------
+        msecs: int
+            timeout in milliseconds, -1 waits without a timeout
+        """
+
+        return self.write_pool.waitForDone(msecs) and self.read_pool.waitForDone(msecs)
+
+    def close_thread_connections(self):
+        """Closes the db connections of the current thread"""
+
+        if self._model is not None:
+            self._model.clean()
+
+    def close(self):
+        """Waits for the queued jobs and closes the connections of all worker threads"""
+
+        self.wait()
+
+        readers = self.read_pool.maxThreadCount()
+        barrier = threading.Barrier(readers)
+        for _ in range(readers):
+            self.read_pool.start(ThreadJob(self.close_thread_connections, barrier))
+        self.write_pool.start(ThreadJob(self.close_thread_connections))
+
+        self.wait()
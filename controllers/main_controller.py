@@ -1,10 +1,23 @@
 """This module contains functionality of a controller which communicates with view and model modules"""
 
-from datetime import date
-from PyQt5.QtCore import QObject
+import logging
 
+from PyQt5.QtCore import QObject, QStringListModel, QTimer
 
-class MainWindowController(QObject):
+from controllers.db_worker import SyncDbExecutor
+from controllers.reminders import REMINDER_DAYS, ReminderScheduler
+from controllers.task_counters import TaskCounters
+from model.dates import due_range, msecs_until_next_day, now_timestamp, today_ordinal
+from model.importer import import_tasks
+from model.main_model import PAGE_SIZE, TRASH_RETENTION_DAYS, task_in_list, task_matches_text
+
+# the db is compacted once nothing was loaded or changed for this number of milliseconds
+IDLE_DELAY = 30000
+# pause between two steps of compacting, so the jobs of the user don't wait behind a long vacuum
+VACUUM_STEP_DELAY = 200
+
+
+class MainWindowController(QObject):  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """
     A class used to represent Controlle module.
 
@@ -12,6 +25,33 @@ class MainWindowController(QObject):
     ----------
     model: object
         instance of class Model
+    db: object
+        instance of class DbWorker or SyncDbExecutor. All db operations are submitted to it as jobs
+        and their results are handled in callbacks.
+    tasks: dict
+        loaded tasks by their task_id: the pages of the cached lists and the tasks of the shown list.
+        Mutations apply the changes returned by the model instead of reloading the list.
+    cached_lists: set
+        names of the lists whose loaded pages the view keeps in memory and updates on every change.
+        Showing one of them again runs no query.
+    task_list_name: str
+        name of the list shown on the main page, see TASK_LISTS in main_model.py. The list is
+        loaded page by page while the user scrolls.
+    task_list_params: tuple
+        values for the filter of the shown list, e.g. the first and the last day of a due list
+    counters: object
+        instance of class TaskCounters with the numbers for the task overview
+    day_timer: object
+        single shot QTimer that fires once at the next midnight to refresh the overdue state
+    tag_model: object
+        QStringListModel with the tag names, shared by the tag boxes of all edit windows.
+        It is filled once on the start of the app and again only after the tags were changed.
+    idle_timer: object
+        single shot QTimer that compacts the db step by step while the user does nothing.
+        It is restarted on every load and change.
+    reminders: object
+        instance of class ReminderScheduler with the reminders of the tasks due in the next REMINDER_DAYS.
+        Every change of a stored task schedules it again.
 
     Methods
     -------
@@ -20,28 +60,69 @@ class MainWindowController(QObject):
     set_confirmation_dialog
     on_start_up(self)
     update_task_list
+    load_task_list
+    fetch_more_tasks
+    get_due_tasks
+    get_overdue_tasks
+    add_tag
+    get_removed_tasks
+    clear_cached_lists
+    complete_tasks
+    delete_tasks
+    retag_tasks
+    restore_tasks
+    purge_tasks
+    purge_trash
+    run_idle_work
+    load_reminders
+    schedule_day_change
+    on_day_changed
     update_task_overview
     add_task_to_the_list
+    in_shown_list
+    import_tasks
+    apply_task_changes
     show_edit_window
     save_changes
+    search_tasks
     """
 
-    def __init__(self, model):
+    def __init__(self, model, db_worker=None):
         """
         Parameters
         ----------
         model :object
-            instance of class Model
+            instance of class Model. It is used on the GUI thread if there is no db_worker.
+        db_worker: object
+            instance of class DbWorker that runs the db operations in background threads
         """
 
         super().__init__()
         self.model = model
-        self.tasks = self.model.get_all_tasks()
+        self.db = db_worker if db_worker is not None else SyncDbExecutor(model)
+        self.tasks = {}
+        self.cached_lists = set()
+        self.task_list_name = "incomplete"
+        self.task_list_params = ()
+        # increased on every new list, pages of an older list are dropped
+        self.task_list_generation = 0
+        self.counters = TaskCounters(today_ordinal())
+        self.due_period = None
+        self.day_timer = QTimer(self)
+        self.day_timer.setSingleShot(True)
+        self.day_timer.timeout.connect(self.on_day_changed)
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.run_idle_work)
+        self.reminders = ReminderScheduler(self._on_reminders_due, parent=self)
+        self.tags = []
+        self.tag_model = QStringListModel(self)
         self.edit_task_id = None
         self.view = None
         self.edit_view = None
         self.edit_task_name = None
         self.task = None
+        self.search_text = ""
 
     def set_view(self, view):
         """Initialize main_window(view module)
@@ -66,42 +147,221 @@ class MainWindowController(QObject):
         self.edit_view = edit_view
 
     def on_start_up(self):
-        """Calls methods 'update_task_list(), update_task_overview() on the start of the app."""
+        """Loads the first page of tasks, task overview numbers and tags on the start of the app."""
 
+        self.view.set_today(self.counters.today)
+        self.schedule_day_change()
         self.update_task_list()
+        self._submit_read("get_task_counters", (self.counters.today,), self._on_counters_loaded, exact=True)
+        self.db.submit("get_all_tags", (), self._on_tags_loaded)
+        self.load_reminders()
+        self.purge_trash()
+
+    def _on_counters_loaded(self, counts):
+        """Stores the loaded task overview numbers and shows them"""
+
+        self.counters = TaskCounters(self.counters.today, counts)
         self.get_task_overview()
 
+    def _on_tags_loaded(self, tags):
+        """Stores the loaded tags and shows them in the tag boxes"""
+
+        self.tags = tags
+        self.tag_model.setStringList(tags)
+
     def update_task_list(self):
         """Calling the view module to represent all task on the main page of the app"""
 
-        for task in self.tasks:
-            if task.completed == 0 and task.removed == 0:
-                self.view.add_task(task.name)
+        self.load_task_list("incomplete")
 
-    def get_task_overview(self):
-        """Updates tasks overview number on the main page of the app"""
+    def load_task_list(self, list_name, params=()):
+        """Loads the first page of a task list and shows it instead of the current list
+
+        Parameters
+        ----------
+        list_name: str
+            "incomplete", "completed", "overdue" or "due", see TASK_LISTS in main_model.py
+        params: tuple
+            values for the filter of the list
+        """
+
+        self.task_list_name = list_name
+        self.task_list_params = params
+        self.task_list_generation += 1
+        # the list replaces the search results
+        self.search_text = ""
+        self._postpone_idle_work()
+        if list_name in self.cached_lists:
+            self.view.show_filter(list_name)
+            return
+
+        generation = self.task_list_generation
+
+        def on_page_loaded(tasks):
+            if generation == self.task_list_generation:
+                has_more = len(tasks) == PAGE_SIZE
+                tasks = self._store_loaded_tasks(tasks)
+                if self.view.has_filter(list_name):
+                    self.cached_lists.add(list_name)
+                    self.view.set_filter_tasks(list_name, tasks, has_more)
+                else:
+                    self.view.set_tasks(tasks, has_more)
+
+        self._submit_read("get_tasks_page", (list_name, None, PAGE_SIZE, params), on_page_loaded)
+
+    def fetch_more_tasks(self, last_task):
+        """Loads the page that follows the last loaded task of the shown list
+
+        Parameters
+        ----------
+        last_task: object
+            instance of class Task
+        """
+
+        generation = self.task_list_generation
+        self._postpone_idle_work()
+
+        def on_page_loaded(tasks):
+            if generation == self.task_list_generation:
+                has_more = len(tasks) == PAGE_SIZE
+                self.view.append_tasks(self._store_loaded_tasks(tasks), has_more)
+
+        args = (self.task_list_name, last_task, PAGE_SIZE, self.task_list_params)
+        self._submit_read("get_tasks_page", args, on_page_loaded)
+
+    def _submit_read(self, job, args, on_result, exact=False):
+        """Runs a job that only reads on the reader threads, so it never waits behind a long write,
+        e.g. an import or compacting the db.
+
+        The reader sees the db as it was when the job started. If a write finished meanwhile, its changes
+        may be missing from the result, which would then overwrite them. The result is dropped then and
+        the job runs again in the write queue, behind the writes, where it cannot miss them.
 
-        overdue_tasks = []
-        completed_tasks = []
-        removed_tasks = []  # we will need for the functionality 'Trash'
-        all_tasks = []
-
-        curr_date = date.today()
-        format_date = curr_date.strftime("%Y/%m/%d")
-
-        for task in self.tasks:
-            if task.removed == 0:
-                all_tasks.append(task)
-                if task.due_date < format_date:
-                    overdue_tasks.append(task)
-                if task.completed == 1:
-                    completed_tasks.append(task)
+        Parameters
+        ----------
+        job: str or callable
+            see DbWorker.submit
+        args: tuple
+        on_result: callable
+        exact: bool
+            True for numbers that the changes are added to, e.g. the counters. Their result must not
+            contain a write whose result is not applied yet either, so it is only used if no write
+            was queued from the start of the job to its end.
+        """
+
+        submitted, finished = self.db.writes_submitted, self.db.writes_finished
+
+        def on_read(result):
+            if exact:
+                stale = finished != submitted or self.db.writes_submitted != submitted
+            else:
+                stale = self.db.writes_finished != finished
+            if stale:
+                self.db.submit(job, args, on_result, write=True)
             else:
-                removed_tasks.append(task)
+                on_result(result)
+
+        self.db.submit(job, args, on_read)
+
+    def _store_loaded_tasks(self, tasks):
+        """Stores loaded tasks and returns them. A task that is stored already is kept: it has every change
+        whose result was applied, the loaded copy may have a change whose result is still to come."""
+
+        tasks = [self.tasks.get(task.task_id, task) for task in tasks]
+        self.tasks.update((task.task_id, task) for task in tasks)
+        return tasks
+
+    def get_due_tasks(self, period):
+        """Shows the incomplete tasks that are due in a period, ordered by due date
+
+        Parameters
+        ----------
+        period: str
+            "today", "tomorrow" or "week"
+        """
+
+        self.due_period = period
+        self.load_task_list("due", due_range(period, self.counters.today))
+
+    def get_overdue_tasks(self):
+        """Shows the incomplete tasks whose due date has passed, ordered by due date"""
+
+        self.load_task_list("overdue", (self.counters.today,))
+
+    def get_removed_tasks(self):
+        """Shows the tasks in the trash, the ones that will be purged first on top"""
+
+        self.load_task_list("trash")
+
+    def schedule_day_change(self):
+        """Arms the day timer to fire once right after the next midnight"""
+
+        # a second later, so that date.today() already returns the new day when the timer fires
+        self.day_timer.start(msecs_until_next_day() + 1000)
+
+    def on_day_changed(self):
+        """Moves the overview, the highlighted rows and the due lists to the new day"""
 
-        self.view.update_task_count(str(len(all_tasks)))
-        self.view.update_overdue_task_count(str(len(overdue_tasks)))
-        self.view.update_completed_task_number(str(len(completed_tasks)))
+        today = today_ordinal()
+        if today == self.counters.today:
+            # the timer fired early, e.g. the system clock was changed
+            self.schedule_day_change()
+            return
+
+        self.counters.today = today
+        self.view.set_today(self.counters.today)
+        self._submit_read("get_overdue_count", (self.counters.today,), self._on_overdue_counted, exact=True)
+
+        if self.task_list_name == "due":
+            self.get_due_tasks(self.due_period)
+        elif self.task_list_name == "overdue":
+            self.get_overdue_tasks()
+
+        self.load_reminders()
+        self.purge_trash()
+        self.schedule_day_change()
+
+    def load_reminders(self):
+        """Loads the tasks due from today to REMINDER_DAYS later and schedules their reminders"""
+
+        last_day = self.counters.today + REMINDER_DAYS - 1
+
+        def on_loaded(tasks):
+            # the stored tasks have the changes applied so far, the later ones are scheduled on top of them
+            self.reminders.reset([self.tasks.get(task.task_id, task) for task in tasks], last_day)
+
+        self._submit_read("get_reminder_tasks", (self.counters.today, last_day), on_loaded)
+
+    def _on_reminders_due(self, names):
+        """Notifies about the tasks whose reminder time came"""
+
+        logging.info(f'Reminded of tasks: {names}')
+        self.view.show_reminders(names)
+
+    def _on_overdue_counted(self, overdue):
+        """Shows the overdue number counted for the new day"""
+
+        self.counters.overdue = overdue
+        self.get_task_overview()
+
+    def show_tasks(self, tasks):
+        """Shows tasks that are not a paged list, e.g. search results
+
+        Parameters
+        ----------
+        tasks: list
+            instances of class Task
+        """
+
+        self.task_list_generation += 1
+        self.view.set_tasks(self._store_loaded_tasks(tasks))
+
+    def get_task_overview(self):
+        """Updates tasks overview number on the main page of the app"""
+
+        self.view.update_task_count(str(self.counters.total))
+        self.view.update_overdue_task_count(str(self.counters.overdue))
+        self.view.update_completed_task_number(str(self.counters.completed))
 
     def add_task_to_the_list(self, task_name):
         """Adds a new task to the list on the main page of the app
@@ -112,13 +372,94 @@ class MainWindowController(QObject):
             name of a new task
         """
 
-        self.model.create_task(task_name)
-        task = self.model.get_last_added_task()
-        self.view.add_task(task.name)
-        self.tasks = self.model.get_all_tasks()
+        self.db.submit("create_task", (task_name,), self._on_task_created, write=True)
+
+    def _on_task_created(self, task):
+        """Stores and shows a task created in db"""
+
+        self._postpone_idle_work()
+        # a page read while the task was created may have brought it already
+        if task.task_id not in self.tasks:
+            self.view.add_task(task, self.in_shown_list(task))
+        self.tasks[task.task_id] = task
+        self.counters.add(task)
         self.get_task_overview()
 
-    def show_edit_window(self, test_mode, edit_window, task_id, task_name):
+    def in_shown_list(self, task):
+        """Returns True if a task belongs to the shown list or to the shown search results
+
+        Parameters
+        ----------
+        task: object
+            instance of class Task
+        """
+
+        if self.search_text:
+            return task_matches_text(task, self.search_text)
+        return task_in_list(self.task_list_name, task, self.task_list_params)
+
+    @staticmethod
+    def _import_job(model, path, today):
+        """Imports a file and counts the tasks again. Runs as one db job.
+        A file that cannot be imported is reported in the result, nothing is imported from it."""
+
+        try:
+            imported, skipped = import_tasks(model, path)
+        except (OSError, ValueError) as error:
+            logging.warning(f'{path} was not imported: {error}')
+            return 0, [], None, str(error)
+
+        return imported, skipped, model.get_task_counters(today), None
+
+    def import_tasks(self, path, on_finished=None):
+        """Imports tasks from a .csv or .jsonl file and shows them once the import is finished
+
+        Parameters
+        ----------
+        path: str
+            path to the file
+        on_finished: callable
+            called with the number of imported tasks, the list of the numbers of the skipped rows
+            and the error message if the file could not be imported or None
+        """
+
+        def on_imported(result):
+            imported, skipped, counts, error = result
+            if error is None:
+                self._on_counters_loaded(counts)
+                self.clear_cached_lists()
+                self.load_task_list(self.task_list_name, self.task_list_params)
+                self.load_reminders()
+            if on_finished is not None:
+                on_finished(imported, skipped, error)
+
+        self.db.submit(self._import_job, (path, self.counters.today), on_imported, write=True)
+
+    def apply_task_changes(self, changes):
+        """Applies the changes returned by the model to the stored task
+
+        Parameters
+        ----------
+        changes: dict
+            task_id of the changed task and the new values of the changed fields
+        """
+
+        if not changes:
+            return
+
+        self._postpone_idle_work()
+        fields = dict(changes)
+        task_id = fields.pop('task_id')
+        if task_id in self.tasks:
+            old_task = self.tasks[task_id]
+            self.tasks[task_id] = old_task._replace(**fields)
+            self.counters.replace(old_task, self.tasks[task_id])
+            self.reminders.update(self.tasks[task_id])
+        elif fields.get('completed') == 1 or fields.get('removed') == 1:
+            # a task that is not loaded may still have a reminder
+            self.reminders.discard(task_id)
+
+    def show_edit_window(self, test_mode, edit_window, task_id):
         """Launches edit window after pressing edit btn
 
         Parameters
@@ -126,97 +467,263 @@ class MainWindowController(QObject):
         edit_window: object
             instance of EditWindow(QDialog)
         task_id: int
-            id of the task in the list which eguals rowid in db
-        task_name:
+            id of the task which eguals rowid in db
         """
 
         self.edit_task_id = task_id
         self.set_edit_window(edit_window)
-        self.task = self.model.get_task_info((self.edit_task_id, task_name))
+        # the stored task is up to date with db, no query is needed
+        self.task = self.tasks[self.edit_task_id]
         self.edit_view.task_info(self.task)
 
         if not test_mode:
             self.edit_view.exec()
 
-    def save_changes(self, task_name, due_date, notes):
+    def save_changes(self, task_name, due_date, notes, recurrence=None):
         """Saves changes after editing a task
 
         Parameters
         ----------
         task_name: str
             edited task name
-        due_date: str
-            new due date
+        due_date: int
+            new due date as the ordinal of the day or None, see model/dates.py
         notes: str
             notes for the task
+        recurrence: str
+            rule of a repeating task or None, see model/recurrence.py
         """
         data = {
-            'previous_name': self.task.name,
-            'edit_task_id': self.edit_task_id,
-            'new_task_name': task_name,
+            'task_id': self.edit_task_id,
+            'name': task_name,
             'due_date': due_date,
             'notes': notes,
+            'recurrence': recurrence,
         }
-        self.model.update_task_info(data)
-        self.view.update_task_name(task_name, self.edit_task_id)
+        self.db.submit("update_task_info", (data,), self._on_task_edited, write=True)
 
-    def delete_task(self, task_id, task_name):
+    def _on_task_edited(self, changes):
+        """Applies the edited task info and shows it in the list"""
+
+        self.apply_task_changes(changes)
+        if changes and changes['task_id'] in self.tasks:
+            self.view.update_task(self.tasks[changes['task_id']])
+
+    def delete_task(self, task_id):
         """Call model instance to delete a task from db
 
         Parameters
         ----------
         task_id: int
             task_id that equals rowid in db
-        task_name: str
         """
-        data = {
-            'task_id': task_id,
-            'task_name': task_name,
-        }
-        if self.model.delete_task(data):
-            self.tasks = self.model.get_all_tasks()
-            self.get_task_overview()
+
+        self.delete_tasks([task_id])
+
+    def delete_tasks(self, task_ids):
+        """Call model instance to move the tasks to the trash in one transaction
+
+        Parameters
+        ----------
+        task_ids: list
+            ids of the tasks that equal rowid in db
+        """
+
+        self.db.submit("delete_tasks", (task_ids,), self._on_tasks_deleted, write=True)
+
+    def _on_tasks_deleted(self, changes_list):
+        """Applies the removed flag of the deleted tasks"""
+
+        if changes_list:
+            self._apply_bulk_changes(changes_list)
             print("Deleted successfully")
 
-    def complete_task(self, task_id, task_name):
+    def _apply_bulk_changes(self, changes_list):
+        """Applies the changes of many tasks and updates the overview once
+
+        Parameters
+        ----------
+        changes_list: list
+            dicts returned by a bulk change of the model
+        """
+
+        for changes in changes_list:
+            self.apply_task_changes(changes)
+        self.get_task_overview()
+
+    def restore_tasks(self, task_ids):
+        """Call model instance to move the tasks from the trash back to their lists
+
+        Parameters
+        ----------
+        task_ids: list
+            ids of the tasks that equal rowid in db
+        """
+
+        self.db.submit("restore_tasks", (task_ids,), self._on_tasks_restored, write=True)
+
+    def _on_tasks_restored(self, changes_list):
+        """Applies the removed flag of the restored tasks and counts them again"""
+
+        for changes in changes_list:
+            self.apply_task_changes(changes)
+        self.view.add_tasks_to_store(self._changed_tasks(changes_list))
+        self.get_task_overview()
+
+    def _changed_tasks(self, changes_list):
+        """Returns the stored tasks changed by a bulk change"""
+
+        return [self.tasks[changes['task_id']] for changes in changes_list if changes['task_id'] in self.tasks]
+
+    def clear_cached_lists(self):
+        """Drops the pages of the cached lists, e.g. after many tasks were added at once"""
+
+        self.cached_lists.clear()
+        self.tasks = {}
+        self.view.clear_filters()
+
+    def purge_tasks(self, task_ids):
+        """Call model instance to delete the tasks from the trash forever. They are kept in the archive db.
+
+        Parameters
+        ----------
+        task_ids: list
+            ids of the tasks that equal rowid in db
+        """
+
+        for task_id in task_ids:
+            self.tasks.pop(task_id, None)
+        self.db.submit("purge_tasks", (task_ids,), self._on_trash_purged, write=True)
+
+    def purge_trash(self):
+        """Call model instance to move the tasks removed more than TRASH_RETENTION_DAYS ago to the archive db"""
+
+        removed_before = now_timestamp() - TRASH_RETENTION_DAYS * 24 * 3600
+        self.db.submit("purge_removed_tasks", (removed_before,), self._on_trash_purged, write=True)
+
+    def _on_trash_purged(self, purged):
+        """Compacts the db once the user is idle if tasks were purged"""
+
+        if purged:
+            logging.debug(f'Purged tasks: {purged}')
+            self._postpone_idle_work()
+
+    def _postpone_idle_work(self):
+        """Restarts the idle timer, the db is compacted only after IDLE_DELAY without loads and changes"""
+
+        self.idle_timer.start(IDLE_DELAY)
+
+    def run_idle_work(self):
+        """Compacts the db by one step and schedules the next step while there are free pages"""
+
+        def on_step_done(free_pages):
+            # a load or change restarted the timer meanwhile, the next step waits for the next idle time
+            if free_pages and not self.idle_timer.isActive():
+                self.idle_timer.start(VACUUM_STEP_DELAY)
+
+        self.db.submit("vacuum_step", (), on_step_done, write=True)
+
+    def complete_task(self, task_id):
         """Call model instance to change complete flag in db
 
         Parameters
         ----------
         task_id: int
             task_id that equals rowid in db
-        task_name: str
         """
-        data = {
-            'task_id': task_id,
-            'task_name': task_name,
-        }
-        self.model.complete_task(data)
+
+        self.complete_tasks([task_id])
+
+    def complete_tasks(self, task_ids):
+        """Call model instance to complete the tasks in one transaction
+
+        Parameters
+        ----------
+        task_ids: list
+            ids of the tasks that equal rowid in db
+        """
+
+        self.db.submit(self._complete_job, (task_ids, self.counters.today), self._on_tasks_completed, write=True)
+
+    @staticmethod
+    def _complete_job(model, task_ids, today):
+        """Creates the next instances of the repeating tasks and completes the tasks in one transaction.
+        Runs as one db job."""
+
+        with model.transaction():
+            next_tasks = model.create_next_occurrences(task_ids, today)
+            return model.complete_tasks(task_ids), next_tasks
+
+    def _on_tasks_completed(self, result):
+        """Applies the complete flag of the completed tasks, the cached lists move them to the completed list.
+        The next instances of the repeating tasks are added to the incomplete list."""
+
+        changes_list, next_tasks = result
+        for task in next_tasks:
+            self.tasks[task.task_id] = task
+            self.counters.add(task)
+            self.reminders.update(task)
+        self._apply_bulk_changes(changes_list)
+        self.view.update_tasks(self._changed_tasks(changes_list))
+        if next_tasks:
+            self.view.add_tasks_to_store(next_tasks)
 
     def update_task_overview(self):
-        """Call model instance to update task overview number on the main screen of the app."""
+        """Update task overview number on the main screen of the app."""
 
-        completed_tasks = self.model.get_completed_tasks()
-        self.view.update_completed_task_number(str(len(completed_tasks)))
+        self.get_task_overview()
 
     def get_incomplete_task(self):
         """Call model instance to get all incomplete tasks from db"""
-        incomplete_tasks = self.model.get_incomplete_tasks()
-        self.view.clear_task_list()
-        for task in incomplete_tasks:
-            self.view.add_task(task)
+
+        self.load_task_list("incomplete")
 
     def get_completed_task(self):
         """Call model instance to get all completed tasks from db"""
 
-        completed_tasks = self.model.get_completed_tasks()
-        self.view.clear_task_list()
-        for task in completed_tasks:
-            self.view.add_task(task.name)
+        self.load_task_list("completed")
+
+    def search_tasks(self, text):
+        """Call model instance to find the tasks matching the text and show them
+
+        Parameters
+        ----------
+        text: str
+            text of the search field. An empty text shows the whole task list again.
+        """
+
+        self.search_text = text
+        if not text:
+            self.update_task_list()
+            return
+
+        def on_found(tasks):
+            # a newer search was started while this one ran, its result is not needed
+            if text == self.search_text:
+                self.show_tasks(tasks)
+
+        self._submit_read("search_tasks", (text,), on_found)
+
+    def add_tag(self, tag_name):
+        """Call model instance to add a new tag and reload the tags once it is added
+
+        Parameters
+        ----------
+        tag_name: str
+        """
+
+        self.db.submit("create_tag", (tag_name,), lambda _tag_id: self._reload_tags(), write=True)
+
+    def _reload_tags(self):
+        """Loads the tags again after they were changed"""
+
+        # submitted once the tag is added, so the readers see it
+        self.db.submit("get_all_tags", (), self._on_tags_loaded)
 
     def get_tags(self):
-        """Call model instance to get all tags from db"""
-        return self.model.get_all_tags()
+        """Returns all tags loaded from db on the start of the app"""
+
+        return self.tags
 
     def change_tag(self, tag_idx):
         """Call model instance to update a tag for the task in db
@@ -226,4 +733,23 @@ class MainWindowController(QObject):
         tag_idx: int
         """
 
-        self.model.update_tag(self.task.name, tag_idx)
+        self.db.submit("update_tag", (self.edit_task_id, tag_idx), self._on_task_edited, write=True)
+
+    def retag_tasks(self, task_ids, tag_id):
+        """Call model instance to set the same tag on the tasks in one transaction and show them
+
+        Parameters
+        ----------
+        task_ids: list
+            ids of the tasks that equal rowid in db
+        tag_id: int
+        """
+
+        self.db.submit("retag_tasks", (task_ids, tag_id), self._on_tasks_retagged, write=True)
+
+    def _on_tasks_retagged(self, changes_list):
+        """Applies the new tag of the tasks and shows them in the list"""
+
+        for changes in changes_list:
+            self.apply_task_changes(changes)
+        self.view.update_tasks(self._changed_tasks(changes_list))
@@ -0,0 +1,188 @@
+"""This module contains the reminders of the tasks whose due date comes soon"""
+
+import heapq
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+from model.dates import reminder_timestamp
+
+# a task is reminded of at this local hour of its due date
+REMINDER_HOUR = 9
+# only the reminders of the tasks due within this number of days, today included, are kept in memory.
+# The days are loaded again at midnight.
+REMINDER_DAYS = 7
+# the heap is rebuilt from the current reminders once it holds more than twice as many entries
+MIN_HEAP_TO_COMPACT = 64
+
+
+def reminder_time(task):
+    """Returns the unix time to remind of a task at or None if the task needs no reminder
+
+    Parameters
+    ----------
+    task: object
+        The instance of class Task
+    """
+
+    if task.completed != 0 or task.removed != 0 or task.due_date is None:
+        return None
+    return reminder_timestamp(task.due_date, REMINDER_HOUR)
+
+
+class ReminderScheduler(QObject):
+    """
+    A class used to remind of the tasks on their due dates.
+    The reminder times are kept in a min-heap and one single shot QTimer is armed for the earliest of them,
+    so there is no timer per task and the tasks table is never polled.
+
+    A changed task pushes its new time and leaves its old entry in the heap. An entry that doesn't match
+    the current time of its task is dropped once it gets to the top. So a change costs O(log n) and the
+    timer is started again only if the earliest reminder changed.
+
+    Attributes
+    ----------
+    timer: object
+        single shot QTimer armed for the earliest reminder
+    last_day: int
+        ordinal of the last day whose reminders are kept, the later ones are loaded on the next days
+
+    Methods
+    -------
+    reset(self, tasks, last_day)
+    update(self, task)
+    discard(self, task_id)
+    next_reminder(self)
+    """
+
+    def __init__(self, on_due, clock=time.time, parent=None):
+        """
+        Parameters
+        ----------
+        on_due: callable
+            called with the names of the tasks whose reminder time came, the earliest first
+        clock: callable
+            returns the current unix time
+        parent: object
+            QObject that owns the scheduler
+        """
+
+        super().__init__(parent)
+        self._on_due = on_due
+        self._clock = clock
+        self.last_day = None
+        # (unix time, task_id) entries, including the stale ones of changed tasks
+        self._heap = []
+        # task_id -> (unix time, name) of the current reminder of the task
+        self._reminders = {}
+        self._armed_at = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._on_timeout)
+
+    def reset(self, tasks, last_day):
+        """Replaces all reminders with the ones of the loaded tasks
+
+        Parameters
+        ----------
+        tasks: list
+            instances of class Task due from today to last_day
+        last_day: int
+            ordinal of the last loaded day
+        """
+
+        self.last_day = last_day
+        self._reminders = {}
+        now = self._clock()
+        for task in tasks:
+            self._schedule(task, now)
+        self._rebuild_heap()
+        self._arm()
+
+    def update(self, task):
+        """Schedules a changed task again. A completed or removed task is not reminded of anymore.
+
+        Parameters
+        ----------
+        task: object
+            The instance of class Task after the change
+        """
+
+        if self._schedule(task, self._clock()):
+            heapq.heappush(self._heap, (self._reminders[task.task_id][0], task.task_id))
+            if len(self._heap) > max(MIN_HEAP_TO_COMPACT, 2 * len(self._reminders)):
+                self._rebuild_heap()
+        self._arm()
+
+    def discard(self, task_id):
+        """Drops the reminder of a task
+
+        Parameters
+        ----------
+        task_id: int
+            id of the task that equals rowid in db
+        """
+
+        self._reminders.pop(task_id, None)
+        self._arm()
+
+    def next_reminder(self):
+        """Returns the unix time of the earliest reminder or None if there are no reminders"""
+
+        return self._heap[0][0] if self._heap else None
+
+    def _schedule(self, task, now):
+        """Stores the reminder time of a task. Returns True if the time changed and needs a heap entry."""
+
+        remind_at = reminder_time(task)
+        if remind_at is None or remind_at <= now or self.last_day is None or task.due_date > self.last_day:
+            self._reminders.pop(task.task_id, None)
+            return False
+
+        old_reminder = self._reminders.get(task.task_id)
+        self._reminders[task.task_id] = (remind_at, task.name)
+        return old_reminder is None or old_reminder[0] != remind_at
+
+    def _rebuild_heap(self):
+        """Builds the heap again from the current reminders only, in O(n)"""
+
+        self._heap = [(remind_at, task_id) for task_id, (remind_at, _name) in self._reminders.items()]
+        heapq.heapify(self._heap)
+
+    def _is_stale(self, entry):
+        """Returns True if a heap entry is not the current reminder of its task"""
+
+        remind_at, task_id = entry
+        reminder = self._reminders.get(task_id)
+        return reminder is None or reminder[0] != remind_at
+
+    def _arm(self):
+        """Drops the stale entries on top of the heap and starts the timer if the earliest reminder changed"""
+
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._armed_at = None
+            self.timer.stop()
+            return
+
+        remind_at = self._heap[0][0]
+        if remind_at != self._armed_at or not self.timer.isActive():
+            self._armed_at = remind_at
+            self.timer.start(max(0, int((remind_at - self._clock()) * 1000)))
+
+    def _on_timeout(self):
+        """Reminds of the tasks whose time came and arms the timer for the next reminder"""
+
+        now = self._clock()
+        names = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_stale(entry):
+                names.append(self._reminders.pop(entry[1])[1])
+
+        # the timer may fire a bit early, then it is just armed again
+        self._arm()
+        if names:
+            self._on_due(names)
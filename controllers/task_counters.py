@@ -0,0 +1,93 @@
+"""This module contains the counters shown in the task overview on the main page of the app"""
+
+
+class TaskCounters:
+    """
+    A class used to represent the total, overdue and completed task numbers.
+    The numbers are loaded once from db and then updated on every change of a task,
+    so the overview never has to walk through the task list.
+
+    Attributes
+    ----------
+    today: int
+        ordinal of the current day. Incomplete tasks with an earlier due date are overdue.
+
+    Methods
+    -------
+    is_overdue(self, task)
+    add(self, task)
+    remove(self, task)
+    replace(self, old_task, new_task)
+    """
+
+    def __init__(self, today, counts=(0, 0, 0)):
+        """
+        Parameters
+        ----------
+        today: int
+            ordinal of the current day
+        counts: tuple
+            total, overdue and completed numbers of not removed tasks
+        """
+
+        self.today = today
+        self.total, self.overdue, self.completed = counts
+
+    def is_overdue(self, task):
+        """Returns True if the task is not completed and its due date has passed
+
+        Parameters
+        ----------
+        task: object
+            The instance of class Task (located in main_model.py file)
+        """
+
+        return task.completed == 0 and task.due_date is not None and task.due_date < self.today
+
+    def _count(self, task, sign):
+        """Adds (sign=1) or subtracts (sign=-1) the task from the counters"""
+
+        if task.removed != 0:
+            return
+
+        self.total += sign
+        if self.is_overdue(task):
+            self.overdue += sign
+        if task.completed == 1:
+            self.completed += sign
+
+    def add(self, task):
+        """Counts a new task
+
+        Parameters
+        ----------
+        task: object
+            The instance of class Task
+        """
+
+        self._count(task, 1)
+
+    def remove(self, task):
+        """Stops counting a task
+
+        Parameters
+        ----------
+        task: object
+            The instance of class Task
+        """
+
+        self._count(task, -1)
+
+    def replace(self, old_task, new_task):
+        """Counts the new state of a changed task instead of the old one
+
+        Parameters
+        ----------
+        old_task: object
+            The instance of class Task before the change
+        new_task: object
+            The instance of class Task after the change
+        """
+
+        self.remove(old_task)
+        self.add(new_task)
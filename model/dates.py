@@ -0,0 +1,180 @@
+"""This module converts the dates of tasks between the db and the ui.
+
+The db keeps a due date as the ordinal of the day (date.toordinal()) or NULL if a task has no
+due date, and time_added as unix time in seconds. Both are integers, so they compare and sort
+correctly and range queries on them are served by indexes. Strings are made and parsed only here.
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+# format of time_added before the dates were stored as integers
+LEGACY_TIME_ADDED_FORMAT = "%m/%d/%y %H/%M/%S"
+# texts that mean "no due date": the old "never" value, the edit window option, empty values
+NO_DUE_DATE_VALUES = ("", "never", "no due date", "null", "none")
+DUE_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%m/%d/%y")
+# format of the dates in the edit window options, e.g. "Today: Oct/18"
+SHORT_DATE_FORMAT = "%b/%d"
+NO_DUE_DATE_TEXT = "No due date"
+
+
+def today_ordinal():
+    """Returns the ordinal of the current day"""
+
+    return date.today().toordinal()
+
+
+def msecs_until_next_day(now=None):
+    """Returns the number of milliseconds until the next midnight
+
+    Parameters
+    ----------
+    now: datetime
+        current local time, datetime.now() by default
+    """
+
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    # timestamps of local times count the hour that is added or removed on a daylight saving change
+    return int((midnight.timestamp() - now.timestamp()) * 1000)
+
+
+def reminder_timestamp(ordinal, hour):
+    """Returns the unix time of a local hour of a day
+
+    Parameters
+    ----------
+    ordinal: int
+        the ordinal of the day, e.g. a due date
+    hour: int
+        hour of the day, 0 to 23
+    """
+
+    day_start = datetime.combine(date.fromordinal(ordinal), datetime.min.time())
+    return int((day_start + timedelta(hours=hour)).timestamp())
+
+
+def now_timestamp():
+    """Returns the current unix time in whole seconds"""
+
+    return int(time.time())
+
+
+def _closest_year(month, day, reference):
+    """Returns the date with the given month and day that is closest to the reference date"""
+
+    candidates = []
+    for year in (reference.year - 1, reference.year, reference.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            # Feb 29 in a year that is not a leap year
+            continue
+
+    return min(candidates, key=lambda candidate: abs(candidate - reference))
+
+
+def parse_due_date(text, reference=None):
+    """Converts a due date typed or chosen in the ui into the value stored in db
+
+    Parameters
+    ----------
+    text: str
+        a date in one of DUE_DATE_FORMATS, an edit window option like "Today: Oct/18" or
+        one of NO_DUE_DATE_VALUES
+    reference: date
+        day that a date without a year is closest to, today by default
+
+    Returns
+    -------
+    int
+        the ordinal of the day or None if there is no due date
+
+    Raises
+    ------
+    ValueError
+        if the text is not a date
+    """
+
+    if text is None:
+        return None
+
+    value = str(text).strip()
+    if value.lower() in NO_DUE_DATE_VALUES:
+        return None
+
+    # "Today: Oct/18" -> "Oct/18", a plain date stays as it is
+    value = value.rpartition(": ")[2]
+    for date_format in DUE_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date().toordinal()
+        except ValueError:
+            continue
+
+    try:
+        # a leap year, so that Feb/29 is accepted before the real year is known
+        short_date = datetime.strptime(f"{value}/2000", f"{SHORT_DATE_FORMAT}/%Y")
+    except ValueError as error:
+        raise ValueError(f"not a due date: {text!r}") from error
+
+    reference = reference or date.today()
+    return _closest_year(short_date.month, short_date.day, reference).toordinal()
+
+
+def format_due_date(ordinal):
+    """Converts a due date from db into the text shown in the ui
+
+    Parameters
+    ----------
+    ordinal: int
+        the ordinal of the day or None
+    """
+
+    if ordinal is None:
+        return NO_DUE_DATE_TEXT
+    return date.fromordinal(ordinal).isoformat()
+
+
+def parse_time_added(value):
+    """Converts a time_added value into unix time
+
+    Parameters
+    ----------
+    value: int or str
+        unix time or a string in LEGACY_TIME_ADDED_FORMAT
+
+    Raises
+    ------
+    ValueError
+        if the value is neither
+    """
+
+    if isinstance(value, int):
+        return value
+    return int(datetime.strptime(str(value), LEGACY_TIME_ADDED_FORMAT).timestamp())
+
+
+def due_range(period, today):
+    """Returns the first and the last day of a due date period
+
+    Parameters
+    ----------
+    period: str
+        "today", "tomorrow" or "week" (Monday to Sunday of the current week)
+    today: int
+        the ordinal of the current day
+
+    Returns
+    -------
+    tuple
+        ordinals of the first and the last day, both included
+    """
+
+    if period == "today":
+        return today, today
+    if period == "tomorrow":
+        return today + 1, today + 1
+    if period == "week":
+        monday = today - date.fromordinal(today).weekday()
+        return monday, monday + 6
+    raise ValueError(f"unknown due date period: {period!r}")
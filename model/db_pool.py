@@ -0,0 +1,224 @@
+"""This module contains the sqlite connections of the app: one writer and a pool of WAL readers.
+
+Every connection belongs to one thread. The writer belongs to the thread that asked for it first,
+every other thread gets its own read-only connection, so reads never wait on the writer's cursor.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the db in the data folder of the app, another one can be chosen with TODO_APP_DB or app.py --db
+DB_PATH = os.environ.get("TODO_APP_DB", os.path.join(APP_DIR, "data", "data.db"))
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+# the app runs a small fixed set of statements, the cache keeps all of them prepared
+STATEMENT_CACHE_SIZE = 64
+# a connection that was not used for this number of seconds is checked before it is handed out
+HEALTH_CHECK_INTERVAL = 30
+
+
+def get_db_connection(db_path=DB_PATH, synchronous="NORMAL", journal_mode="WAL", factory=sqlite3.Connection):
+    """Connect to the db
+
+    Parameters
+    ----------
+    db_path: str
+        path to the db file
+    synchronous: str
+        one of SYNCHRONOUS_LEVELS. In WAL mode "NORMAL" syncs the disk only on checkpoints,
+        "FULL" syncs on every commit.
+    journal_mode: str
+        "WAL" lets readers work alongside a writer and makes commits cheaper than "DELETE"
+    factory: type
+        class of the connection, a subclass of sqlite3.Connection
+    """
+
+    synchronous = synchronous.upper()
+    if synchronous not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"synchronous must be one of {SYNCHRONOUS_LEVELS}, got {synchronous}")
+
+    connection = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE, factory=factory)
+    connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+    connection.execute(f"PRAGMA synchronous = {synchronous}")
+    return connection
+
+
+def is_healthy(connection):
+    """Returns True if the connection can still run a query
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+    """
+
+    try:
+        connection.execute("SELECT 1").fetchone()
+    except sqlite3.Error:
+        return False
+    return True
+
+
+class ConnectionPool:  # pylint: disable=too-many-instance-attributes
+    """
+    A class used to hand out the sqlite connections of the app.
+
+    Attributes
+    ----------
+    db_path: str
+        path to the db file
+    max_readers: int
+        number of reader connections that can be open at the same time
+    tracer: object
+        instance of class SqlTracer that opens the connections, None if the statements are not traced
+
+    Methods
+    -------
+    writer(self)
+    reader(self)
+    connection(self)
+    owns_writer(self)
+    health_check(self)
+    close_thread(self)
+    """
+
+    def __init__(self, db_path=DB_PATH, max_readers=4, synchronous="NORMAL", journal_mode="WAL"):
+        """
+        Parameters
+        ----------
+        db_path: str
+            path to the db file
+        max_readers: int
+            number of reader connections that can be open at the same time
+        synchronous: str
+            one of SYNCHRONOUS_LEVELS for the writer
+        journal_mode: str
+            journal mode of the db, readers only work alongside the writer in "WAL"
+        """
+
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.synchronous = synchronous
+        self.journal_mode = journal_mode
+        self._lock = threading.Lock()
+        self._writer = None
+        self._writer_thread = None
+        # thread ident -> [connection, time of the last health check]
+        self._readers = {}
+        self._writer_checked = 0.0
+        self.tracer = None
+
+    def _connect(self, synchronous):
+        """Opens a connection to the db, traced if there is a tracer"""
+
+        if self.tracer is not None:
+            return self.tracer.connect(self.db_path, synchronous, self.journal_mode)
+        return get_db_connection(self.db_path, synchronous, self.journal_mode)
+
+    def writer(self):
+        """Returns the writer connection. The first thread that calls it becomes its owner."""
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            if self._writer is None:
+                self._writer = self._connect(self.synchronous)
+                self._writer_thread = thread_id
+                self._writer_checked = time.monotonic()
+            elif self._writer_thread != thread_id:
+                raise RuntimeError("The db writer belongs to another thread")
+
+        if time.monotonic() - self._writer_checked > HEALTH_CHECK_INTERVAL:
+            if not is_healthy(self._writer):
+                logging.warning("The db writer connection is broken, reconnecting")
+                self._writer = self._connect(self.synchronous)
+            self._writer_checked = time.monotonic()
+
+        return self._writer
+
+    def owns_writer(self):
+        """Returns True if the current thread owns the writer connection"""
+
+        return self._writer is not None and self._writer_thread == threading.get_ident()
+
+    def _open_reader(self):
+        """Opens a read-only connection. Readers see the last committed data of the WAL."""
+
+        connection = self._connect("NORMAL")
+        connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def reader(self):
+        """Returns the reader connection of the current thread, opening it on the first call"""
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            entry = self._readers.get(thread_id)
+            if entry is None:
+                if len(self._readers) >= self.max_readers:
+                    raise RuntimeError(f"All {self.max_readers} db readers are in use by other threads")
+                # the slot is reserved before the connection is opened outside of the lock
+                entry = self._readers[thread_id] = [None, 0.0]
+
+        if entry[0] is None:
+            entry[0] = self._open_reader()
+            entry[1] = time.monotonic()
+        elif time.monotonic() - entry[1] > HEALTH_CHECK_INTERVAL:
+            if not is_healthy(entry[0]):
+                logging.warning("A db reader connection is broken, reconnecting")
+                entry[0] = self._open_reader()
+            entry[1] = time.monotonic()
+
+        return entry[0]
+
+    def connection(self):
+        """Returns the connection for reading on the current thread.
+
+        The owner of the writer reads with the writer, so it sees its own changes even inside
+        a transaction. Every other thread reads with its own reader.
+        """
+
+        if self.owns_writer():
+            return self._writer
+        return self.reader()
+
+    def health_check(self):
+        """Checks the connections of the current thread and reopens the broken ones
+
+        Returns
+        -------
+        dict
+            "writer" and "reader": True if the connection of the current thread works,
+            None if the thread has no such connection. "readers": number of open readers.
+        """
+
+        result = {"writer": None, "reader": None}
+
+        if self.owns_writer():
+            self._writer_checked = 0.0
+            self.writer()
+            result["writer"] = is_healthy(self._writer)
+
+        entry = self._readers.get(threading.get_ident())
+        if entry is not None and entry[0] is not None:
+            entry[1] = 0.0
+            result["reader"] = is_healthy(self.reader())
+
+        result["readers"] = len(self._readers)
+        return result
+
+    def close_thread(self):
+        """Closes the connections of the current thread. It must be called on the thread that uses them."""
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            entry = self._readers.pop(thread_id, None)
+            writer = None
+            if self._writer is not None and self._writer_thread == thread_id:
+                writer, self._writer, self._writer_thread = self._writer, None, None
+
+        if entry is not None and entry[0] is not None:
+            entry[0].close()
+        if writer is not None:
+            writer.close()
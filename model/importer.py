@@ -0,0 +1,201 @@
+"""This module imports tasks from CSV and JSON Lines files into the app db.
+
+The file is read row by row, so big exports from other tools are never loaded into memory at once.
+Every row needs a "name". Optional fields: "due_date" (YYYY-MM-DD or MM/DD/YYYY), "notes",
+"completed" (0/1, true/false), "tag" (id of an existing tag).
+
+Usage:
+    python -m model.importer tasks.csv [--db path/to/data.db]
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+
+from model.dates import now_timestamp, parse_due_date
+from model.main_model import DB_PATH, Model
+
+# the file types that can be imported
+IMPORT_EXTENSIONS = (".csv", ".jsonl", ".ndjson")
+TRUE_VALUES = ("1", "true", "yes", "y", "x")
+FALSE_VALUES = ("", "0", "false", "no", "n")
+
+
+class ImportRowError(ValueError):
+    """Raised for a row that cannot be imported"""
+
+
+def iter_csv_rows(file):
+    """Yields the rows of a CSV file with a header line as dicts
+
+    Parameters
+    ----------
+    file: file object opened in text mode
+    """
+
+    yield from csv.DictReader(file)
+
+
+def iter_jsonl_rows(file):
+    """Yields the objects of a JSON Lines file, skipping empty lines.
+    A line that is not valid JSON is yielded as ImportRowError, so validate_row skips only that line.
+
+    Parameters
+    ----------
+    file: file object opened in text mode
+    """
+
+    for line_no, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            yield ImportRowError(f"line {line_no}: {error.msg}")
+
+
+def _parse_flag(value, field):
+    """Converts 0/1, true/false, yes/no into 0 or 1"""
+
+    if isinstance(value, bool):
+        return int(value)
+    text = str(value).strip().lower() if value is not None else ""
+    if text in TRUE_VALUES:
+        return 1
+    if text in FALSE_VALUES:
+        return 0
+    raise ImportRowError(f"{field} must be 0 or 1, got {value!r}")
+
+
+def validate_row(raw, time_added, tag_count):
+    """Converts a parsed row into a row for Model.create_tasks_bulk
+
+    Parameters
+    ----------
+    raw: dict
+        a row from iter_csv_rows or iter_jsonl_rows
+    time_added: int
+        the unix time the tasks are imported at
+    tag_count: int
+        number of tags in db, the tag ids go from 1 to tag_count
+
+    Returns
+    -------
+    tuple
+        (name, due_date, completed, notes, removed, time_added, tag)
+    """
+
+    if isinstance(raw, ImportRowError):
+        raise raw
+    if not isinstance(raw, dict):
+        raise ImportRowError(f"a row must be an object, got {raw!r}")
+
+    name = str(raw.get("name") or "").strip()
+    if not name:
+        raise ImportRowError("name is required")
+
+    try:
+        due_date = parse_due_date(raw.get("due_date"))
+    except ValueError as error:
+        raise ImportRowError(str(error)) from error
+    notes = raw.get("notes") or "NULL"
+    completed = _parse_flag(raw.get("completed"), "completed")
+
+    try:
+        tag = int(raw.get("tag") or 1)
+    except (TypeError, ValueError) as error:
+        raise ImportRowError(f"tag must be a tag id, got {raw.get('tag')!r}") from error
+    if not 1 <= tag <= tag_count:
+        raise ImportRowError(f"tag must be the id of an existing tag, got {tag}")
+
+    not_removed = 0
+    return (name, due_date, completed, str(notes), not_removed, time_added, tag)
+
+
+def iter_valid_rows(rows, skipped, tag_count):
+    """Yields the valid rows for Model.create_tasks_bulk and logs the invalid ones
+
+    Parameters
+    ----------
+    rows: iterable
+        parsed rows
+    skipped: list
+        the numbers of the invalid rows are appended to it
+    tag_count: int
+        number of tags in db
+    """
+
+    time_added = now_timestamp()
+    for row_no, raw in enumerate(rows, start=1):
+        try:
+            yield validate_row(raw, time_added, tag_count)
+        except ImportRowError as error:
+            logging.warning(f'Row {row_no} was skipped: {error}')
+            skipped.append(row_no)
+
+
+def import_tasks(model, path, batch_size=500):
+    """Imports tasks from a .csv or .jsonl file
+
+    Parameters
+    ----------
+    model: object
+        instance of class Model
+    path: str
+        path to the file. The format is chosen by the extension: .csv or .jsonl/.ndjson
+    batch_size: int
+        number of rows inserted with one executemany call
+
+    Returns
+    -------
+    tuple
+        number of imported tasks, list of the numbers of the skipped rows
+
+    Raises
+    ------
+    ValueError
+        if the file type is not supported or the file is not valid utf-8 or CSV, nothing is imported then
+    OSError
+        if the file cannot be read
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        parse_rows = iter_csv_rows
+    elif extension in (".jsonl", ".ndjson"):
+        parse_rows = iter_jsonl_rows
+    else:
+        raise ValueError(f"Unsupported file type {extension}, use .csv or .jsonl")
+
+    skipped = []
+    tag_count = len(model.get_all_tags())
+    # utf-8-sig drops the byte order mark that Excel writes before the header
+    with open(path, "r", encoding="utf-8-sig", newline="") as file:
+        try:
+            imported = model.create_tasks_bulk(iter_valid_rows(parse_rows(file), skipped, tag_count), batch_size)
+        except csv.Error as error:
+            raise ValueError(f"{os.path.basename(path)} is not a valid CSV file: {error}") from error
+
+    return imported, skipped
+
+
+def main():
+    """Imports a file given in the command line"""
+
+    parser = argparse.ArgumentParser(description="Import tasks from a .csv or .jsonl file")
+    parser.add_argument("path")
+    parser.add_argument("--db", default=DB_PATH, help="path to the db file")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    model = Model(args.db)
+    imported, skipped = import_tasks(model, args.path, args.batch_size)
+    model.clean()
+
+    print(f"Imported {imported} tasks, skipped {len(skipped)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,199 @@
 """This module contains the functionality related to the db queries and task data."""
 
 import logging
-import sqlite3
+import os
+import re
+import threading
 from collections import namedtuple
-import datetime
+from contextlib import contextmanager
+from itertools import islice
+
+from model.dates import now_timestamp
+from model.db_pool import DB_PATH, ConnectionPool
+from model.migrations import ARCHIVE_MIGRATIONS, enable_incremental_vacuum, migrate
+from model.recurrence import next_occurrence, parse_recurrence
+
+# number of rows fetched from sqlite at once by the task iterators
+FETCH_SIZE = 256
+
+TASK_COLUMNS = "rowid, name, due_date, completed, notes, removed, time_added, tag, removed_at, recurrence"
+ALL_TASKS_QUERY = f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY rowid ASC"
+TASK_INFO_QUERY = f"SELECT {TASK_COLUMNS} FROM tasks WHERE rowid = ?"
+# flags are literals so that sqlite can use the partial indexes on time_added
+COMPLETED_TASKS_QUERY = (
+    f"SELECT {TASK_COLUMNS} FROM tasks WHERE completed = 1 AND removed = 0 ORDER BY time_added ASC"
+)
+INCOMPLETE_TASKS_QUERY = (
+    f"SELECT {TASK_COLUMNS} FROM tasks WHERE completed = 0 AND removed = 0 ORDER BY time_added ASC"
+)
+# matches in the name weigh more than matches in the notes
+SEARCH_TASKS_QUERY = (
+    "SELECT tasks.rowid, tasks.name, tasks.due_date, tasks.completed, tasks.notes, tasks.removed, "
+    "tasks.time_added, tasks.tag, tasks.removed_at, tasks.recurrence "
+    "FROM tasks_fts JOIN tasks ON tasks.rowid = tasks_fts.rowid "
+    "WHERE tasks_fts MATCH ? AND tasks.removed = 0 ORDER BY bm25(tasks_fts, 10.0, 1.0) LIMIT ?"
+)
+SEARCH_LIMIT = 200
+
+# number of tasks loaded at once into a task list, a bit more than one screenful
+PAGE_SIZE = 100
+# list name -> (filter, sort columns). Sorts end with rowid, so every task has a unique key to continue from.
+# Flags are literals, so that the pages are read from the partial indexes on time_added and due_date.
+# The "?" of a filter are filled with the list params of get_tasks_page, due dates are day ordinals.
+TASK_LISTS = {
+    "incomplete": ("completed = 0 AND removed = 0", ("time_added", "rowid")),
+    "completed": ("completed = 1 AND removed = 0", ("time_added", "rowid")),
+    "overdue": ("completed = 0 AND removed = 0 AND due_date < ?", ("due_date", "rowid")),
+    "due": ("completed = 0 AND removed = 0 AND due_date BETWEEN ? AND ?", ("due_date", "rowid")),
+    "trash": ("removed = 1", ("removed_at", "rowid")),
+}
+# list name -> test of a task with the list params, the same filters as TASK_LISTS for the tasks in memory
+TASK_LIST_TESTS = {
+    "incomplete": lambda task: task.completed == 0 and task.removed == 0,
+    "completed": lambda task: task.completed == 1 and task.removed == 0,
+    "overdue": lambda task, today: (
+        task.completed == 0 and task.removed == 0 and task.due_date is not None and task.due_date < today
+    ),
+    "due": lambda task, first_day, last_day: (
+        task.completed == 0 and task.removed == 0 and task.due_date is not None
+        and first_day <= task.due_date <= last_day
+    ),
+    "trash": lambda task: task.removed == 1,
+}
+# incomplete tasks due from the first to the last given day, read from the partial index on due_date
+REMINDER_TASKS_QUERY = (
+    f"SELECT {TASK_COLUMNS} FROM tasks WHERE {TASK_LISTS['due'][0]} ORDER BY due_date ASC, rowid ASC"
+)
+# sort column -> field of Task
+SORT_KEY_FIELDS = {"rowid": "task_id", "time_added": "time_added", "due_date": "due_date", "removed_at": "removed_at"}
+
+# ids changed by one statement of a bulk change, below the 999 variables that older sqlite builds allow
+BULK_BATCH_SIZE = 500
+
+# removed tasks are moved to the archive this many days after they were removed
+TRASH_RETENTION_DAYS = 30
+# pages returned to the file system by one vacuum_step, 128 pages of 4 KiB take a few milliseconds
+VACUUM_STEP_PAGES = 128
+ARCHIVE_COLUMNS = "id, name, due_date, completed, notes, time_added, tag, removed_at, recurrence"
+
+
+# removed_at is the unix time a task was removed at, None for the tasks that are not removed.
+# recurrence is the rule of a repeating task, e.g. "1 week", None for the tasks that don't repeat.
+Task = namedtuple(
+    'Task', 'task_id name due_date completed notes removed time_added tag removed_at recurrence', defaults=(None, None)
+)
+
+
+def task_row_factory(_cursor, row):
+    """Builds a Task directly from a row selected with TASK_COLUMNS"""
+    return Task(*row)
+
+
+def build_page_query(list_name, first_page):
+    """Builds the query for one page of a task list
+
+    Parameters
+    ----------
+    list_name: str
+        one of TASK_LISTS
+    first_page: bool
+        False adds the condition that continues after the key of the last loaded task
+
+    Returns
+    -------
+    str
+        the query. Its parameters are the list params, the key of the last task if it is not the first page,
+        and the limit.
+    """
+
+    condition, sort_columns = TASK_LISTS[list_name]
+    columns = ", ".join(sort_columns)
+    if not first_page:
+        placeholders = ", ".join("?" for _ in sort_columns)
+        condition = f"{condition} AND ({columns}) > ({placeholders})"
+
+    return f"SELECT {TASK_COLUMNS} FROM tasks WHERE {condition} ORDER BY {columns} LIMIT ?"
+
+
+def page_key(list_name, task):
+    """Returns the values of the sort columns of a task list for the given task
+
+    Parameters
+    ----------
+    list_name: str
+        one of TASK_LISTS
+    task: object
+        instance of class Task
+    """
+
+    return tuple(getattr(task, SORT_KEY_FIELDS[column]) for column in TASK_LISTS[list_name][1])
+
+
+def task_in_list(list_name, task, params=()):
+    """Returns True if a task belongs to a task list, the filter of TASK_LISTS applied in memory
+
+    Parameters
+    ----------
+    list_name: str
+        one of TASK_LISTS
+    task: object
+        instance of class Task
+    params: tuple
+        values for the filter of the list, see get_tasks_page
+    """
+
+    return TASK_LIST_TESTS[list_name](task, *params)
+
+
+def task_matches_text(task, text):
+    """Returns True if a not removed task would be found by search_tasks: every word of the text
+    starts a word of its name or notes
+
+    Parameters
+    ----------
+    task: object
+        instance of class Task
+    text: str
+        text typed in the search field
+    """
+
+    words = re.findall(r"\w+", text.casefold())
+    task_words = re.findall(r"\w+", f"{task.name} {task.notes or ''}".casefold())
+    return bool(words) and task.removed == 0 and all(
+        any(task_word.startswith(word) for task_word in task_words) for word in words
+    )
+
+
+def build_match_query(text):
+    """Turns the text typed by a user into an FTS5 query
+
+    Every word becomes a quoted prefix term, so the operators and special characters of the
+    FTS5 syntax are matched as plain text and "buy mil" finds "Buy milk".
+
+    Parameters
+    ----------
+    text: str
+
+    Returns
+    -------
+    str
+        the MATCH expression or None if the text has no words
+    """
 
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
 
-def get_db_connection():
-    """Connect to the db"""
-    return sqlite3.connect("/Users/katestepanova/repos/to_do_list_app/data/data.db")
 
+def archive_path(db_path):
+    """Returns the path of the archive db that purged tasks are moved to, e.g. data.archive.db for data.db"""
 
-Task = namedtuple('Task', 'task_id name due_date completed notes removed time_added tag')
+    root, extension = os.path.splitext(db_path)
+    return f"{root}.archive{extension or '.db'}"
 
 
-class Model:
+class Model:  # pylint: disable=too-many-public-methods
     """
      A class that gets/sends data from/into db.
 
@@ -22,40 +201,137 @@ class Model:
     -------
     clean(self)
     __del__(self)
+    iter_all_tasks(self)
+    iter_completed_tasks(self)
+    iter_incomplete_tasks(self)
     get_all_tasks(self)
     create_task(self, task_name)
+    create_next_occurrences(self, task_ids, today)
     get_last_added_task(self)
     get_task_info(self, task_id)
+    get_tasks_page(self, list_name, after, limit)
+    get_all_tags(self)
+    create_tag(self, tag_name)
+    search_tasks(self, text, limit)
     update_task_info(self, task_id, new_name, due_date, notes)
+    delete_task(self, task_id)
+    restore_task(self, task_id)
+    purge_removed_tasks(self, removed_before)
+    purge_task(self, task_id)
+    vacuum_step(self, pages)
+    transaction(self)
 
     """
 
-    def __init__(self):
-        self.app_db = get_db_connection()
-        self.cursor = self.app_db.cursor()
+    def __init__(self, db_path=DB_PATH, synchronous="NORMAL", pool=None, tracer=None):
+        """
+        Parameters
+        ----------
+        db_path: str
+            path to the db file, used if there is no pool
+        synchronous: str
+            sqlite synchronous level of the writer, used if there is no pool
+        pool: object
+            instance of class ConnectionPool shared with other threads. Changes are made on the
+            thread that creates the model, reads on other threads use their own reader connections.
+        tracer: object
+            instance of class SqlTracer that records the latency of the methods and statements of the
+            model. It must be passed before the pool opened any connection.
+        """
+
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else ConnectionPool(db_path, synchronous=synchronous)
+        if tracer is not None:
+            tracer.attach(self.pool)
+            tracer.instrument(self)
+        migrate(self.app_db)
+        enable_incremental_vacuum(self.app_db)
+        self.transaction_depth = 0
+        # tag names ordered by id, loaded on the first get_all_tags and dropped when the tags change.
+        # The readers fill the cache while the writer drops it, the version counts the drops, so a list
+        # read before a change is not stored after it.
+        self._tags = None
+        self._tags_version = 0
+        self._tags_lock = threading.Lock()
+
+    @property
+    def app_db(self):
+        """The writer connection. It can only be used on the thread that created the model."""
+
+        return self.pool.writer()
+
+    @contextmanager
+    def transaction(self):
+        """Groups all changes made inside the block into one commit.
+
+        Blocks can be nested, only the outermost block commits. If the outermost block
+        raises an exception all changes made inside it are rolled back.
+
+        Example
+        -------
+        with model.transaction():
+            model.create_task("first")
+            model.create_task("second")
+        """
+
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.app_db.rollback()
+            raise
+
+        self.transaction_depth -= 1
+        if self.transaction_depth == 0:
+            self.app_db.commit()
 
     def clean(self):
-        """Close the db connection"""
+        """Close the db connections of the current thread"""
 
-        self.app_db.close()
+        self.pool.close_thread()
 
     def __del__(self):
-        """Calls self.clean method if db connection was established"""
+        """Calls self.clean method if the model opened its own connections"""
 
-        if self.app_db:
+        if getattr(self, "_owns_pool", False):
             self.clean()
 
+    def _iter_tasks(self, query, params=(), fetch_size=FETCH_SIZE):
+        """Yields Tasks of a query selecting TASK_COLUMNS, fetching fetch_size rows at a time
+
+        Every call uses its own cursor, so several iterators can be consumed at the same time.
+        """
+
+        cursor = self.pool.connection().cursor()
+        cursor.row_factory = task_row_factory
+        cursor.execute(query, params)
+        while True:
+            tasks = cursor.fetchmany(fetch_size)
+            if not tasks:
+                break
+            yield from tasks
+
+    def iter_all_tasks(self):
+        """Yields all tasks from db ordered by rowid"""
+
+        return self._iter_tasks(ALL_TASKS_QUERY)
+
+    def iter_completed_tasks(self):
+        """Yields COMPLETED not removed tasks from db ordered by time_added"""
+
+        return self._iter_tasks(COMPLETED_TASKS_QUERY)
+
+    def iter_incomplete_tasks(self):
+        """Yields incomplete not removed tasks from db ordered by time_added"""
+
+        return self._iter_tasks(INCOMPLETE_TASKS_QUERY)
+
     def get_all_tasks(self):
         """Gets the list of all tasks from db"""
 
-        tasks = []
-        query = "SELECT rowid, * FROM tasks ORDER BY rowid ASC"
-        results = self.cursor.execute(query).fetchall()
-        for result in results:
-            task = Task(*result)
-            tasks.append(task)
-
-        return tasks
+        return list(self.iter_all_tasks())
 
     def create_task(self, task_name):
         """Insert a new task into db
@@ -64,29 +340,75 @@ class Model:
         ----------
         task_name: str
             the name of a new task
+
+        Returns
+        -------
+        Task
+            the inserted task
         """
 
         query = (
-            "INSERT INTO tasks(name, due_date, completed, notes, removed, time_added) VALUES (?, ?, ?, ?, ?, ?, ?)"
+            "INSERT INTO tasks(name, due_date, completed, notes, removed, time_added, tag) VALUES (?, ?, ?, ?, ?, ?, ?)"
         )
         not_completed = 0
         not_removed = 0
-        time_added = datetime.datetime.today().strftime("%m/%d/%y %H/%M/%S")
         tag = 1
-        row = (task_name, "never", not_completed, "NULL", not_removed, time_added, tag)
+        row = (task_name, None, not_completed, "NULL", not_removed, now_timestamp(), tag)
+
+        with self.transaction():
+            cursor = self.app_db.execute(query, row)
+
+        return Task(cursor.lastrowid, *row)
+
+    def create_tasks_bulk(self, rows, batch_size=500):
+        """Insert many tasks into db in one transaction
+
+        Parameters
+        ----------
+        rows: iterable
+            tuples (name, due_date, completed, notes, removed, time_added, tag). The rows are
+            consumed in batches of batch_size, so a generator is never loaded into memory at once.
+        batch_size: int
+            number of rows for one executemany call
+
+        Returns
+        -------
+        int
+            number of inserted tasks
+        """
+
+        query = (
+            "INSERT INTO tasks(name, due_date, completed, notes, removed, time_added, tag) VALUES (?, ?, ?, ?, ?, ?, ?)"
+        )
+        inserted = 0
+        rows = iter(rows)
+
+        with self.transaction():
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                self.app_db.executemany(query, batch)
+                inserted += len(batch)
+
+        return inserted
 
-        self.cursor.execute(query, row)
-        self.app_db.commit()
+    def get_last_task_id(self):
+        """Gets the biggest task_id in db or 0 if there are no tasks"""
+
+        query = "SELECT MAX(rowid) FROM tasks"
+        result = self.pool.connection().execute(query).fetchone()[0]
+
+        return result or 0
 
     def get_last_added_task(self):
         """Gets last added task from db"""
 
-        query = "SELECT rowid, * FROM tasks ORDER BY time_added DESC;"
-        results = self.cursor.execute(query).fetchone()
+        query = f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY time_added DESC"
 
-        return Task(*results)
+        return next(self._iter_tasks(query, fetch_size=1), None)
 
-    def get_task_info(self, task) -> Task:
+    def get_task_info(self, task_id) -> Task:
         """Get a task info from db for edit window launch
 
          Parameters
@@ -94,183 +416,533 @@ class Model:
         task_id - int
             id of a task that equals rowid in db
         """
-        task_id, task_name = task
 
-        query_select = "SELECT rowid, * FROM tasks WHERE rowid=?;"
-        valid_result = self.cursor.execute(query_select, (task_id,)).fetchone()
+        return next(self._iter_tasks(TASK_INFO_QUERY, (task_id,), fetch_size=1), None)
+
+    def get_tasks_page(self, list_name, after=None, limit=PAGE_SIZE, params=()):
+        """Gets the next page of a task list with a keyset query.
+
+        The page continues after the sort key of the last loaded task instead of skipping
+        rows with OFFSET, so every page costs the same no matter how far the list is scrolled.
+
+        Parameters
+        ----------
+        list_name: str
+            "incomplete", "completed", "overdue" or "due", see TASK_LISTS
+        after: object
+            the last Task of the previous page or None for the first page
+        limit: int
+            maximum number of tasks in the page
+        params: tuple
+            values for the filter of the list: the current day for "overdue",
+            the first and the last day for "due"
+
+        Returns
+        -------
+        list
+            Tasks of the page. A page shorter than limit is the last one.
+        """
+
+        query = build_page_query(list_name, after is None)
+        key = () if after is None else page_key(list_name, after)
+
+        return list(self._iter_tasks(query, (*params, *key, limit), fetch_size=limit))
 
-        db_task_id = valid_result[0]
-        db_task_name = valid_result[1]
+    def get_reminder_tasks(self, first_day, last_day):
+        """Gets the incomplete not removed tasks due from the first to the last day to remind of them
 
-        if valid_result is not None:
-            if db_task_id != task_id or db_task_name != task_name:
-                query = "SELECT rowid, *  FROM tasks WHERE name=?;"
-                result = self.cursor.execute(query, (task_name,)).fetchone()
-            else:
-                result = valid_result
-        else:
-            query = "SELECT rowid, *  FROM tasks WHERE name=?;"
-            result = self.cursor.execute(query, (task_name,)).fetchone()
+        Parameters
+        ----------
+        first_day: int
+            ordinal of the first day, usually today
+        last_day: int
+            ordinal of the last day, included
+
+        Returns
+        -------
+        list
+            Tasks ordered by due date
+        """
+
+        return list(self._iter_tasks(REMINDER_TASKS_QUERY, (first_day, last_day)))
+
+    def search_tasks(self, text, limit=SEARCH_LIMIT):
+        """Finds not removed tasks whose name or notes contain words starting with the words of the text
+
+        Parameters
+        ----------
+        text: str
+            text typed in the search field
+        limit: int
+            maximum number of tasks to return
+
+        Returns
+        -------
+        list
+            Tasks ordered by relevance, the best match first
+        """
 
-        return Task(*result)
+        match_query = build_match_query(text)
+        if match_query is None:
+            return []
+
+        return list(self._iter_tasks(SEARCH_TASKS_QUERY, (match_query, limit)))
+
+    def _update_task(self, task_id, changes):
+        """Updates the given fields of one task with a single statement by rowid
+
+        Parameters
+        ----------
+        task_id - int
+        changes - dict
+            column names and new values. The names always come from the Model methods, not from a user.
+
+        Returns
+        -------
+        dict
+            task_id of the updated row and the changed fields or None if there is no such task
+        """
+
+        assignments = ", ".join(f"{column}=?" for column in changes)
+        query = f"UPDATE tasks SET {assignments} WHERE rowid=?"
+        with self.transaction():
+            cursor = self.app_db.execute(query, (*changes.values(), task_id))
+
+        if cursor.rowcount == 0:
+            return None
+
+        return {'task_id': task_id, **changes}
+
+    def _update_tasks(self, task_ids, changes):
+        """Updates the same fields of many tasks with one statement per BULK_BATCH_SIZE ids and one commit
+
+        Parameters
+        ----------
+        task_ids - iterable
+            ids of the tasks, repeated ids are updated once
+        changes - dict
+            column names and new values, see _update_task()
+
+        Returns
+        -------
+        list
+            dicts with the task_id of every updated row and the changed fields
+        """
+
+        task_ids = list(dict.fromkeys(task_ids))
+        assignments = ", ".join(f"{column}=?" for column in changes)
+        updated = []
+
+        with self.transaction():
+            for start in range(0, len(task_ids), BULK_BATCH_SIZE):
+                batch = task_ids[start:start + BULK_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                cursor = self.app_db.execute(
+                    f"UPDATE tasks SET {assignments} WHERE rowid IN ({placeholders})", (*changes.values(), *batch)
+                )
+                if cursor.rowcount != len(batch):
+                    # only ids that are gone make the count differ, they are looked up in the rare case it does
+                    query = f"SELECT rowid FROM tasks WHERE rowid IN ({placeholders})"
+                    existing = {row[0] for row in self.app_db.execute(query, batch)}
+                    batch = [task_id for task_id in batch if task_id in existing]
+                updated.extend(batch)
+
+        return [{'task_id': task_id, **changes} for task_id in updated]
 
     def update_task_info(self, updated_data):
         """Updates a task info in db
 
+        Parameters
+        ----------
+        updated_data - dict
+            task_id - int
+            name - str
+            due_date - int
+                ordinal of the day or None, see model/dates.py
+            notes - str
+            recurrence - str
+                optional, the rule of a repeating task or None, see model/recurrence.py
+
+        Returns
+        -------
+        dict
+            task_id of the updated row and the changed fields
+        """
+
+        task_id = updated_data['task_id']
+        logging.debug(f'This is task_id {task_id}')
+
+        changes = {
+            'name': updated_data['name'],
+            'due_date': updated_data['due_date'],
+            'notes': updated_data['notes'],
+        }
+        if 'recurrence' in updated_data:
+            changes['recurrence'] = updated_data['recurrence']
+        return self._update_task(task_id, changes)
+
+    def delete_task(self, task_id):
+        """Moves a task to the trash. It stays in db until it is restored or purged.
+
         Parameters
         ----------
         task_id - int
-        new_name - str
-        due_date - str
-        notes - str
+
+        Returns
+        -------
+        dict
+            task_id of the removed row, the flipped flag and the time of the removal
         """
 
-        previous_name, task_id, new_name, due_date, notes = updated_data.values()
+        logging.debug(f'This task is gonna be deleted: {task_id}')
+
+        return self._update_task(task_id, {'removed': 1, 'removed_at': now_timestamp()})
 
-        logging.debug(f'This is previous name {previous_name}')
-        logging.debug(f'This is task_id name {task_id}')
+    def restore_task(self, task_id):
+        """Moves a task from the trash back to its list
 
-        select_query = "SELECT rowid, name FROM tasks WHERE rowid=?"
-        results = self.cursor.execute(select_query, (task_id,)).fetchone()
+        Parameters
+        ----------
+        task_id - int
+
+        Returns
+        -------
+        dict
+            task_id of the restored row and the flipped flag
+        """
+
+        return self._update_task(task_id, {'removed': 0, 'removed_at': None})
+
+    def restore_tasks(self, task_ids):
+        """Moves many tasks from the trash back to their lists in one transaction
+
+        Parameters
+        ----------
+        task_ids - iterable
 
-        if results is not None:
-            rowid = results[0]
-            name = results[1]
-            if (rowid == task_id) and (name == new_name):
-                query = "UPDATE tasks  SET name=?, due_date=?, notes=? WHERE rowid=?"
-                row = (new_name, due_date, notes, task_id)
-                self.cursor.execute(query, row)
-                self.app_db.commit()
-                return
+        Returns
+        -------
+        list
+            dicts with the task_id of every restored row and the flipped flag
+        """
 
-        query = "UPDATE tasks  SET name=?, due_date=?, notes=? WHERE name=?"
-        row = (new_name, due_date, notes, previous_name)
-        self.cursor.execute(query, row)
-        self.app_db.commit()
+        return self._update_tasks(task_ids, {'removed': 0, 'removed_at': None})
 
-    def delete_task(self, task):
-        """Removes a task from db
+    def delete_tasks(self, task_ids):
+        """Moves many tasks to the trash in one transaction
+
+        Parameters
+        ----------
+        task_ids - iterable
+
+        Returns
+        -------
+        list
+            dicts with the task_id of every removed row, the flipped flag and the time of the removal
+        """
+
+        return self._update_tasks(task_ids, {'removed': 1, 'removed_at': now_timestamp()})
+
+    def _attach_archive(self):
+        """Attaches the archive db to the writer connection, creating or migrating it on the first purge"""
+
+        connection = self.app_db
+        if connection.execute("SELECT 1 FROM pragma_database_list WHERE name = 'archive'").fetchone() is None:
+            connection.execute("ATTACH DATABASE ? AS archive", (archive_path(self.pool.db_path),))
+            migrate(connection, ARCHIVE_MIGRATIONS, "archive")
+
+    def _has_tasks(self, condition, params):
+        """Returns True if any task matches the condition"""
+
+        return self.app_db.execute(f"SELECT 1 FROM tasks WHERE {condition} LIMIT 1", params).fetchone() is not None
+
+    def _purge(self, condition, params):
+        """Moves the removed tasks matching the condition to the archive db and deletes them from tasks.
+
+        The archive is a separate file, so the db file only holds the tasks that are in use or in the trash.
+        It is attached only if there is something to move, so a purge of an empty trash creates no file.
+        A purge that is interrupted between the two files may leave a task in both of them, it is
+        purged again next time and replaces its copy in the archive.
+        """
+
+        if not self._has_tasks(condition, params):
+            return 0
+
+        self._attach_archive()
+        with self.transaction():
+            self.app_db.execute(
+                f"INSERT OR REPLACE INTO archive.tasks_archive({ARCHIVE_COLUMNS}, purged_at) "
+                f"SELECT {ARCHIVE_COLUMNS}, ? FROM tasks WHERE {condition}",
+                (now_timestamp(), *params),
+            )
+            cursor = self.app_db.execute(f"DELETE FROM tasks WHERE {condition}", params)
+
+        return cursor.rowcount
+
+    def purge_removed_tasks(self, removed_before=None):
+        """Moves the tasks removed before the given time from the trash to the archive.
+        It must not be called inside of a transaction, the archive is attached before the purge.
+
+        Parameters
+        ----------
+        removed_before: int
+            unix time, None purges the whole trash
+
+        Returns
+        -------
+        int
+            number of purged tasks
+        """
+
+        if removed_before is None:
+            return self._purge("removed = 1", ())
+        return self._purge("removed = 1 AND removed_at < ?", (removed_before,))
+
+    def purge_task(self, task_id):
+        """Moves one task from the trash to the archive
 
         Parameters
         ----------
         task_id - int
+
+        Returns
+        -------
+        int
+            1 if the task was purged, 0 if it is not in the trash
+        """
+
+        return self._purge("removed = 1 AND id = ?", (task_id,))
+
+    def purge_tasks(self, task_ids):
+        """Moves many tasks from the trash to the archive in one transaction
+
+        Parameters
+        ----------
+        task_ids - iterable
+
+        Returns
+        -------
+        int
+            number of purged tasks, the ids that are not in the trash are skipped
         """
-        task_id, task_name = task.values()
 
-        logging.debug(f'This task is gonna be deleted: {task_name}')
+        task_ids = list(dict.fromkeys(task_ids))
+        batches = [task_ids[start:start + BULK_BATCH_SIZE] for start in range(0, len(task_ids), BULK_BATCH_SIZE)]
+        conditions = [(f"removed = 1 AND id IN ({', '.join('?' * len(batch))})", batch) for batch in batches]
+        if not any(self._has_tasks(condition, batch) for condition, batch in conditions):
+            return 0
+
+        purged = 0
+        # attached before the transaction, a db cannot be attached inside of it
+        self._attach_archive()
+        with self.transaction():
+            for condition, batch in conditions:
+                purged += self._purge(condition, batch)
 
-        select_query = "SELECT rowid, name FROM tasks WHERE rowid=?"
-        results = self.cursor.execute(select_query, (task_id,)).fetchone()
-        removed = 1
+        return purged
 
-        if results is not None:
-            rowid = results[0]
-            name = results[1]
-            if (rowid == task_id) and (name == task_name):
-                query = "UPDATE  tasks SET removed=? WHERE rowid=?"
-                self.cursor.execute(query, (removed, task_id,))
-                self.app_db.commit()
-                return True
+    def vacuum_step(self, pages=VACUUM_STEP_PAGES):
+        """Returns up to the given number of free pages of the db file to the file system.
+        It must not be called inside of a transaction.
 
-        query = "UPDATE  tasks SET removed=? WHERE name=?"
-        self.cursor.execute(query, (removed, task_name,))
-        self.app_db.commit()
+        Parameters
+        ----------
+        pages: int
 
-        return True
+        Returns
+        -------
+        int
+            number of free pages that are left
+        """
 
-    def complete_task(self, task):
+        connection = self.app_db
+        free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        if free_pages:
+            # the pragma frees one page per step, execute() steps it only once and executescript() to the end
+            connection.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+            free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+
+        return free_pages
+
+    def complete_task(self, task_id):
         """Complete task changing the flag 'complete' in db"
 
         Parameters
         ----------
         task_id: int
-        task_name: str
+
+        Returns
+        -------
+        dict
+            task_id of the completed row and the flipped flag
         """
 
-        task_id, task_name = task.values()
-
-        logging.debug(f'This task is gonna be completed: {task_name}')
-
-        select_query = "SELECT rowid, name FROM tasks WHERE rowid=?"
-        results = self.cursor.execute(select_query, (task_id,)).fetchone()
-        completed = 1
-
-        if results is not None:
-            rowid = results[0]
-            name = results[1]
-            if (rowid == task_id) and (name == task_name):
-                query = "UPDATE tasks SET completed = ? WHERE rowid=?"
-                self.cursor.execute(
-                    query,
-                    (
-                        completed,
-                        task_id,
-                    ),
-                )
-                self.app_db.commit()
-                return True
-
-        query = "UPDATE tasks SET completed = ? WHERE name=?"
-        self.cursor.execute(
-            query,
-            (
-                completed,
-                task_name,
-            ),
-        )
-        self.app_db.commit()
+        logging.debug(f'This task is gonna be completed: {task_id}')
 
-        return True
+        return self._update_task(task_id, {'completed': 1})
 
-    def get_completed_tasks(self):
-        """Gets the list of all COMPLETED tasks from db"""
+    def complete_tasks(self, task_ids):
+        """Completes many tasks in one transaction
 
-        tasks = []
-        query = "SELECT rowid, * FROM tasks WHERE completed = ? AND removed = ? ORDER BY time_added ASC"
-        completed = 1
-        not_removed = 0
-        results = self.cursor.execute(query, (completed, not_removed,)).fetchall()
-        for result in results:
-            task = Task(*result)
-            tasks.append(task)
+        Parameters
+        ----------
+        task_ids - iterable
+
+        Returns
+        -------
+        list
+            dicts with the task_id of every completed row and the flipped flag
+        """
 
-        return tasks
+        logging.debug(f'These tasks are gonna be completed: {task_ids}')
 
-    def get_incomplete_tasks(self):
-        """Gets the list of  incomplete tasks from db"""
+        return self._update_tasks(task_ids, {'completed': 1})
 
-        incomplete_tasks = []
+    def create_next_occurrences(self, task_ids, today):
+        """Creates the next instance of every incomplete repeating task among the tasks that are being completed.
+        It runs in the transaction that completes them, so the future instances are never stored in advance.
 
-        query = "SELECT name FROM tasks WHERE completed = ? AND removed = ? ORDER BY time_added ASC"
-        not_completed = 0
-        not_removed = 0
+        Parameters
+        ----------
+        task_ids - iterable
+            ids of the tasks that are completed next
+        today - int
+            ordinal of the current day, the occurrences missed before it are skipped
+
+        Returns
+        -------
+        list
+            the inserted Tasks
+        """
+
+        query = (
+            "INSERT INTO tasks(name, due_date, completed, notes, removed, time_added, tag, recurrence) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        task_ids = list(dict.fromkeys(task_ids))
+        created = []
+
+        with self.transaction():
+            for start in range(0, len(task_ids), BULK_BATCH_SIZE):
+                batch = task_ids[start:start + BULK_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                repeating = list(self._iter_tasks(
+                    f"SELECT {TASK_COLUMNS} FROM tasks WHERE rowid IN ({placeholders}) "
+                    "AND completed = 0 AND removed = 0 AND recurrence IS NOT NULL", batch
+                ))
+                for task in repeating:
+                    try:
+                        due_date = next_occurrence(parse_recurrence(task.recurrence), task.due_date, today)
+                    except ValueError as error:
+                        # a rule stored before the rules were checked, the task is completed without a next instance
+                        logging.warning(f'Task {task.task_id} is not repeated: {error}')
+                        continue
+                    row = (task.name, due_date, 0, task.notes, 0, now_timestamp(), task.tag, task.recurrence)
+                    cursor = self.app_db.execute(query, row)
+                    created.append(Task(cursor.lastrowid, *row[:-1], recurrence=task.recurrence))
+
+        return created
+
+    def get_task_counters(self, today):
+        """Counts not removed tasks with one aggregate query
+
+        Parameters
+        ----------
+        today: int
+            ordinal of the current day. Incomplete tasks with an earlier due date are overdue.
+
+        Returns
+        -------
+        tuple
+            total, overdue and completed numbers of tasks
+        """
+
+        query = (
+            "SELECT COUNT(*), COUNT(CASE WHEN completed = 0 AND due_date < ? THEN 1 END), "
+            "COUNT(CASE WHEN completed = 1 THEN 1 END) FROM tasks WHERE removed = 0"
+        )
+        return self.pool.connection().execute(query, (today,)).fetchone()
 
-        results = self.cursor.execute(query, (not_completed, not_removed,)).fetchall()
-        for name in results:
-            incomplete_tasks.append(name[0])
+    def get_overdue_count(self, today):
+        """Counts incomplete not removed tasks whose due date has passed.
+        Only the part of the due date index before today is read.
 
-        return incomplete_tasks
+        Parameters
+        ----------
+        today: int
+            ordinal of the current day
+        """
+
+        query = "SELECT COUNT(*) FROM tasks WHERE completed = 0 AND removed = 0 AND due_date < ?"
+        return self.pool.connection().execute(query, (today,)).fetchone()[0]
 
     def get_all_tags(self):
-        """Gets the list of tags from db"""
+        """Gets the list of tag names ordered by id. The tags are read from db only after they were changed."""
+
+        with self._tags_lock:
+            tags, version = self._tags, self._tags_version
+        if tags is None:
+            query = "SELECT tag_name FROM tags ORDER BY id"
+            tags = tuple(tag[0] for tag in self.pool.connection().execute(query))
+            with self._tags_lock:
+                if self._tags_version == version:
+                    self._tags = tags
 
-        tags = []
-        query = "SELECT tag_name FROM tags"
-        results = self.cursor.execute(query).fetchall()
+        return list(tags)
 
-        for tag in results:
-            tags.append(tag[0])
+    def _drop_cached_tags(self):
+        """Drops the cached tags after a change, the lists that are being read now are not stored"""
 
-        return tags
+        with self._tags_lock:
+            self._tags = None
+            self._tags_version += 1
+
+    def create_tag(self, tag_name):
+        """Adds a new tag and drops the cached tags
+
+        Parameters
+        ----------
+        tag_name: str
+
+        Returns
+        -------
+        int
+            id of the new tag
+        """
 
-    def update_tag(self, task, tag_id):
+        with self.transaction():
+            cursor = self.app_db.execute("INSERT INTO tags(tag_name) VALUES (?)", (tag_name,))
+        self._drop_cached_tags()
+
+        return cursor.lastrowid
+
+    def update_tag(self, task_id, tag_id):
         """Update the tag for the current task
          Parameters
         ----------
-        task - str, name of the task
+        task_id - int
+        tag_id - int
+
+        Returns
+        -------
+        dict
+            task_id of the updated row and the new tag
+        """
+
+        return self._update_task(task_id, {'tag': tag_id})
+
+    def retag_tasks(self, task_ids, tag_id):
+        """Sets the same tag on many tasks in one transaction
+
+        Parameters
+        ----------
+        task_ids - iterable
         tag_id - int
+
+        Returns
+        -------
+        list
+            dicts with the task_id of every updated row and the new tag
         """
 
-        query = "UPDATE tasks SET tag = ? WHERE name=?"
-        self.cursor.execute(query, (tag_id, task,))
-        self.app_db.commit()
+        return self._update_tasks(task_ids, {'tag': tag_id})
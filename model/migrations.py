@@ -0,0 +1,272 @@
+"""This module contains the versioned schema migrations for the app db.
+
+The current schema version is stored in the db itself with PRAGMA user_version.
+Each migration runs in its own transaction, so an existing db is upgraded in place
+one version at a time and a failed migration leaves the db at the previous version.
+The archive db of the purged tasks has its own versions, it is migrated when it is attached.
+"""
+
+import logging
+from datetime import date
+
+from model.dates import now_timestamp, parse_due_date, parse_time_added
+
+# PRAGMA auto_vacuum value of INCREMENTAL
+INCREMENTAL_AUTO_VACUUM = 2
+
+
+def _create_base_schema(connection):
+    """Creates the tables that the app expects if the db is empty"""
+
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS "tags" ('
+        '"id" INTEGER, "tag_name" TEXT, PRIMARY KEY("id"), FOREIGN KEY("id") REFERENCES "tags"("id"))'
+    )
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS "tasks" ('
+        '"name" TEXT, "due_date" TEXT, "completed" INTEGER, "notes" TEXT, "removed" INTEGER, '
+        '"time_added" INTEGER, "tag" INTEGER, FOREIGN KEY("tag") REFERENCES "tags"("id"))'
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO tags(id, tag_name) VALUES (?, ?)",
+        ((1, "work"), (2, "home"), (3, "miscellaneous")),
+    )
+
+
+def _create_time_added_indexes(connection):
+    """Creates the partial indexes of the incomplete and completed task lists"""
+
+    # The list filters always ask for one (completed, removed) combination ordered by time_added,
+    # so partial indexes on time_added keep only the rows of that filter.
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_incomplete_time_added ON tasks(time_added) "
+        "WHERE completed = 0 AND removed = 0"
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_completed_time_added ON tasks(time_added) "
+        "WHERE completed = 1 AND removed = 0"
+    )
+
+
+def _create_task_search_index(connection):
+    """Creates the full-text index over task names and notes and the triggers that keep it in sync"""
+
+    # external content table: the text is stored only in tasks, the index keeps the tokens.
+    # "NULL" is what the app writes for empty notes, it is not indexed.
+    connection.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+        "name, notes, content='tasks', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')"
+    )
+    _create_task_search_triggers(connection)
+    connection.execute(
+        "INSERT INTO tasks_fts(rowid, name, notes) SELECT rowid, name, NULLIF(notes, 'NULL') FROM tasks"
+    )
+
+
+def _create_task_search_triggers(connection):
+    """Creates the triggers that copy the changes of tasks into tasks_fts"""
+
+    connection.execute(
+        "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO tasks_fts(rowid, name, notes) VALUES (new.rowid, new.name, NULLIF(new.notes, 'NULL')); "
+        "END"
+    )
+    connection.execute(
+        "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, name, notes) "
+        "VALUES ('delete', old.rowid, old.name, NULLIF(old.notes, 'NULL')); "
+        "END"
+    )
+    connection.execute(
+        "CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF name, notes ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, name, notes) "
+        "VALUES ('delete', old.rowid, old.name, NULLIF(old.notes, 'NULL')); "
+        "INSERT INTO tasks_fts(rowid, name, notes) VALUES (new.rowid, new.name, NULLIF(new.notes, 'NULL')); "
+        "END"
+    )
+
+
+def _convert_task_dates(row):
+    """Converts due_date and time_added of one tasks row into integers"""
+
+    task_id, name, due_date, completed, notes, removed, time_added, tag = row
+
+    try:
+        time_added = parse_time_added(time_added)
+    except ValueError:
+        logging.warning(f'Task {task_id}: time_added {time_added!r} is not a date, 0 is used')
+        time_added = 0
+
+    try:
+        # dates without a year, like "Today: Oct/18", are taken from the year the task was added in
+        reference = date.fromtimestamp(time_added) if time_added else None
+        due_date = parse_due_date(due_date, reference)
+    except ValueError:
+        logging.warning(f'Task {task_id}: due_date {due_date!r} is not a date, it is dropped')
+        due_date = None
+
+    return task_id, name, due_date, completed, notes, removed, time_added, tag
+
+
+def _store_dates_as_integers(connection):
+    """Rebuilds tasks with integer due_date and time_added columns.
+
+    sqlite cannot change the type of a column, so the rows are copied into a new table with the same
+    rowids, which keeps task ids and the rows of tasks_fts valid. The rowid gets an INTEGER PRIMARY KEY
+    alias, so VACUUM can no longer renumber the tasks.
+    """
+
+    connection.execute(
+        'CREATE TABLE "tasks_new" ('
+        '"id" INTEGER PRIMARY KEY, "name" TEXT, "due_date" INTEGER, "completed" INTEGER, "notes" TEXT, '
+        '"removed" INTEGER, "time_added" INTEGER NOT NULL DEFAULT 0, "tag" INTEGER, '
+        'FOREIGN KEY("tag") REFERENCES "tags"("id"))'
+    )
+    rows = connection.execute(
+        "SELECT rowid, name, due_date, completed, notes, removed, time_added, tag FROM tasks"
+    ).fetchall()
+    connection.executemany(
+        "INSERT INTO tasks_new(id, name, due_date, completed, notes, removed, time_added, tag) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (_convert_task_dates(row) for row in rows),
+    )
+
+    # dropping the table drops its indexes and triggers as well
+    connection.execute("DROP TABLE tasks")
+    connection.execute("ALTER TABLE tasks_new RENAME TO tasks")
+    _create_time_added_indexes(connection)
+    _create_task_search_triggers(connection)
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_incomplete_due_date ON tasks(due_date) "
+        "WHERE completed = 0 AND removed = 0"
+    )
+
+
+def _add_trash(connection):
+    """Adds the time a task was removed at, so removed tasks can be listed and purged after a while.
+
+    Tasks removed before this version get the time of the migration, their retention starts now.
+    """
+
+    connection.execute('ALTER TABLE tasks ADD COLUMN "removed_at" INTEGER')
+    connection.execute("UPDATE tasks SET removed_at = ? WHERE removed = 1", (now_timestamp(),))
+    connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_removed_at ON tasks(removed_at) WHERE removed = 1")
+
+
+def _add_recurrence(connection):
+    """Adds the recurrence rule of a task, NULL for the tasks that don't repeat, see model/recurrence.py"""
+
+    connection.execute('ALTER TABLE tasks ADD COLUMN "recurrence" TEXT')
+
+
+def _create_archive_schema(connection):
+    """Creates the table of the purged tasks in the attached archive db"""
+
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS archive."tasks_archive" ('
+        '"id" INTEGER PRIMARY KEY, "name" TEXT, "due_date" INTEGER, "completed" INTEGER, "notes" TEXT, '
+        '"time_added" INTEGER, "tag" INTEGER, "removed_at" INTEGER, "purged_at" INTEGER)'
+    )
+
+
+def _add_archive_recurrence(connection):
+    """Adds the recurrence rule of the purged tasks, the tasks purged before this version keep NULL"""
+
+    connection.execute('ALTER TABLE archive."tasks_archive" ADD COLUMN "recurrence" TEXT')
+
+
+# (version, description, function). Versions must be consecutive, new migrations go to the end.
+MIGRATIONS = [
+    (1, "base schema", _create_base_schema),
+    (2, "task list indexes", _create_time_added_indexes),
+    (3, "full-text search over task names and notes", _create_task_search_index),
+    (4, "integer due dates and times, due date index", _store_dates_as_integers),
+    (5, "removal time of tasks for the trash", _add_trash),
+    (6, "recurrence rules of repeating tasks", _add_recurrence),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# the migrations of the archive db, applied to the schema attached as "archive"
+ARCHIVE_MIGRATIONS = [
+    (1, "archive of the purged tasks", _create_archive_schema),
+    (2, "recurrence rules of the purged tasks", _add_archive_recurrence),
+]
+
+LATEST_ARCHIVE_VERSION = ARCHIVE_MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection, schema="main"):
+    """Returns the schema version of the db
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+    schema: str
+        "main" or the name of an attached db
+    """
+
+    return connection.execute(f"PRAGMA {schema}.user_version").fetchone()[0]
+
+
+def migrate(connection, migrations=None, schema="main"):
+    """Applies all migrations that are newer than the schema version of the db
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+    migrations: list
+        ARCHIVE_MIGRATIONS or None for MIGRATIONS
+    schema: str
+        "main" or the name of the attached db the migrations are for
+
+    Returns
+    -------
+    int
+        the schema version after migrating
+    """
+
+    version = get_schema_version(connection, schema)
+
+    for migration_version, description, apply_migration in migrations or MIGRATIONS:
+        if migration_version <= version:
+            continue
+
+        logging.debug(f'Migrating {schema} db to version {migration_version}: {description}')
+        connection.execute("BEGIN")
+        try:
+            apply_migration(connection)
+            # PRAGMA does not accept parameters, the version is always an int from MIGRATIONS
+            connection.execute(f"PRAGMA {schema}.user_version = {int(migration_version)}")
+        except Exception:
+            connection.rollback()
+            raise
+        connection.commit()
+        version = migration_version
+
+    return version
+
+
+def enable_incremental_vacuum(connection):
+    """Turns on incremental auto_vacuum, so the pages freed by purged tasks can be returned in small steps.
+
+    An existing db is converted with one VACUUM, a new db is converted while it is still small.
+    It must be called outside of a transaction.
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+
+    Returns
+    -------
+    bool
+        True if the db was converted
+    """
+
+    if connection.execute("PRAGMA auto_vacuum").fetchone()[0] == INCREMENTAL_AUTO_VACUUM:
+        return False
+
+    logging.debug('Converting db to incremental auto_vacuum')
+    connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    connection.execute("VACUUM")
+    return True
@@ -0,0 +1,208 @@
+"""This module contains the recurrence rules of the repeating tasks.
+
+A rule is stored in tasks.recurrence as "<interval> <unit>", e.g. "1 day", "2 week" or "1 month",
+and NULL for a task that doesn't repeat. Only the current instance of a repeating task is a row in db.
+The later due dates are produced by a generator when they are needed, and the next instance is
+created when the current one is completed.
+"""
+
+import calendar
+import re
+from collections import namedtuple
+from datetime import date
+from itertools import count, islice
+
+from model.dates import SHORT_DATE_FORMAT
+
+UNITS = ("day", "week", "month")
+DAYS_PER_UNIT = {"day": 1, "week": 7}
+Recurrence = namedtuple("Recurrence", "interval unit")
+# the options of the edit window and the rules they stand for
+RECURRENCE_PRESETS = {
+    "Daily": Recurrence(1, "day"),
+    "Weekly": Recurrence(1, "week"),
+    "Every 2 weeks": Recurrence(2, "week"),
+    "Monthly": Recurrence(1, "month"),
+}
+NO_RECURRENCE_TEXT = "Does not repeat"
+# the longest interval of a rule, longer ones would soon run out of the dates that datetime supports
+MAX_INTERVAL = 365
+# "every 3 days", "every week" or the stored "3 day"
+RECURRENCE_PATTERN = re.compile(r"^(?:every\s+)?(\d*)\s*(day|week|month)s?$")
+
+
+def parse_recurrence(text):
+    """Converts a rule typed or chosen in the ui or stored in db into a Recurrence
+
+    Parameters
+    ----------
+    text: str
+        one of RECURRENCE_PRESETS, NO_RECURRENCE_TEXT, "every N days/weeks/months" or a stored rule
+
+    Returns
+    -------
+    Recurrence
+        the rule or None if the task doesn't repeat
+
+    Raises
+    ------
+    ValueError
+        if the text is not a rule or its interval is not from 1 to MAX_INTERVAL
+    """
+
+    if text is None:
+        return None
+
+    value = " ".join(str(text).split())
+    if not value or value.lower() == NO_RECURRENCE_TEXT.lower():
+        return None
+    for name, rule in RECURRENCE_PRESETS.items():
+        if value.lower() == name.lower():
+            return rule
+
+    match = RECURRENCE_PATTERN.match(value.lower())
+    if match is None:
+        raise ValueError(f"not a recurrence rule: {text!r}")
+    interval = int(match.group(1) or 1)
+    if not 1 <= interval <= MAX_INTERVAL:
+        raise ValueError(f"the interval of a recurrence rule must be from 1 to {MAX_INTERVAL}: {text!r}")
+    return Recurrence(interval, match.group(2))
+
+
+def format_recurrence(rule):
+    """Converts a Recurrence into the text stored in db, None stays None"""
+
+    if rule is None:
+        return None
+    return f"{rule.interval} {rule.unit}"
+
+
+def describe_recurrence(rule):
+    """Returns the text shown in the ui for a Recurrence: a preset name or "Every N units" """
+
+    if rule is None:
+        return NO_RECURRENCE_TEXT
+    for name, preset in RECURRENCE_PRESETS.items():
+        if preset == rule:
+            return name
+    return f"Every {rule.interval} {rule.unit}s"
+
+
+def _add_months(day, months):
+    """Returns the same day of the month a number of months later, the last day of a shorter month"""
+
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def occurrences(rule, start, first_day=None):
+    """Yields the due dates of a repeating task lazily, without end
+
+    Every date is counted from the start, so a monthly task due on the 31st stays on the last day
+    of the shorter months and comes back to the 31st.
+
+    Parameters
+    ----------
+    rule: Recurrence
+    start: int
+        ordinal of the first due date
+    first_day: int
+        ordinal of the first day of the window, the earlier dates are skipped without generating them
+    """
+
+    first_step = 0
+    if first_day is not None and first_day > start:
+        if rule.unit in DAYS_PER_UNIT:
+            step_days = rule.interval * DAYS_PER_UNIT[rule.unit]
+            first_step = -(-(first_day - start) // step_days)
+        else:
+            start_date, window_start = date.fromordinal(start), date.fromordinal(first_day)
+            months = (window_start.year - start_date.year) * 12 + window_start.month - start_date.month
+            # the earlier steps fall into earlier months, this one may still be a few days early
+            first_step = months // rule.interval
+
+    for step in count(first_step):
+        if rule.unit in DAYS_PER_UNIT:
+            due_date = start + step * rule.interval * DAYS_PER_UNIT[rule.unit]
+        else:
+            due_date = _add_months(date.fromordinal(start), step * rule.interval).toordinal()
+        if first_day is None or due_date >= first_day:
+            yield due_date
+
+
+def occurrences_between(rule, start, first_day, last_day):
+    """Yields the due dates of a repeating task from the first to the last day, both included
+
+    Parameters
+    ----------
+    rule: Recurrence
+    start: int
+        ordinal of the first due date
+    first_day: int
+    last_day: int
+    """
+
+    for due_date in occurrences(rule, start, first_day):
+        if due_date > last_day:
+            return
+        yield due_date
+
+
+def next_occurrence(rule, due_date, today):
+    """Returns the due date of the instance that follows a completed one
+
+    It is the first occurrence after the completed due date that is not in the past,
+    so the occurrences missed while the task was overdue are skipped.
+
+    Parameters
+    ----------
+    rule: Recurrence
+    due_date: int
+        ordinal of the due date of the completed instance or None, then the task repeats from today
+    today: int
+        ordinal of the current day
+    """
+
+    start = today if due_date is None else due_date
+    return next(occurrences(rule, start, max(start + 1, today)))
+
+
+def upcoming_dates(rule, start, today, limit=3):
+    """Returns the next due dates of a repeating task from today on, for a preview in the ui
+
+    Parameters
+    ----------
+    rule: Recurrence
+    start: int
+        ordinal of the current due date or None, then the task repeats from today
+    today: int
+    limit: int
+        number of dates
+    """
+
+    start = today if start is None else start
+    return list(islice(occurrences(rule, start, today), limit))
+
+
+def describe_occurrences(recurrence, due_date, today, limit=3):
+    """Returns the rule of a repeating task and its next due dates for the ui, e.g. "Weekly, next: Oct/19, Oct/26"
+
+    Parameters
+    ----------
+    recurrence: str
+        the rule stored in db
+    due_date: int
+        ordinal of the current due date or None
+    today: int
+    limit: int
+        number of dates
+
+    Raises
+    ------
+    ValueError
+        if the rule is not valid or its dates run out of the supported years
+    """
+
+    rule = parse_recurrence(recurrence)
+    dates = [date.fromordinal(day).strftime(SHORT_DATE_FORMAT) for day in upcoming_dates(rule, due_date, today, limit)]
+    return f"{describe_recurrence(rule)}, next: {', '.join(dates)}"
@@ -0,0 +1,390 @@
+"""This module contains the opt-in instrumentation of the db layer.
+
+A SqlTracer collects three kinds of metrics:
+    methods: every public Model method, with its calls, errors, returned rows and latency
+    statements: every statement the model runs through a cursor, with its calls, rows and latency.
+        The latency is the time of execute(), the time spent fetching the rows is summed up separately.
+    sqlite_trace: every statement sqlite itself runs, reported by the sqlite3 trace callback. It also
+        counts the statements that no cursor runs: transaction control and the statements sqlite runs
+        inside triggers and the search index, which start with "--".
+        Literals are replaced with "?", so the same statement with other values is counted once.
+
+Nothing is traced unless a SqlTracer is passed to the Model, so the app runs at full speed without it.
+"""
+
+import bisect
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+import types
+
+from model.db_pool import get_db_connection
+
+# upper bounds of the latency histogram buckets in milliseconds, the last bucket has no bound
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+# string and number literals of the traced statements
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# the number of distinct statements reported by the trace callback is capped, the rest are counted together
+MAX_TRACED_STATEMENTS = 500
+OTHER_STATEMENTS = "(other statements)"
+# methods that don't run queries themselves
+UNTRACED_METHODS = ("transaction", "clean")
+
+
+def _msecs_since(start):
+    """Returns the milliseconds since a time.perf_counter() value"""
+
+    return (time.perf_counter() - start) * 1000
+
+
+def count_rows(result):
+    """Returns the number of rows in a result of a Model method: the length of a list, 0 for None, else 1"""
+
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+def fingerprint(sql):
+    """Returns a statement with its literals replaced by "?" and its whitespace collapsed"""
+
+    return " ".join(LITERALS.sub("?", sql).split())
+
+
+class LatencyStats:
+    """
+    A class used to sum up the calls of one method or statement.
+
+    Methods
+    -------
+    record(self, elapsed_ms, rows, error)
+    add_fetch(self, elapsed_ms, rows)
+    to_dict(self)
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.fetch_ms = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def record(self, elapsed_ms, rows=0, error=False):
+        """Adds one call
+
+        Parameters
+        ----------
+        elapsed_ms: float
+        rows: int
+            rows returned or changed by the call
+        error: bool
+            True if the call raised an exception
+        """
+
+        self.calls += 1
+        self.errors += int(error)
+        self.rows += rows
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, elapsed_ms)] += 1
+
+    def add_fetch(self, elapsed_ms, rows):
+        """Adds rows fetched after the call, they don't change the latency of the call"""
+
+        self.rows += rows
+        self.fetch_ms += elapsed_ms
+
+    def to_dict(self):
+        """Returns the stats as a dict that can be written as json"""
+
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "fetch_ms": round(self.fetch_ms, 3),
+            "histogram": {label: count for label, count in zip(labels, self.histogram) if count},
+        }
+
+
+class TracingCursor(sqlite3.Cursor):
+    """A cursor that reports its statement, the latency of execute() and the fetched rows to the tracer"""
+
+    # the statement of the last execute(), the fetched rows are added to it
+    _traced_sql = None
+
+    def _record(self, sql, start):
+        """Reports a finished execute() of a statement"""
+
+        self._traced_sql = sql
+        # rowcount is the number of changed rows for a change and -1 for a select
+        self.connection.tracer.record_statement(sql, _msecs_since(start), max(self.rowcount, 0))
+
+    def _fetched(self, rows, start):
+        """Reports rows fetched for the last executed statement"""
+
+        if self._traced_sql is not None:
+            self.connection.tracer.record_fetch(self._traced_sql, _msecs_since(start), rows)
+
+    def execute(self, sql, parameters=()):
+        """Runs a statement and records its latency"""
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except sqlite3.Error:
+            self.connection.tracer.record_statement(sql, _msecs_since(start), error=True)
+            raise
+        self._record(sql, start)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        """Runs a statement for every set of parameters and records the latency of all of them"""
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except sqlite3.Error:
+            self.connection.tracer.record_statement(sql, _msecs_since(start), error=True)
+            raise
+        self._record(sql, start)
+        return self
+
+    def fetchone(self):
+        """Fetches the next row and counts it"""
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(int(row is not None), start)
+        return row
+
+    def fetchmany(self, size=None):
+        """Fetches the next rows and counts them"""
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(len(rows), start)
+        return rows
+
+    def fetchall(self):
+        """Fetches the remaining rows and counts them"""
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(len(rows), start)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        self._fetched(1, start)
+        return row
+
+
+class TracingConnection(sqlite3.Connection):
+    """A connection whose cursors, including the ones of execute(), are instances of TracingCursor"""
+
+    tracer = None
+
+    def cursor(self, factory=None):  # pylint: disable=arguments-differ
+        """Returns a new cursor, a TracingCursor by default"""
+        if factory is None:
+            # the pragmas of get_db_connection() run before the tracer is set
+            factory = sqlite3.Cursor if self.tracer is None else TracingCursor
+        return super().cursor(factory)
+
+    # the shortcuts of sqlite3.Connection don't create their cursors with cursor()
+    def execute(self, sql, parameters=()):  # pylint: disable=arguments-differ
+        """Runs a statement with a new cursor and returns the cursor"""
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):  # pylint: disable=arguments-differ
+        """Runs a statement for every set of parameters with a new cursor and returns the cursor"""
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class SqlTracer:
+    """
+    A class used to collect the latency metrics of the Model methods and of the sql statements.
+    It is shared by all threads that use the model.
+
+    Attributes
+    ----------
+    path: str
+        json file that dump() writes to by default
+
+    Methods
+    -------
+    attach(self, pool)
+    connect(self, db_path, synchronous, journal_mode)
+    instrument(self, model)
+    record_statement(self, sql, elapsed_ms, rows, error)
+    record_fetch(self, sql, elapsed_ms, rows)
+    record_method(self, name, elapsed_ms, rows, error)
+    to_dict(self)
+    dump(self, path)
+    reset(self)
+    """
+
+    def __init__(self, path="sql_trace.json"):
+        """
+        Parameters
+        ----------
+        path: str
+            json file that dump() writes to by default
+        """
+
+        self.path = path
+        self._lock = threading.Lock()
+        self.methods = {}
+        self.statements = {}
+        self.sqlite_trace = {}
+        self.started_at = time.time()
+
+    def attach(self, pool):
+        """Makes a ConnectionPool open its connections with connect()
+
+        Parameters
+        ----------
+        pool: object
+            instance of class ConnectionPool, before it opened any connection
+        """
+
+        pool.tracer = self
+
+    def connect(self, db_path, synchronous, journal_mode):
+        """Opens a connection whose statements are traced, see get_db_connection() for the parameters"""
+
+        connection = get_db_connection(db_path, synchronous, journal_mode, factory=TracingConnection)
+        connection.tracer = self
+        connection.set_trace_callback(self._on_trace)
+        return connection
+
+    def instrument(self, model):
+        """Wraps every public method of a model instance to record its calls
+
+        Parameters
+        ----------
+        model: object
+            instance of class Model
+        """
+
+        model_class = type(model)
+        for name, _function in inspect.getmembers(model_class, inspect.isfunction):
+            if not name.startswith("_") and name not in UNTRACED_METHODS:
+                setattr(model, name, self._wrap(f"{model_class.__name__}.{name}", getattr(model, name)))
+
+    def _wrap(self, name, method):
+        """Returns a function that calls the method and records the call"""
+
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                self.record_method(name, _msecs_since(start), error=True)
+                raise
+
+            if isinstance(result, types.GeneratorType):
+                return self._trace_generator(name, result, start)
+            self.record_method(name, _msecs_since(start), count_rows(result))
+            return result
+
+        return traced
+
+    def _trace_generator(self, name, generator, start):
+        """Yields the items of a generator returned by a method and records the call once it is consumed"""
+
+        rows = 0
+        try:
+            for item in generator:
+                rows += 1
+                yield item
+        finally:
+            self.record_method(name, _msecs_since(start), rows)
+
+    @staticmethod
+    def _stats(table, key):
+        """Returns the stats of a key, adding them on the first use"""
+
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = LatencyStats()
+        return stats
+
+    def record_statement(self, sql, elapsed_ms, rows=0, error=False):
+        """Adds one execution of a statement run through a cursor"""
+
+        with self._lock:
+            self._stats(self.statements, sql).record(elapsed_ms, rows, error)
+
+    def record_fetch(self, sql, elapsed_ms, rows):
+        """Adds rows fetched for a statement"""
+
+        with self._lock:
+            self._stats(self.statements, sql).add_fetch(elapsed_ms, rows)
+
+    def record_method(self, name, elapsed_ms, rows=0, error=False):
+        """Adds one call of a Model method"""
+
+        with self._lock:
+            self._stats(self.methods, name).record(elapsed_ms, rows, error)
+
+    def _on_trace(self, sql):
+        """Counts a statement that sqlite runs, it is called by sqlite on the thread of the connection"""
+
+        key = fingerprint(sql)
+        with self._lock:
+            if key not in self.sqlite_trace and len(self.sqlite_trace) >= MAX_TRACED_STATEMENTS:
+                key = OTHER_STATEMENTS
+            self.sqlite_trace[key] = self.sqlite_trace.get(key, 0) + 1
+
+    def to_dict(self):
+        """Returns the collected metrics, the slowest methods and statements first"""
+
+        def by_total_time(table):
+            ordered = sorted(table.items(), key=lambda item: item[1].total_ms + item[1].fetch_ms, reverse=True)
+            return {key: stats.to_dict() for key, stats in ordered}
+
+        with self._lock:
+            return {
+                "seconds": round(time.time() - self.started_at, 3),
+                "methods": by_total_time(self.methods),
+                "statements": by_total_time(self.statements),
+                "sqlite_trace": dict(sorted(self.sqlite_trace.items(), key=lambda item: item[1], reverse=True)),
+            }
+
+    def dump(self, path=None):
+        """Writes the collected metrics to a json file
+
+        Parameters
+        ----------
+        path: str
+            the json file, self.path by default
+
+        Returns
+        -------
+        str
+            path of the written file
+        """
+
+        path = path or self.path
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+        return path
+
+    def reset(self):
+        """Drops the collected metrics"""
+
+        with self._lock:
+            self.methods = {}
+            self.statements = {}
+            self.sqlite_trace = {}
+            self.started_at = time.time()
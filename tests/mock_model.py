@@ -1,11 +1,14 @@
 """This module mocks the functionality related to the db queries and task data."""
 
 import logging
-import datetime
-from model.main_model import Task
+from contextlib import contextmanager
 
+from model.dates import now_timestamp
+from model.main_model import PAGE_SIZE, Task, page_key
+from model.recurrence import next_occurrence, parse_recurrence
 
-class MockModel:
+
+class MockModel:  # pylint: disable=too-many-public-methods
     """
     A class that used for test environment to mock getting/sending data to db.
 
@@ -23,6 +26,7 @@ class MockModel:
 
     def __init__(self, data):
         self.data = data
+        self.tags = ["work", "home", "miscellaneous"]
 
     @staticmethod
     def clean():
@@ -36,15 +40,39 @@ class MockModel:
         if self.data:
             self.clean()
 
-    def get_all_tasks(self):
-        """Gets the list of all tasks from db"""
+    @staticmethod
+    @contextmanager
+    def transaction():
+        """There is no db, the changes are applied at once"""
+
+        yield
+
+    @staticmethod
+    def _task(data):
+        """Returns the Task of a task dict, the fields that the dict doesn't have are None"""
+
+        return Task(data["row_id"], *(data.get(field) for field in Task._fields[1:]))
+
+    def iter_all_tasks(self):
+        """Yields all tasks from db"""
 
-        tasks = []
         for data in self.data:
-            task = Task(*data)
-            tasks.append(task)
+            yield self._task(data)
 
-        return tasks
+    def iter_completed_tasks(self):
+        """Yields COMPLETED tasks from db"""
+
+        return iter(self.get_completed_tasks())
+
+    def iter_incomplete_tasks(self):
+        """Yields incomplete tasks from db"""
+
+        return iter(self.get_incomplete_tasks())
+
+    def get_all_tasks(self):
+        """Gets the list of all tasks from db"""
+
+        return list(self.iter_all_tasks())
 
     def create_task(self, task_name):
         """Insert a new task into db
@@ -60,22 +88,23 @@ class MockModel:
             {
                 "row_id": last_row + 1,
                 "name": task_name,
-                "due_date": "04/30/22",
+                "due_date": None,
                 "completed": 0,
                 "notes": None,
                 'removed': 0,
-                'time_added': datetime.datetime.today().strftime("%m/%d/%y %H/%M/%S")
+                'time_added': now_timestamp(),
+                'tag': 1,
             }
         )
 
+        return self._task(self.data[-1])
+
     def get_last_added_task(self):
         """Gets last added task from db"""
-        task = self.data[-1].values()
-
-        return Task(*task)
+        return self._task(self.data[-1])
 
 
-    def get_task_info(self, task_info):
+    def get_task_info(self, task_id):
         """Get a task info from db for edit window launch
 
          Parameters
@@ -83,34 +112,48 @@ class MockModel:
         task_id - int
             id of a task that equals rowid in db
         """
-        task_id, _ = task_info
 
-        for _, task in enumerate(self.data):
+        for task in self.data:
             if task["row_id"] == task_id:
-                return Task(*(task.values()))
+                return self._task(task)
 
-        return True
+        return None
 
-    def update_task_info(self, updated_data):
-        """Updates a task info in db
+    def _update_task(self, task_id, changes):
+        """Updates the given fields of the task with task_id
 
         Parameters
         ----------
         task_id - int
-        new_name - str
-        due_date - str
-        notes - str
+        changes - dict
         """
-        task_id, new_name, due_date, notes, removed = updated_data.values()
-        for _, task in enumerate(self.data):
+
+        for task in self.data:
             if task["row_id"] == task_id:
-                task["name"] = new_name
-                task["due_date"] = due_date
-                task["notes"] = notes
-                task['removed'] = removed
-                # return True
+                task.update(changes)
+                return {'task_id': task_id, **changes}
+
+        return None
+
+    def _update_tasks(self, task_ids, changes):
+        """Updates the given fields of every task with an id from task_ids"""
+
+        updated = (self._update_task(task_id, changes) for task_id in dict.fromkeys(task_ids))
+        return [changes for changes in updated if changes is not None]
 
-    def delete_task(self, task_to_delete):
+    def update_task_info(self, updated_data):
+        """Updates a task info in db
+
+        Parameters
+        ----------
+        updated_data - dict
+            task_id, name, due_date, notes
+        """
+
+        changes = {key: value for key, value in updated_data.items() if key != 'task_id'}
+        return self._update_task(updated_data['task_id'], changes)
+
+    def delete_task(self, task_id):
         """Removes a task from db
 
         Parameters
@@ -118,30 +161,202 @@ class MockModel:
         task_id - int
         """
 
-        for idx, task in enumerate(self.data):
-            if task["row_id"] == task_to_delete['task_id']:
-                self.data.pop(idx)
+        return self._update_task(task_id, {'removed': 1, 'removed_at': now_timestamp()})
+
+    def restore_task(self, task_id):
+        """Moves a task from the trash back to its list
+
+        Parameters
+        ----------
+        task_id - int
+        """
+
+        return self._update_task(task_id, {'removed': 0, 'removed_at': None})
+
+    def delete_tasks(self, task_ids):
+        """Moves the tasks to the trash"""
+
+        return self._update_tasks(task_ids, {'removed': 1, 'removed_at': now_timestamp()})
+
+    def restore_tasks(self, task_ids):
+        """Moves the tasks from the trash back to their lists"""
+
+        return self._update_tasks(task_ids, {'removed': 0, 'removed_at': None})
+
+    def purge_removed_tasks(self, removed_before=None):
+        """Deletes the tasks removed before the given time"""
+
+        kept = [
+            task for task in self.data
+            if task["removed"] == 0 or (removed_before is not None and task.get("removed_at", 0) >= removed_before)
+        ]
+        purged = len(self.data) - len(kept)
+        self.data[:] = kept
+        return purged
+
+    def purge_task(self, task_id):
+        """Deletes one task from the trash"""
+
+        kept = [task for task in self.data if task["row_id"] != task_id or task["removed"] == 0]
+        purged = len(self.data) - len(kept)
+        self.data[:] = kept
+        return purged
+
+    def purge_tasks(self, task_ids):
+        """Deletes the tasks from the trash"""
+
+        return sum(self.purge_task(task_id) for task_id in set(task_ids))
 
-    def complete_task(self, task_to_complete):
+    @staticmethod
+    def vacuum_step(pages=128):  # pylint: disable=unused-argument
+        """There is no file to compact, no free pages are left"""
+
+        return 0
+
+    def complete_task(self, task_id):
         """Complete task
 
         Parameters
         ----------
         task_id: int
-        task_name: str
+        """
+
+        return self._update_task(task_id, {'completed': 1})
+
+    def complete_tasks(self, task_ids):
+        """Completes the tasks"""
 
+        return self._update_tasks(task_ids, {'completed': 1})
+
+    def get_task_counters(self, today):
+        """Counts not removed tasks
+
+        Parameters
+        ----------
+        today: int
+            ordinal of the current day
         """
 
-        for _, task in enumerate(self.data):
-            if task["row_id"] == task_to_complete['task_id']:
-                task["completed"] = 1
+        active_tasks = [task for task in self.data if task["removed"] == 0]
+        overdue = [task for task in active_tasks if self._is_overdue(task, today)]
+        completed = [task for task in active_tasks if task["completed"] == 1]
+
+        return len(active_tasks), len(overdue), len(completed)
+
+    @staticmethod
+    def _is_overdue(task, today):
+        """Returns True if the task is incomplete and its due date is before today"""
+
+        return task["completed"] == 0 and task["due_date"] is not None and task["due_date"] < today
+
+    def get_overdue_count(self, today):
+        """Counts incomplete not removed tasks whose due date has passed"""
+
+        return sum(1 for task in self.data if task["removed"] == 0 and self._is_overdue(task, today))
+
+    def create_next_occurrences(self, task_ids, today):
+        """Creates the next instance of every incomplete repeating task among the tasks"""
+
+        created = []
+        for data in [data for data in self.data if data["row_id"] in set(task_ids)]:
+            if data["completed"] == 0 and data["removed"] == 0 and data.get("recurrence") is not None:
+                task = self.create_task(data["name"])
+                changes = {
+                    "due_date": next_occurrence(parse_recurrence(data["recurrence"]), data["due_date"], today),
+                    "notes": data["notes"],
+                    "tag": data["tag"],
+                    "recurrence": data["recurrence"],
+                }
+                self._update_task(task.task_id, changes)
+                created.append(task._replace(**changes))
+        return created
 
     def get_completed_tasks(self):
         """Gets the list of all COMPLETED tasks from db"""
         tasks = []
 
-        for idx, task in enumerate(self.data):
-            if task["completed"] == 1:
-                tasks.append(self.data[idx])
+        for task in self.data:
+            if task["completed"] == 1 and task["removed"] == 0:
+                tasks.append(self._task(task))
+
+        return tasks
+
+    def get_incomplete_tasks(self):
+        """Gets the list of incomplete tasks from db"""
+        tasks = []
+
+        for task in self.data:
+            if task["completed"] == 0 and task["removed"] == 0:
+                tasks.append(self._task(task))
+
+        return tasks
+
+    def get_tasks_page(self, list_name, after=None, limit=PAGE_SIZE, params=()):
+        """Gets the page of a task list that follows the given task"""
+
+        if list_name == "completed":
+            tasks = self.get_completed_tasks()
+        elif list_name == "trash":
+            tasks = [self._task(task) for task in self.data if task["removed"] == 1]
+        else:
+            tasks = self.get_incomplete_tasks()
+
+        if list_name == "overdue":
+            tasks = [task for task in tasks if task.due_date is not None and task.due_date < params[0]]
+        elif list_name == "due":
+            tasks = [task for task in tasks if task.due_date is not None and params[0] <= task.due_date <= params[1]]
+        tasks.sort(key=lambda task: page_key(list_name, task))
+
+        if after is not None:
+            tasks = [task for task in tasks if page_key(list_name, task) > page_key(list_name, after)]
+
+        return tasks[:limit]
+
+    def get_reminder_tasks(self, first_day, last_day):
+        """Gets incomplete not removed tasks due from the first to the last day"""
+
+        tasks = [
+            task for task in self.get_incomplete_tasks()
+            if task.due_date is not None and first_day <= task.due_date <= last_day
+        ]
+        return sorted(tasks, key=lambda task: (task.due_date, task.task_id))
+
+    def search_tasks(self, text):
+        """Gets not removed tasks whose name or notes contain every word of the text"""
+
+        words = text.lower().split()
+        tasks = []
+
+        for task in self.data:
+            content = f'{task["name"]} {task["notes"]}'.lower()
+            if task["removed"] == 0 and all(word in content for word in words):
+                tasks.append(self._task(task))
 
         return tasks
+
+    def get_all_tags(self):
+        """Gets the list of tags from db"""
+
+        return list(self.tags)
+
+    def create_tag(self, tag_name):
+        """Adds a new tag"""
+
+        self.tags.append(tag_name)
+        return len(self.tags)
+
+    def update_tag(self, task_id, tag_id):
+        """Update the tag for the current task
+
+        Parameters
+        ----------
+        task_id: int
+        tag_id: int
+        """
+
+        return self._update_task(task_id, {'tag': tag_id})
+
+    def retag_tasks(self, task_ids, tag_id):
+        """Sets the tag on the tasks"""
+
+        return self._update_tasks(task_ids, {'tag': tag_id})
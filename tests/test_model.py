@@ -0,0 +1,659 @@
+"""This module contains tests for the db layer"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from model.dates import due_range, format_due_date, parse_due_date
+from model.db_pool import ConnectionPool
+from model.importer import import_tasks
+from model.main_model import REMINDER_TASKS_QUERY, Model, Task, archive_path, build_page_query
+from model.migrations import LATEST_ARCHIVE_VERSION, LATEST_VERSION, get_schema_version
+from model.recurrence import Recurrence, next_occurrence, occurrences_between, parse_recurrence
+from model.tracing import SqlTracer
+
+LEGACY_SCHEMA = """
+CREATE TABLE "tags" ("id" INTEGER, "tag_name" TEXT, PRIMARY KEY("id"), FOREIGN KEY("id") REFERENCES "tags"("id"));
+CREATE TABLE "tasks" ("name" TEXT, "due_date" TEXT, "completed" INTEGER, "notes" TEXT, "removed" INTEGER,
+                      "time_added" INTEGER, "tag" INTEGER, FOREIGN KEY("tag") REFERENCES "tags"("id"));
+INSERT INTO tags VALUES (1, 'work'), (2, 'home'), (3, 'miscellaneous');
+INSERT INTO tasks VALUES ('finish the book', '03/30/2022', 1, 'a note', 0, '04/26/22 14/00/25', 2);
+INSERT INTO tasks VALUES ('pick up parcel', 'never', 0, NULL, 0, '04/26/22 14/00/51', 1);
+"""
+
+
+def test_migrate_new_db(tmp_path):
+    """This test checks that an empty db gets the full schema
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    model = Model(str(tmp_path / "new.db"))
+
+    assert get_schema_version(model.app_db) == LATEST_VERSION
+    assert model.get_all_tags() == ["work", "home", "miscellaneous"]
+    assert not model.get_all_tasks()
+    model.clean()
+
+
+def test_migrate_legacy_db(tmp_path):
+    """This test checks that a db created before migrations is upgraded in place and keeps its data
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    db_path = str(tmp_path / "legacy.db")
+    connection = sqlite3.connect(db_path)
+    connection.executescript(LEGACY_SCHEMA)
+    connection.execute(
+        "INSERT INTO tasks VALUES ('edited', 'Today: Dec/31', 0, NULL, 0, '01/02/23 10/00/00', 1), "
+        "('broken', 'someday', 0, NULL, 0, 'yesterday', 1)"
+    )
+    connection.commit()
+    connection.close()
+
+    model = Model(db_path)
+
+    assert get_schema_version(model.app_db) == LATEST_VERSION
+    tasks = model.get_all_tasks()
+    assert [task.name for task in tasks] == ["finish the book", "pick up parcel", "edited", "broken"]
+    due_dates = [date(2022, 3, 30).toordinal(), None, date(2022, 12, 31).toordinal(), None]
+    assert [task.due_date for task in tasks] == due_dates
+    assert tasks[0].time_added == int(datetime(2022, 4, 26, 14, 0, 25).timestamp())
+    assert [task.name for task in model.iter_completed_tasks()] == ["finish the book"]
+    # time_added sorts by the real time now, not by the text, an unknown time goes first
+    assert [task.name for task in model.iter_incomplete_tasks()] == ["broken", "pick up parcel", "edited"]
+    assert [task.name for task in model.search_tasks("book")] == ["finish the book"]
+    model.clean()
+
+    # opening the db again does not run the migrations twice
+    model = Model(db_path)
+    assert get_schema_version(model.app_db) == LATEST_VERSION
+    model.clean()
+
+
+def test_task_list_queries_use_indexes(tmp_path):
+    """This test checks that the task list filters are served by the partial indexes
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    model = Model(str(tmp_path / "plan.db"))
+    queries = {
+        "idx_tasks_completed_time_added":
+            "SELECT rowid, * FROM tasks WHERE completed = 1 AND removed = 0 ORDER BY time_added ASC",
+        "idx_tasks_incomplete_time_added":
+            "SELECT rowid, * FROM tasks WHERE completed = 0 AND removed = 0 ORDER BY time_added ASC",
+    }
+
+    for index_name, query in queries.items():
+        plan = " ".join(row[-1] for row in model.app_db.execute(f"EXPLAIN QUERY PLAN {query}"))
+        assert index_name in plan
+    model.clean()
+
+
+def test_mutations_return_changes(tmp_path):
+    """This test checks that the mutating methods return the inserted row or the changed fields
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    model = Model(str(tmp_path / "changes.db"))
+
+    task = model.create_task("buy milk")
+    assert task == model.get_all_tasks()[0]
+
+    assert model.complete_task(task.task_id) == {'task_id': task.task_id, 'completed': 1}
+    assert model.update_tag(task.task_id, 2) == {'task_id': task.task_id, 'tag': 2}
+    removed = model.delete_task(task.task_id)
+    assert removed == {'task_id': task.task_id, 'removed': 1, 'removed_at': removed['removed_at']}
+    assert removed['removed_at'] >= task.time_added
+    assert model.complete_task(task.task_id + 1) is None
+
+    stored = model.get_all_tasks()[0]
+    assert (stored.completed, stored.tag, stored.removed) == (1, 2, 1)
+    model.clean()
+
+
+def test_task_counters(tmp_path):
+    """This test checks that the task overview numbers are counted by the db
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    db_path = str(tmp_path / "counters.db")
+    connection = sqlite3.connect(db_path)
+    connection.executescript(LEGACY_SCHEMA)
+    connection.execute(
+        "INSERT INTO tasks VALUES ('old', '2020/01/01', 0, NULL, 0, '04/26/22 14/00/55', 1), "
+        "('removed', '2020/01/01', 1, NULL, 1, '04/26/22 14/00/56', 1)"
+    )
+    connection.commit()
+    connection.close()
+
+    model = Model(db_path)
+
+    # the completed task is not overdue any more
+    assert model.get_task_counters(date(2022, 5, 1).toordinal()) == (3, 1, 1)
+    assert model.get_overdue_count(date(2022, 5, 1).toordinal()) == 1
+    model.clean()
+
+
+def test_transaction_groups_commits(tmp_path):
+    """This test checks that changes inside a transaction are committed once or rolled back together
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    db_path = str(tmp_path / "transaction.db")
+    model = Model(db_path, synchronous="full")
+    reader = sqlite3.connect(db_path)
+
+    with model.transaction():
+        model.create_task("first")
+        model.create_task("second")
+        # nothing is visible for other connections until the outermost block ends
+        assert reader.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 0
+    assert reader.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 2
+
+    try:
+        with model.transaction():
+            model.create_task("third")
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert [task.name for task in model.get_all_tasks()] == ["first", "second"]
+    assert model.app_db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    reader.close()
+    model.clean()
+
+
+def test_import_tasks(tmp_path):
+    """This test checks that CSV and JSON Lines files are imported and invalid rows are skipped
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db and the imported files
+    """
+
+    csv_path = tmp_path / "tasks.csv"
+    # Excel writes a byte order mark before the header
+    csv_path.write_text(
+        "\ufeffname,due_date,completed,tag\nwash the car,,0,2\n,never,0,1\nread,05/01/2022,yes,\nno such tag,,0,9\n",
+        encoding="utf-8",
+    )
+    jsonl_path = tmp_path / "tasks.jsonl"
+    jsonl_path.write_text('{"name": "call mom", "notes": "sunday"}\n\nnot json\n{"name": "pay rent", "tag": "x"}\n')
+
+    model = Model(str(tmp_path / "import.db"))
+
+    assert import_tasks(model, str(csv_path), batch_size=1) == (2, [2, 4])
+    assert import_tasks(model, str(jsonl_path)) == (1, [2, 3])
+
+    tasks = model.get_all_tasks()
+    assert [(task.name, task.completed, task.tag) for task in tasks] == [
+        ("wash the car", 0, 2), ("read", 1, 1), ("call mom", 0, 1)
+    ]
+    assert tasks[2].notes == "sunday"
+    assert [task.due_date for task in tasks] == [None, date(2022, 5, 1).toordinal(), None]
+    assert model.get_last_task_id() == tasks[2].task_id
+    model.clean()
+
+
+def test_task_iterators(tmp_path):
+    """This test checks that the task iterators stream Task rows in batches
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    model = Model(str(tmp_path / "iterators.db"))
+    rows = ((f"task {idx}", None, idx % 2, "NULL", 0, 1650981600 + idx, 1) for idx in range(600))
+    model.create_tasks_bulk(rows)
+
+    all_tasks = model.iter_all_tasks()
+    first = next(all_tasks)
+    assert isinstance(first, Task) and first.name == "task 0"
+
+    # a second iterator can run while the first one is not finished
+    assert sum(1 for _ in model.iter_completed_tasks()) == 300
+    assert len(list(all_tasks)) == 599
+    assert [task.name for task in model.iter_incomplete_tasks()][:2] == ["task 0", "task 2"]
+    assert model.get_task_info(2) == Task(2, "task 1", None, 1, "NULL", 0, 1650981601, 1)
+    model.clean()
+
+
+def test_connection_pool(tmp_path):
+    """This test checks that the writer belongs to one thread and that readers are read-only and limited
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    pool = ConnectionPool(str(tmp_path / "pool.db"), max_readers=1)
+    model = Model(pool=pool)
+    task = model.create_task("written on the main thread")
+    results = {}
+
+    def read_on_other_thread():
+        with pytest.raises(RuntimeError):
+            pool.writer()
+        results["tasks"] = [task.name for task in model.get_all_tasks()]
+        with pytest.raises(sqlite3.OperationalError):
+            pool.connection().execute("DELETE FROM tasks")
+        results["health"] = pool.health_check()
+        model.clean()
+
+    thread = threading.Thread(target=read_on_other_thread)
+    thread.start()
+    thread.join()
+
+    assert results["tasks"] == [task.name]
+    assert results["health"] == {"writer": None, "reader": True, "readers": 1}
+    assert pool.health_check() == {"writer": True, "reader": None, "readers": 0}
+
+    # the only reader slot is taken by the main thread, another thread gets none
+    pool.reader()
+    errors = []
+    other = threading.Thread(target=lambda: errors.append(pytest.raises(RuntimeError, pool.reader)))
+    other.start()
+    other.join()
+    assert len(errors) == 1
+
+    model.clean()
+
+
+def test_search_tasks(tmp_path):
+    """This test checks that the search index follows the task changes and ranks name matches first
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    model = Model(str(tmp_path / "search.db"))
+    milk = model.create_task("buy milk")
+    bread = model.create_task("bread")
+    model.update_task_info({'task_id': bread.task_id, 'name': "bread", 'due_date': None, 'notes': "and milk"})
+    model.create_task('weird "quotes" OR (syntax*')
+
+    assert [task.task_id for task in model.search_tasks("mil")] == [milk.task_id, bread.task_id]
+    assert [task.name for task in model.search_tasks('"quotes" OR (')] == ['weird "quotes" OR (syntax*']
+    assert not model.search_tasks("null")
+    assert not model.search_tasks("  ")
+
+    model.update_task_info({'task_id': milk.task_id, 'name': "buy oat drink", 'due_date': None, 'notes': "NULL"})
+    model.delete_task(bread.task_id)
+    assert not model.search_tasks("milk")
+    assert [task.task_id for task in model.search_tasks("oat")] == [milk.task_id]
+    model.clean()
+
+
+def test_tasks_pages(tmp_path):
+    """This test checks that keyset pages follow each other without gaps and are read from the indexes
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    model = Model(str(tmp_path / "pages.db"))
+    # pairs of tasks share time_added, so the pages must continue by rowid inside a pair
+    rows = ((f"task {idx}", None, idx % 3 == 0, "NULL", 0, 1650981600 + idx // 2, 1) for idx in range(50))
+    model.create_tasks_bulk(rows)
+
+    pages = [model.get_tasks_page("incomplete", limit=7)]
+    while len(pages[-1]) == 7:
+        pages.append(model.get_tasks_page("incomplete", pages[-1][-1], limit=7))
+
+    loaded = [task.name for page in pages for task in page]
+    assert loaded == [task.name for task in model.iter_incomplete_tasks()]
+    assert len(loaded) == 33
+
+    for list_name, index_name in (("incomplete", "idx_tasks_incomplete_time_added"),
+                                  ("completed", "idx_tasks_completed_time_added")):
+        plan = model.app_db.execute(f"EXPLAIN QUERY PLAN {build_page_query(list_name, False)}", ("", 0, 1))
+        assert index_name in " ".join(row[-1] for row in plan)
+    model.clean()
+
+
+def test_due_dates(tmp_path):
+    """This test checks that due dates are parsed at the ui boundary and the due lists are read from the index
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    today = date(2022, 10, 19)
+    assert parse_due_date("Today: Oct/19", today) == today.toordinal()
+    assert parse_due_date("Jan/02", today) == date(2023, 1, 2).toordinal()
+    assert parse_due_date("2022-10-24") == parse_due_date("10/24/2022") == date(2022, 10, 24).toordinal()
+    assert parse_due_date("No due date") is None and parse_due_date("never") is None
+    with pytest.raises(ValueError):
+        parse_due_date("someday")
+    assert format_due_date(date(2022, 10, 24).toordinal()) == "2022-10-24"
+
+    model = Model(str(tmp_path / "due.db"))
+    for offset in (-3, 0, 1, 4, 9):
+        task = model.create_task(f"due in {offset}")
+        model.update_task_info({'task_id': task.task_id, 'name': task.name, 'due_date': today.toordinal() + offset,
+                                'notes': "NULL"})
+    model.create_task("no due date")
+
+    week = due_range("week", today.toordinal())
+    assert [task.name for task in model.get_tasks_page("due", params=week)] == ["due in 0", "due in 1", "due in 4"]
+    assert [task.name for task in model.get_tasks_page("overdue", params=(today.toordinal(),))] == ["due in -3"]
+
+    first_page = model.get_tasks_page("due", limit=1, params=week)
+    assert [task.name for task in model.get_tasks_page("due", first_page[-1], 1, week)] == ["due in 1"]
+    assert model.get_task_counters(today.toordinal()) == (6, 1, 0)
+
+    assert model.get_overdue_count(today.toordinal() + 2) == 3
+    reminder_tasks = model.get_reminder_tasks(today.toordinal(), today.toordinal() + 4)
+    assert [task.name for task in reminder_tasks] == ["due in 0", "due in 1", "due in 4"]
+
+    plan = model.app_db.execute(f"EXPLAIN QUERY PLAN {build_page_query('due', False)}", (0, 1, 0, 0, 1))
+    assert "idx_tasks_incomplete_due_date" in " ".join(row[-1] for row in plan)
+    plan = model.app_db.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM tasks WHERE completed = 0 AND removed = 0 AND due_date < ?", (0,)
+    )
+    assert "idx_tasks_incomplete_due_date" in " ".join(row[-1] for row in plan)
+    plan = model.app_db.execute(f"EXPLAIN QUERY PLAN {REMINDER_TASKS_QUERY}", (0, 1))
+    assert "idx_tasks_incomplete_due_date" in " ".join(row[-1] for row in plan)
+    model.clean()
+
+
+def test_tag_cache(tmp_path):
+    """This test checks that the tags are read once and read again after a new tag is added,
+    also when the tag is added while the tags are being read
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    db_path = str(tmp_path / "tags.db")
+    model = Model(db_path)
+    assert model.get_all_tags() == ["work", "home", "miscellaneous"]
+
+    # a change made around the model is not seen, the cached tags are used
+    connection = sqlite3.connect(db_path)
+    connection.execute("UPDATE tags SET tag_name = 'job' WHERE id = 1")
+    connection.commit()
+    connection.close()
+    assert model.get_all_tags()[0] == "work"
+
+    assert model.create_tag("errands") == 4
+    assert model.get_all_tags() == ["job", "home", "miscellaneous", "errands"]
+
+    read_connection = model.pool.connection
+
+    class ReadBeforeChange:
+        """A reader connection whose query returns the tags before the writer adds a new one"""
+
+        def execute(self, query):
+            """Reads the tags, then adds a tag on the writer"""
+
+            rows = read_connection().execute(query).fetchall()
+            model.create_tag("groceries")
+            return rows
+
+    model.create_tag("garden")
+    model.pool.connection = ReadBeforeChange
+    # the list read before the change is returned but not cached
+    assert model.get_all_tags()[-1] == "garden"
+    model.pool.connection = read_connection
+    assert model.get_all_tags()[-2:] == ["garden", "groceries"]
+    model.clean()
+
+
+def test_sql_tracing(tmp_path):
+    """This test checks that a tracer records the calls, rows and latency of the methods and statements
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    tracer = SqlTracer(str(tmp_path / "trace.json"))
+    model = Model(str(tmp_path / "traced.db"), tracer=tracer)
+    for idx in range(3):
+        model.create_task(f"task {idx}")
+    assert len(model.get_tasks_page("incomplete")) == 3
+    assert model.get_task_counters(date.today().toordinal()) == (3, 0, 0)
+    assert len(list(model.iter_all_tasks())) == 3
+    with pytest.raises(KeyError):
+        model.get_tasks_page("no such list")
+
+    metrics = tracer.to_dict()
+    methods = metrics["methods"]
+    assert methods["Model.create_task"]["calls"] == 3
+    assert (methods["Model.get_tasks_page"]["calls"], methods["Model.get_tasks_page"]["errors"]) == (2, 1)
+    assert methods["Model.get_tasks_page"]["rows"] == 3
+    assert methods["Model.iter_all_tasks"]["rows"] == 3
+    assert sum(methods["Model.create_task"]["histogram"].values()) == 3
+
+    statements = metrics["statements"]
+    assert statements[build_page_query("incomplete", True)]["rows"] == 3
+    counters = [stats for sql, stats in statements.items() if sql.startswith("SELECT COUNT(*)")]
+    assert counters[0]["calls"] == 1 and counters[0]["rows"] == 1
+    inserts = [stats for sql, stats in statements.items() if sql.startswith("INSERT INTO tasks(")]
+    assert inserts[0]["calls"] == 3 and inserts[0]["rows"] == 3
+    # the trace callback also sees the statements that no cursor runs, e.g. the writes of the search index
+    assert metrics["sqlite_trace"]["COMMIT"] >= 3
+    assert any(sql.startswith("-- INSERT INTO") for sql in metrics["sqlite_trace"])
+
+    with open(tracer.dump(), encoding="utf-8") as fh:
+        assert json.load(fh)["methods"]["Model.create_task"]["calls"] == 3
+    model.clean()
+
+
+def test_trash_purge_and_vacuum(tmp_path):
+    """This test checks that removed tasks are listed, restored, purged into the archive and their pages freed
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    db_path = str(tmp_path / "trash.db")
+    model = Model(db_path)
+    assert model.app_db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    model.create_tasks_bulk((f"task {idx}", None, 0, "a long note " * 50, 0, idx, 1) for idx in range(2000))
+    for task_id in (5, 3, 4):
+        assert model.delete_task(task_id)['removed_at'] is not None
+    # the trash is ordered by the time of the removal, the task removed first is purged first
+    model.app_db.execute("UPDATE tasks SET removed_at = CASE id WHEN 5 THEN 100 WHEN 3 THEN 200 ELSE 300 END")
+    model.app_db.commit()
+    assert [task.task_id for task in model.get_tasks_page("trash")] == [5, 3, 4]
+
+    assert model.restore_task(4) == {'task_id': 4, 'removed': 0, 'removed_at': None}
+    assert model.get_task_counters(date.today().toordinal())[0] == 1998
+    assert model.purge_removed_tasks(removed_before=0) == 0
+    assert model.purge_task(4) == 0 and model.purge_tasks([4]) == 0
+    # the archive is created with the first task that is purged
+    assert not os.path.exists(archive_path(db_path))
+    assert model.purge_task(3) == 1
+    assert [task.task_id for task in model.get_tasks_page("trash")] == [5]
+
+    # everything but the first tasks goes to the trash and is purged
+    model.app_db.execute("UPDATE tasks SET removed = 1, removed_at = 1 WHERE id > 10")
+    model.app_db.commit()
+    assert model.purge_removed_tasks(removed_before=2) == 1990
+    assert model.purge_removed_tasks() == 1
+    assert model.get_task_info(5) is None
+
+    archive = sqlite3.connect(archive_path(db_path))
+    assert archive.execute("SELECT COUNT(*), MIN(id) FROM tasks_archive").fetchone() == (1992, 3)
+    archive.close()
+    assert not model.search_tasks("task 1500")
+
+    free_pages = model.app_db.execute("PRAGMA freelist_count").fetchone()[0]
+    assert free_pages > 128
+    assert model.vacuum_step() == free_pages - 128
+    while model.vacuum_step():
+        pass
+    assert model.app_db.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    model.clean()
+
+
+def test_purge_keeps_recurrence(tmp_path):
+    """This test checks that an archive created before the recurrence column is migrated and keeps the rules
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    db_path = str(tmp_path / "repeat.db")
+    archive = sqlite3.connect(archive_path(db_path))
+    archive.execute(
+        'CREATE TABLE "tasks_archive" ("id" INTEGER PRIMARY KEY, "name" TEXT, "due_date" INTEGER, '
+        '"completed" INTEGER, "notes" TEXT, "time_added" INTEGER, "tag" INTEGER, "removed_at" INTEGER, '
+        '"purged_at" INTEGER)'
+    )
+    archive.execute("INSERT INTO tasks_archive(id, name) VALUES (100, 'purged long ago')")
+    archive.commit()
+    archive.close()
+
+    model = Model(db_path)
+    model.create_tasks_bulk([("water the plants", None, 0, "NULL", 0, 1, 1)])
+    model.app_db.execute("UPDATE tasks SET recurrence = '1 week' WHERE id = 1")
+    model.app_db.commit()
+    model.delete_task(1)
+    assert model.purge_task(1) == 1
+    model.clean()
+
+    archive = sqlite3.connect(archive_path(db_path))
+    assert archive.execute("SELECT id, recurrence FROM tasks_archive ORDER BY id").fetchall() == [
+        (1, "1 week"), (100, None)
+    ]
+    assert get_schema_version(archive) == LATEST_ARCHIVE_VERSION
+    archive.close()
+
+
+def test_bulk_changes(tmp_path):
+    """This test checks that bulk changes run one statement per batch of ids and commit once
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    model = Model(str(tmp_path / "bulk.db"))
+    model.create_tasks_bulk((f"task {idx}", None, 0, "NULL", 0, idx, 1) for idx in range(1200))
+    statements = []
+    model.app_db.set_trace_callback(statements.append)
+
+    # 1201 and 1202 don't exist, 7 is repeated
+    task_ids = list(range(1, 1101)) + [1201, 7, 1202]
+    changes = model.complete_tasks(task_ids)
+    assert [change['task_id'] for change in changes] == list(range(1, 1101))
+    assert changes[0] == {'task_id': 1, 'completed': 1}
+    assert len([sql for sql in statements if sql.startswith("UPDATE tasks")]) == 3
+    assert statements.count("COMMIT") == 1
+    assert model.get_task_counters(date.today().toordinal()) == (1200, 0, 1100)
+
+    assert len(model.retag_tasks(range(1095, 1105), 3)) == 10
+    assert model.get_task_info(1094).tag == 1 and model.get_task_info(1104).tag == 3
+
+    deleted = model.delete_tasks([10, 11, 12])
+    assert [change['task_id'] for change in deleted] == [10, 11, 12]
+    assert all(change['removed'] == 1 and change['removed_at'] for change in deleted)
+    assert len(model.restore_tasks([11])) == 1
+    assert model.purge_tasks([10, 11, 12, 13]) == 2
+    assert model.get_task_info(10) is None and model.get_task_info(11) is not None
+    assert model.get_task_counters(date.today().toordinal())[0] == 1198
+    model.clean()
+
+
+def test_recurring_tasks(tmp_path):
+    """This test checks that only the current instance of a repeating task is stored and the next one
+    is created when it is completed
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    assert parse_recurrence("every 3 days") == parse_recurrence("3 day") == Recurrence(3, "day")
+    assert parse_recurrence("Weekly") == Recurrence(1, "week") and parse_recurrence("Does not repeat") is None
+    for text in ("every 0 days", "every 00 days", "every 99999999 day"):
+        with pytest.raises(ValueError):
+            parse_recurrence(text)
+
+    monthly = Recurrence(1, "month")
+    jan_31 = date(2023, 1, 31).toordinal()
+    window = occurrences_between(monthly, jan_31, date(2023, 2, 1).toordinal(), date(2023, 5, 31).toordinal())
+    assert [date.fromordinal(day) for day in window] == [
+        date(2023, 2, 28), date(2023, 3, 31), date(2023, 4, 30), date(2023, 5, 31)
+    ]
+    # the occurrences missed while the task was overdue are skipped
+    today = date(2023, 3, 10).toordinal()
+    assert next_occurrence(Recurrence(1, "day"), today - 5, today) == today
+    assert next_occurrence(Recurrence(1, "week"), today + 2, today) == today + 9
+
+    model = Model(str(tmp_path / "recurring.db"))
+    task = model.create_task("water the plants")
+    model.create_task("once")
+    changes = model.update_task_info(
+        {'task_id': task.task_id, 'name': task.name, 'due_date': today, 'notes': "the big ones", 'recurrence': "1 week"}
+    )
+    assert changes['recurrence'] == "1 week"
+
+    with model.transaction():
+        next_tasks = model.create_next_occurrences([task.task_id, 2], today)
+        model.complete_tasks([task.task_id, 2])
+    assert len(next_tasks) == 1
+    assert next_tasks[0] == model.get_task_info(next_tasks[0].task_id)
+    assert next_tasks[0].due_date == today + 7 and next_tasks[0].notes == "the big ones"
+    assert next_tasks[0].recurrence == "1 week" and next_tasks[0].completed == 0
+
+    # a completed instance doesn't repeat twice and no future instances are stored
+    assert not model.create_next_occurrences([task.task_id], today)
+    assert len(model.get_all_tasks()) == 3
+
+    # a rule stored before the rules were checked doesn't stop the task from being completed
+    model.update_task_info({'task_id': 2, 'name': "once", 'due_date': today, 'notes': "", 'recurrence': "0 day"})
+    model.app_db.execute("UPDATE tasks SET completed = 0 WHERE rowid = 2")
+    assert not model.create_next_occurrences([2], today)
+    model.clean()
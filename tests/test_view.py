@@ -1,13 +1,24 @@
-"""This module contains tests """
+"""This module contains tests """  # pylint: disable=too-many-lines
 
+import json
+import random
+import threading
 from datetime import date
 
-from qtconsole.qtconsoleapp import QtCore
+from PyQt5 import QtCore
 
 from mock_model import MockModel
+from model.dates import reminder_timestamp
+from model.main_model import PAGE_SIZE, Model, Task
 from views.main_view import MainWindowView
 from views.edit_window import EditWindow
+from views.task_filter_model import SORT_ORDERS, TASK_FILTERS, TaskFilterModel
+from views.task_list_model import OVERDUE_COLOR, TASK_ROLE, TaskListModel
+from controllers.db_worker import DbWorker, SyncDbExecutor
 from controllers.main_controller import MainWindowController
+from controllers.reminders import REMINDER_DAYS, REMINDER_HOUR, ReminderScheduler
+from app import StartupProfiler
+from benchmarks import suite
 
 
 def test_add_new_task(qtbot, name):
@@ -31,8 +42,8 @@ def test_add_new_task(qtbot, name):
     qtbot.keyClicks(window.add_task_qline, "Kate_test_task")
     qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
 
-    assert window.task_list.count() == 1
-    assert window.task_list.item(0).text() == "Kate_test_task"
+    assert window.task_list.model().rowCount() == 1
+    assert window.task_list.model().index(0).data() == "Kate_test_task"
 
 
 def test_delete_task(qtbot, name):
@@ -56,13 +67,13 @@ def test_delete_task(qtbot, name):
     qtbot.keyClicks(window.add_task_qline, "Kate_test_task_2")
     qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
 
-    rect = window.task_list.visualItemRect(window.task_list.item(0))
+    rect = window.task_list.visualRect(window.task_list.model().index(0))
     center = rect.center()
 
     qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
     qtbot.mouseClick(window.DeleteBtn, QtCore.Qt.LeftButton)
 
-    assert window.task_list.count() == 0
+    assert window.task_list.model().rowCount() == 0
 
 
 def test_edit_task(qtbot, name):
@@ -86,7 +97,7 @@ def test_edit_task(qtbot, name):
     qtbot.keyClicks(window.add_task_qline, "Kate_test_task_3")
     qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
 
-    rect = window.task_list.visualItemRect(window.task_list.item(0))
+    rect = window.task_list.visualRect(window.task_list.model().index(0))
     center = rect.center()
 
     qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
@@ -106,9 +117,10 @@ def test_edit_task(qtbot, name):
     assert edit_window.due_date_box.currentText() == current_date.strftime("%b/%d")
 
     qtbot.mouseClick(edit_window.save_changes_btn, QtCore.Qt.LeftButton)
+    assert controller.tasks[1].due_date == current_date.toordinal()
 
     # Check that name was edited on the main screen
-    assert window.task_list.item(0).text() == "Kate_test_task_4"
+    assert window.task_list.model().index(0).data() == "Kate_test_task_4"
 
     # Open edited task one more time and check that note was edited
     qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
@@ -136,13 +148,13 @@ def test_complete_task(qtbot, name):
     qtbot.keyClicks(window.add_task_qline, "Kate_test_task_5")
     qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
 
-    rect = window.task_list.visualItemRect(window.task_list.item(0))
+    rect = window.task_list.visualRect(window.task_list.model().index(0))
     center = rect.center()
 
     qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
     qtbot.mouseClick(window.CompleteCheckbox, QtCore.Qt.LeftButton)
 
-    assert window.task_list.count() == 0
+    assert window.task_list.model().rowCount() == 0
     assert int(window.completed_num.text()) == 1
 
 
@@ -204,7 +216,7 @@ def test_ui_edit_window(qtbot, name):
     qtbot.keyClicks(window.add_task_qline, "Kate_test_task_3")
     qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
 
-    rect = window.task_list.visualItemRect(window.task_list.item(0))
+    rect = window.task_list.visualRect(window.task_list.model().index(0))
     center = rect.center()
 
     qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
@@ -215,3 +227,1025 @@ def test_ui_edit_window(qtbot, name):
     assert edit_window.due_date_lbl.text() == "due"
     assert edit_window.tags_lbl.text() == "tags"
     assert edit_window.note_lbl.text() == "Notes"
+
+
+def test_tag_cache(qtbot, name, monkeypatch):
+    """This test checks that edit windows share the loaded tags and the tags are loaded again only after a change
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    monkeypatch:
+        pytest fixture used to count the tag queries
+    """
+
+    model = MockModel([])
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+    controller.add_task_to_the_list("tagged task")
+
+    loads = []
+    get_all_tags = model.get_all_tags
+    monkeypatch.setattr(model, "get_all_tags", lambda: loads.append(1) or get_all_tags())
+
+    edit_windows = []
+    for _ in range(2):
+        edit_window = EditWindow(controller, name)
+        qtbot.addWidget(edit_window)
+        controller.show_edit_window(name, edit_window, 1)
+        edit_windows.append(edit_window)
+
+    assert not loads
+    assert edit_windows[0].tagBox.model() is edit_windows[1].tagBox.model() is controller.tag_model
+    assert edit_windows[1].tagBox.count() == 3
+    assert edit_windows[1].tagBox.currentText() == "work"
+
+    controller.add_tag("errands")
+    assert len(loads) == 1
+    assert edit_windows[0].tagBox.count() == 4
+
+
+def test_edit_window_reuse(qtbot, name):
+    """This test checks that one edit window is built and reset for every edited task
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    model = MockModel([])
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+    controller.add_task_to_the_list("first")
+    controller.add_task_to_the_list("second")
+
+    edit_windows = []
+    for row in (0, 1, 0):
+        window.task_list.selectionModel().select(window.task_list.model().index(row), QtCore.QItemSelectionModel.Select)
+        qtbot.mouseClick(window.EditBtn, QtCore.Qt.LeftButton)
+        edit_windows.append(window.edit_window)
+        window.task_list.clearSelection()
+
+        assert window.edit_window.edit_task_name_lineEdit.text() == ("first", "second")[row]
+        assert window.edit_window.due_date_box.count() == 5
+        assert window.edit_window.due_date_box.currentText() == "No due date"
+
+    assert edit_windows[0] is edit_windows[1] is edit_windows[2]
+    assert window.edit_window.parent() is window
+
+
+def test_task_list_pages(qtbot, name):
+    """This test checks that the task list shows the first page at once and loads the next pages on demand
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    data = [
+        {
+            "row_id": idx + 1,
+            "name": f"task_{idx}",
+            "due_date": None,
+            "completed": 0,
+            "notes": None,
+            "removed": 0,
+            "time_added": 1651312800,
+            "tag": 1,
+        }
+        for idx in range(10 * PAGE_SIZE)
+    ]
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+
+    with qtbot.waitSignal(window.task_store.rowsInserted):
+        controller.on_start_up()
+
+    list_model = window.task_list.model()
+    assert list_model.rowCount() == PAGE_SIZE
+    assert window.tasks_num.text() == str(10 * PAGE_SIZE)
+
+    # a task added before the last page is loaded stays after the loaded pages and is not added twice
+    controller.add_task_to_the_list("added while scrolling")
+    window.task_store.remove_row(PAGE_SIZE - 1)
+    while list_model.canFetchMore():
+        list_model.fetchMore()
+
+    assert list_model.rowCount() == 10 * PAGE_SIZE
+    assert list_model.index(10 * PAGE_SIZE - 2).data() == f"task_{10 * PAGE_SIZE - 1}"
+    assert list_model.index(10 * PAGE_SIZE - 1).data() == "added while scrolling"
+    assert len(controller.tasks) == 10 * PAGE_SIZE + 1
+
+
+def test_task_store_changes(qtbot, name, monkeypatch):
+    """This test checks that the controller keeps its tasks up to date without reloading them
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    monkeypatch:
+        pytest fixture used to forbid reloading the tasks
+    """
+
+    data = []
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+
+    # the store must not be reloaded after the start
+    monkeypatch.setattr(model, "get_tasks_page", None)
+
+    controller.add_task_to_the_list("first")
+    controller.add_task_to_the_list("second")
+    controller.complete_task(1)
+    controller.delete_task(2)
+
+    assert list(controller.tasks) == [1, 2]
+    assert controller.tasks[1].completed == 1
+    assert controller.tasks[2].removed == 1
+    assert window.tasks_num.text() == "1"
+
+
+def test_task_overview_counters(qtbot, name):
+    """This test checks that the overview numbers follow the changes of the tasks
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    data = []
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    for task_name in ("first", "second", "third"):
+        controller.add_task_to_the_list(task_name)
+    controller.complete_task(1)
+    controller.delete_task(3)
+    controller.update_task_overview()
+
+    assert (controller.counters.total, controller.counters.completed) == (2, 1)
+    assert window.tasks_num.text() == "2"
+    assert window.completed_num.text() == "1"
+
+
+def test_day_change(qtbot, name, monkeypatch):
+    """This test checks that the overdue number and the highlighted rows move to the next day at midnight
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    monkeypatch:
+        pytest fixture used to move the current day forward
+    """
+
+    today = date.today().toordinal()
+    data = [
+        {
+            "row_id": 1,
+            "name": "due tomorrow",
+            "due_date": today + 1,
+            "completed": 0,
+            "notes": None,
+            "removed": 0,
+            "time_added": 1651312800,
+            "tag": 1,
+        }
+    ]
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    index = window.task_list.model().index(0)
+    assert window.overdue_num.text() == "0"
+    assert index.data(QtCore.Qt.ForegroundRole) is None
+    assert controller.day_timer.isActive() and controller.day_timer.remainingTime() <= 86401000
+
+    monkeypatch.setattr("controllers.main_controller.today_ordinal", lambda: today + 2)
+    controller.on_day_changed()
+
+    assert window.overdue_num.text() == "1"
+    assert index.data(QtCore.Qt.ForegroundRole) == OVERDUE_COLOR
+    assert controller.day_timer.isActive()
+
+
+def test_actions_use_task_id(qtbot, name):
+    """This test checks that the list actions address tasks by their id, not by row or name
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    data = [
+        {
+            "row_id": row_id,
+            "name": "same name",
+            "due_date": None,
+            "completed": completed,
+            "notes": None,
+            "removed": 0,
+            "time_added": 1651312800,
+            "tag": 1,
+        }
+        for row_id, completed in ((3, 1), (5, 0), (9, 0))
+    ]
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    rect = window.task_list.visualRect(window.task_list.model().index(1))
+    qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=rect.center())
+    qtbot.mouseClick(window.DeleteBtn, QtCore.Qt.LeftButton)
+
+    assert window.task_list.model().rowCount() == 1
+    assert [task["removed"] for task in data] == [0, 0, 1]
+    assert controller.tasks[9].removed == 1
+
+
+def test_search_tasks(qtbot, name):
+    """This test checks that typing in the search field shows only the matching tasks
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    data = [
+        {
+            "row_id": row_id,
+            "name": task_name,
+            "due_date": None,
+            "completed": 0,
+            "notes": None,
+            "removed": 0,
+            "time_added": 1651312800,
+            "tag": 1,
+        }
+        for row_id, task_name in ((1, "buy milk"), (2, "call mom"), (3, "buy bread"))
+    ]
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    qtbot.keyClicks(window.search_qline, "buy")
+    qtbot.waitUntil(lambda: window.task_list.model().rowCount() == 2)
+    assert window.task_list.model().index(1).data() == "buy bread"
+    # a new task is shown in the search results only if it matches the search
+    controller.add_task_to_the_list("call dad")
+    controller.add_task_to_the_list("Buyer meeting")
+    assert window.task_list.model().rowCount() == 3
+    assert window.task_list.model().index(2).data() == "Buyer meeting"
+
+    window.search_qline.clear()
+    window.run_search()
+    assert window.task_list.model().rowCount() == 5
+
+
+class HeldReadsExecutor(SyncDbExecutor):
+    """Runs the writes right away and holds the results of the reads until they are delivered,
+    like reader threads whose results come after the writes submitted later"""
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.held = []
+        self.reread = []
+        self.delivering = False
+
+    def submit(self, job, args=(), on_result=None, write=False):
+        if write:
+            if self.delivering:
+                self.reread.append(job)
+            super().submit(job, args, on_result, write)
+        else:
+            self.held.append((self.model_result(job, args), on_result))
+
+    def model_result(self, job, args):
+        """Returns the result of a job as the db is now"""
+
+        results = []
+        super().submit(job, args, results.append)
+        return results[0]
+
+    def deliver_reads(self):
+        """Passes the held results of the reads on"""
+
+        held, self.held = self.held, []
+        self.delivering = True
+        for result, on_result in held:
+            on_result(result)
+        self.delivering = False
+
+
+def test_stale_reads(qtbot, name):
+    """This test checks that a read whose result misses a finished write is read again behind the writes
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    data = [
+        {"row_id": row_id, "name": f"task {row_id}", "due_date": None, "completed": 0, "notes": None,
+         "removed": 0, "time_added": 1651312800 + row_id, "tag": 1}
+        for row_id in (1, 2)
+    ]
+    executor = HeldReadsExecutor(MockModel(data))
+    controller = MainWindowController(None, executor)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+    controller.complete_task(1)
+    executor.deliver_reads()
+
+    assert "get_tasks_page" in executor.reread and "get_task_counters" in executor.reread
+    assert [window.task_list.model().index(row).data() for row in range(window.task_list.model().rowCount())] == [
+        "task 2"
+    ]
+    assert window.tasks_num.text() == "2" and window.completed_num.text() == "1"
+
+    # a read that no write overtook is used as it is
+    executor.reread.clear()
+    controller.get_completed_task()
+    executor.deliver_reads()
+    assert not executor.reread and window.task_list.model().index(0).data() == "task 1"
+
+
+def test_db_worker(qtbot, name, tmp_path):
+    """This test checks that the controller works with db jobs that run in background threads
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    tmp_path:
+        temporary directory for the db file
+    """
+
+    db_path = str(tmp_path / "worker.db")
+    db_worker = DbWorker(lambda: Model(db_path))
+    controller = MainWindowController(None, db_worker)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    qtbot.keyClicks(window.add_task_qline, "background task")
+    qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
+    qtbot.waitUntil(lambda: window.task_list.model().rowCount() == 1)
+    assert window.tasks_num.text() == "1"
+
+    controller.complete_task(1)
+    qtbot.waitUntil(lambda: window.completed_num.text() == "1")
+
+    with qtbot.waitSignal(db_worker.job_failed):
+        db_worker.submit("no_such_method")
+
+    # the reads run on the reader threads, a long write doesn't hold back switching the list
+    release = threading.Event()
+    db_worker.submit(lambda _model: release.wait(5), write=True)
+    controller.get_completed_task()
+    qtbot.waitUntil(lambda: "completed" in controller.cached_lists)
+    assert not release.is_set() and window.task_list.model().rowCount() == 1
+    release.set()
+
+    db_worker.close()
+    model = Model(db_path)
+    assert model.get_all_tasks()[0].completed == 1
+    model.clean()
+
+
+def test_import_into_shown_list(qtbot, name, tmp_path):
+    """This test checks that the list shown during an import is loaded again with its filter
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    tmp_path:
+        temporary directory for the db and the imported file
+    """
+
+    today = date.today()
+    csv_path = tmp_path / "tasks.csv"
+    csv_path.write_text(f"name,due_date\ndue today,{today.isoformat()}\nsomeday,\n", encoding="utf-8")
+    model = Model(str(tmp_path / "import.db"))
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    window.left_panel_menu.setCurrentRow(1)
+    window.import_file(str(csv_path))
+    assert window.statusBar().currentMessage() == "Imported 2 tasks from tasks.csv"
+    assert controller.task_list_params == (today.toordinal(), today.toordinal())
+    assert [window.task_list.model().index(row).data() for row in range(window.task_list.model().rowCount())] == [
+        "due today"
+    ]
+
+    csv_path.write_bytes(b"name\ncaf\xe9\n")
+    window.import_file(str(csv_path))
+    assert window.statusBar().currentMessage().startswith("tasks.csv was not imported: ")
+    assert len(model.get_all_tasks()) == 2
+    model.clean()
+
+
+def test_startup_profiler(qtbot, name, capsys):
+    """This test checks that --profile-startup reports every start-up phase once
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    capsys:
+        captures the printed timings
+    """
+
+    profiler = StartupProfiler(0.0, 0.0)
+    model = MockModel([])
+    profiler.watch_model(SyncDbExecutor(model))
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    profiler.phase("ui build")
+    profiler.watch_first_paint(window)
+    window.show()
+
+    qtbot.waitUntil(lambda: "total" in profiler.timings)
+    window.update()
+    qtbot.wait(50)
+
+    lines = capsys.readouterr().out.splitlines()
+    report = [line for line in lines if "startup_ms" in line]
+    assert len(report) == 1
+    assert set(json.loads(report[0])["startup_ms"]) == {"imports", "model open", "ui build", "first paint", "total"}
+
+
+def test_benchmark_suite(tmp_path):
+    """This test runs the benchmark suite on a small synthetic db, so it keeps working as the app changes
+
+     Parameters
+    ----------
+    tmp_path:
+        temporary directory for the synthetic db
+    """
+
+    results = suite.run_suite([300], str(tmp_path), repeat=1)
+
+    cases = results["sizes"]["300"]
+    assert "first page of incomplete tasks" in cases
+    assert "controller on_start_up" in cases
+    assert all(timing["runs"] == 1 for timing in cases.values())
+    assert not suite.compare(results, results)
+    assert len(list(suite.synthetic_tasks(50, date.today().toordinal()))) == 50
+
+
+def test_trash(qtbot, name):
+    """This test checks that a deleted task is shown in the trash and can be restored or deleted forever
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    model = MockModel([])
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    for task_name in ("keep me", "purge me"):
+        qtbot.keyClicks(window.add_task_qline, task_name)
+        qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
+    for _ in range(2):
+        center = window.task_list.visualRect(window.task_list.model().index(0)).center()
+        qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
+        qtbot.mouseClick(window.DeleteBtn, QtCore.Qt.LeftButton)
+    assert window.tasks_num.text() == "0"
+
+    window.left_panel_menu.setCurrentRow(4)
+    assert window.trash_shown
+    assert window.RestoreBtn.isVisibleTo(window) and not window.EditBtn.isVisibleTo(window)
+    assert [window.task_list.model().index(row).data() for row in range(2)] == ["keep me", "purge me"]
+
+    center = window.task_list.visualRect(window.task_list.model().index(0)).center()
+    qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
+    qtbot.mouseClick(window.RestoreBtn, QtCore.Qt.LeftButton)
+    assert window.tasks_num.text() == "1"
+
+    center = window.task_list.visualRect(window.task_list.model().index(0)).center()
+    qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, pos=center)
+    qtbot.mouseClick(window.DeleteBtn, QtCore.Qt.LeftButton)
+    assert window.task_list.model().rowCount() == 0
+    assert [task.name for task in model.get_all_tasks()] == ["keep me"]
+
+    window.left_panel_menu.setCurrentRow(0)
+    assert not window.trash_shown and window.EditBtn.isVisibleTo(window)
+    assert window.task_list.model().index(0).data() == "keep me"
+
+    # a task added while the trash or a due list is shown is only put into the task store
+    window.left_panel_menu.setCurrentRow(4)
+    controller.add_task_to_the_list("not removed")
+    assert window.task_list.model().rowCount() == 0
+    window.left_panel_menu.setCurrentRow(1)
+    controller.add_task_to_the_list("no due date")
+    assert window.task_list.model().rowCount() == 0
+    assert window.filter_models["incomplete"].rowCount() == 3
+
+    # every load and change postpones compacting the db until the user is idle
+    assert controller.idle_timer.isActive()
+    controller.idle_timer.stop()
+    controller.run_idle_work()
+    assert not controller.idle_timer.isActive()
+
+
+def test_multi_select(qtbot, name):
+    """This test checks that the edit menu acts on all selected tasks with one db job and one removal per range
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    model = MockModel([])
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    for task_name in ("first", "second", "third", "fourth", "fifth", "sixth"):
+        qtbot.keyClicks(window.add_task_qline, task_name)
+        qtbot.keyPress(window.add_task_qline, QtCore.Qt.Key_Enter)
+
+    def click_row(row, modifier=QtCore.Qt.NoModifier):
+        center = window.task_list.visualRect(window.task_list.model().index(row)).center()
+        qtbot.mouseClick(window.task_list.viewport(), QtCore.Qt.LeftButton, modifier, center)
+
+    removals = []
+    window.task_list.model().rowsRemoved.connect(lambda _parent, first, last: removals.append((first, last)))
+    bulk_calls = []
+
+    def record_calls(method):
+        original = getattr(model, method)
+
+        def bulk_method(*args):
+            bulk_calls.append(method)
+            return original(*args)
+
+        setattr(model, method, bulk_method)
+
+    for method in ("delete_tasks", "complete_tasks", "retag_tasks"):
+        record_calls(method)
+
+    click_row(0)
+    assert window.EditBtn.isEnabled() and window.selected_task_id == 1
+    click_row(2, QtCore.Qt.ControlModifier)
+    click_row(3, QtCore.Qt.ControlModifier)
+    assert window.selected_task_ids() == [1, 3, 4]
+    assert not window.EditBtn.isEnabled() and window.DeleteBtn.isEnabled()
+
+    qtbot.mouseClick(window.DeleteBtn, QtCore.Qt.LeftButton)
+    assert bulk_calls == ["delete_tasks"]
+    assert removals == [(2, 3), (0, 0)]
+    assert [window.task_list.model().index(row).data() for row in range(3)] == ["second", "fifth", "sixth"]
+    assert window.tasks_num.text() == "3"
+
+    click_row(0)
+    click_row(2, QtCore.Qt.ShiftModifier)
+    window.tag_selected_tasks(3)
+    assert {task.tag for task in model.get_all_tasks() if not task.removed} == {3}
+    assert window.task_list.model().index(1).data(TASK_ROLE).tag == 3
+
+    removals.clear()
+    qtbot.mouseClick(window.CompleteCheckbox, QtCore.Qt.LeftButton)
+    assert bulk_calls == ["delete_tasks", "retag_tasks", "complete_tasks"]
+    assert removals == [(0, 2)]
+    assert window.completed_num.text() == "3"
+    assert not window.DeleteBtn.isEnabled()
+
+
+def test_cached_filters(qtbot, name):
+    """This test checks that the incomplete and completed lists are switched without queries and follow the changes
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    data = [
+        {
+            "row_id": row_id,
+            "name": f"task {row_id}",
+            "due_date": None,
+            "completed": completed,
+            "notes": None,
+            "removed": 0,
+            "time_added": 1651312800 + row_id,
+            "tag": 1,
+        }
+        for row_id, completed in ((1, 0), (2, 1), (3, 0), (4, 1), (5, 0))
+    ]
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+
+    loaded_lists = []
+    get_tasks_page = model.get_tasks_page
+
+    def record_page_query(list_name, *args):
+        loaded_lists.append(list_name)
+        return get_tasks_page(list_name, *args)
+
+    model.get_tasks_page = record_page_query
+
+    def shown_names():
+        list_model = window.task_list.model()
+        return [list_model.index(row).data() for row in range(list_model.rowCount())]
+
+    controller.on_start_up()
+    qtbot.mouseClick(window.CompletedBtn, QtCore.Qt.LeftButton)
+    assert shown_names() == ["task 2", "task 4"]
+    qtbot.mouseClick(window.CompletedBtn, QtCore.Qt.LeftButton)
+    qtbot.mouseClick(window.IncompleteBtn, QtCore.Qt.LeftButton)
+    assert shown_names() == ["task 1", "task 3", "task 5"]
+    assert loaded_lists == ["incomplete", "completed"]
+
+    # a completed task moves to its place in the completed list, an edited one is shown with its changes
+    controller.complete_tasks([3])
+    controller.edit_task_id = 5
+    controller.save_changes("task 5 edited", None, None)
+    assert shown_names() == ["task 1", "task 5 edited"]
+    qtbot.mouseClick(window.IncompleteBtn, QtCore.Qt.LeftButton)
+    qtbot.mouseClick(window.CompletedBtn, QtCore.Qt.LeftButton)
+    assert shown_names() == ["task 2", "task 3", "task 4"]
+
+    # the due lists are queried, the tasks changed while they are shown are changed in the cached lists as well
+    window.left_panel_menu.setCurrentRow(3)
+    controller.retag_tasks([1], 2)
+    window.left_panel_menu.setCurrentRow(0)
+    assert loaded_lists == ["incomplete", "completed", "due"]
+    assert shown_names() == ["task 1", "task 5 edited"]
+    assert window.task_list.model().index(0).data(TASK_ROLE).tag == 2
+
+    controller.clear_cached_lists()
+    controller.update_task_list()
+    assert loaded_lists[-1] == "incomplete" and shown_names() == ["task 1", "task 5 edited"]
+
+
+def test_sort_and_group(qtbot, name):
+    """This test checks that the cached lists are sorted and grouped and that changed tasks move to their place
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    today = date.today().toordinal()
+    data = [
+        {
+            "row_id": row_id,
+            "name": task_name,
+            "due_date": due_date,
+            "completed": 0,
+            "notes": None,
+            "removed": 0,
+            "time_added": 1651312800 + row_id,
+            "tag": tag,
+        }
+        for row_id, task_name, due_date, tag in (
+            (1, "pay rent", today + 1, 2), (2, "call mom", None, 1), (3, "buy milk", today, 2), (4, "book", today, 1),
+        )
+    ]
+    model = MockModel(data)
+    controller = MainWindowController(model)
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    def shown_rows():
+        list_model = window.task_list.model()
+        return [list_model.index(row).data() for row in range(list_model.rowCount())]
+
+    assert shown_rows() == ["pay rent", "call mom", "buy milk", "book"]
+    window.SortBox.setCurrentText("Name")
+    assert shown_rows() == ["book", "buy milk", "call mom", "pay rent"]
+
+    window.SortBox.setCurrentText("Due date")
+    qtbot.mouseClick(window.GroupCheckbox, QtCore.Qt.LeftButton)
+    tomorrow = date.fromordinal(today + 1).isoformat()
+    assert shown_rows() == [
+        f"▾ {date.today().isoformat()} (2)", "buy milk", "book", f"▾ {tomorrow} (1)", "pay rent",
+        "▾ No due date (1)", "call mom",
+    ]
+    assert not window.task_list.model().flags(window.task_list.model().index(0)) & QtCore.Qt.ItemIsSelectable
+
+    # a header collapses and expands its group
+    window.click_list_row(window.task_list.model().index(0))
+    assert shown_rows()[:2] == [f"▸ {date.today().isoformat()} (2)", f"▾ {tomorrow} (1)"]
+
+    # the edited task moves to its new group, the emptied group loses its header, a new task gets its place
+    controller.edit_task_id = 1
+    controller.save_changes("pay rent", None, None)
+    controller.add_task_to_the_list("water plants")
+    assert shown_rows() == [f"▸ {date.today().isoformat()} (2)", "▾ No due date (3)", "pay rent", "call mom",
+                            "water plants"]
+    window.click_list_row(window.task_list.model().index(0))
+    controller.complete_tasks([3, 4])
+    assert shown_rows() == ["▾ No due date (3)", "pay rent", "call mom", "water plants"]
+
+    window.SortBox.setCurrentText("Tag")
+    assert shown_rows() == ["▾ work (2)", "call mom", "water plants", "▾ home (1)", "pay rent"]
+
+    # the tag changed in the edit window moves the task to the group of its new tag
+    controller.edit_task_id = 2
+    controller.change_tag(2)
+    assert shown_rows() == ["▾ work (1)", "water plants", "▾ home (2)", "pay rent", "call mom"]
+
+
+def test_sorted_index_follows_changes(qtmodeltester):
+    """This test checks that the sorted index stays equal to a sort of the whole list after random changes
+
+     Parameters
+    ----------
+    qtmodeltester:
+        test utility that checks the rows and signals of a Qt model
+    """
+
+    rng = random.Random(7)
+    store = TaskListModel()
+    views = {list_name: TaskFilterModel(list_name, store) for list_name in TASK_FILTERS}
+    for view in views.values():
+        qtmodeltester.check(view)
+
+    def random_task(task_id):
+        return Task(task_id, rng.choice("abcdef") + str(task_id), rng.choice([None, 5, 6, 7]), rng.randint(0, 1),
+                    None, 0, rng.randint(0, 5), rng.randint(1, 3))
+
+    store.append_page([random_task(task_id) for task_id in range(1, 31)], False)
+    for sort_name, grouped in (("Due date", True), ("Name", False), ("Tag", True)):
+        order = SORT_ORDERS[sort_name]
+        for view in views.values():
+            view.set_sort(sort_name, grouped)
+        # the first group of the incomplete view stays collapsed
+        views["incomplete"].toggle_group(0)
+
+        for _ in range(60):
+            task_id = rng.randint(1, 40)
+            if rng.random() < 0.2:
+                store.remove_tasks([task_id, task_id + 1])
+            elif store.row_of(task_id) is None:
+                store.append_task(random_task(task_id))
+            else:
+                store.update_tasks([random_task(task_id)])
+
+            tasks = [store.task_at(row) for row in range(store.rowCount())]
+            for list_name, view in views.items():
+                expected = sorted(
+                    (task for task in tasks if TASK_FILTERS[list_name](task)),
+                    key=lambda task, order=order: (order.group(task), *order.order(task), task.task_id),
+                )
+                shown = [view.index(row).data(TASK_ROLE) for row in range(view.rowCount())]
+                shown = [task for task in shown if task is not None]
+                if view is views["incomplete"] and grouped:
+                    assert shown == [task for task in expected if task in shown]
+                else:
+                    assert shown == expected
+
+
+def test_toggle_group(qtmodeltester):
+    """This test checks that collapsing and expanding a group keeps the header unchanged until its rows are moved
+
+     Parameters
+    ----------
+    qtmodeltester:
+        test utility that checks the rows and signals of a Qt model
+    """
+
+    store = TaskListModel()
+    view = TaskFilterModel("incomplete", store)
+    store.append_page([Task(task_id, f"task {task_id}", 5 + task_id % 2, 0, None, 0, 0, 1)
+                       for task_id in range(1, 5)], False)
+    view.set_sort("Due date", True)
+    # the python tester compares the header before and after the rows of its group are inserted or removed
+    qtmodeltester.check(view, force_py=True)
+
+    header = view.index(0).data()
+    view.toggle_group(0)
+    assert view.rowCount() == 4
+    assert view.index(0).data() == header.replace("▾", "▸")
+    view.toggle_group(0)
+    assert view.rowCount() == 6
+    assert view.index(0).data() == header
+
+
+def test_reminders(qtbot, name):
+    """This test checks that one timer is armed for the earliest reminder and re-armed when the tasks change
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    today = date.today().toordinal()
+    now = [reminder_timestamp(today, REMINDER_HOUR) - 60]
+    reminded = []
+    scheduler = ReminderScheduler(reminded.append, clock=lambda: now[0])
+    tasks = [
+        Task(1, "due today", today, 0, None, 0, 0, 1),
+        Task(2, "due tomorrow", today + 1, 0, None, 0, 0, 1),
+        Task(3, "completed", today, 1, None, 0, 0, 1),
+        Task(4, "due later", today + REMINDER_DAYS, 0, None, 0, 0, 1),
+    ]
+    scheduler.reset(tasks, today + REMINDER_DAYS - 1)
+    assert scheduler.next_reminder() == now[0] + 60
+    assert scheduler.timer.isActive() and scheduler.timer.interval() == 60000
+
+    # the old entry of a moved task is skipped, a timer that fires early reminds of nothing
+    scheduler.update(tasks[0]._replace(due_date=today + 1))
+    assert scheduler.next_reminder() == reminder_timestamp(today + 1, REMINDER_HOUR)
+    scheduler.timer.timeout.emit()
+    assert not reminded and scheduler.timer.isActive()
+
+    now[0] = reminder_timestamp(today + 1, REMINDER_HOUR)
+    scheduler.timer.timeout.emit()
+    assert reminded == [["due today", "due tomorrow"]]
+    assert scheduler.next_reminder() is None and not scheduler.timer.isActive()
+
+    data = [
+        {"row_id": 1, "name": "due tomorrow", "due_date": today + 1, "completed": 0, "notes": None, "removed": 0,
+         "time_added": 1651312800, "tag": 1},
+        {"row_id": 2, "name": "due in three days", "due_date": today + 3, "completed": 0, "notes": None,
+         "removed": 0, "time_added": 1651312801, "tag": 1},
+    ]
+    controller = MainWindowController(MockModel(data))
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+    assert controller.reminders.next_reminder() == reminder_timestamp(today + 1, REMINDER_HOUR)
+
+    controller.complete_task(1)
+    assert controller.reminders.next_reminder() == reminder_timestamp(today + 3, REMINDER_HOUR)
+    controller.edit_task_id = 2
+    controller.save_changes("due in two days", today + 2, "NULL")
+    assert controller.reminders.next_reminder() == reminder_timestamp(today + 2, REMINDER_HOUR)
+    controller.delete_task(2)
+    assert controller.reminders.next_reminder() is None and not controller.reminders.timer.isActive()
+
+    # the offscreen platform has no system tray, the reminder is shown in the status bar
+    window.show_reminders(["pay rent", "call mom"])
+    assert window.statusBar().currentMessage() == "2 tasks are due today: pay rent, call mom"
+
+
+def test_recurring_tasks(qtbot, name):
+    """This test checks that completing a repeating task shows its next instance and that the rule is edited
+    in the Edit window
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    """
+
+    today = date.today().toordinal()
+    data = [
+        {"row_id": 1, "name": "water the plants", "due_date": today, "completed": 0, "notes": "the big ones",
+         "removed": 0, "time_added": 1651312800, "tag": 1, "recurrence": "1 week"},
+    ]
+    controller = MainWindowController(MockModel(data))
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    list_model = window.task_list.model()
+    assert list_model.index(0).data(QtCore.Qt.ToolTipRole).startswith(
+        f"Weekly, next: {date.fromordinal(today).strftime('%b/%d')}"
+    )
+
+    controller.complete_task(1)
+    assert list_model.rowCount() == 1
+    next_task = list_model.index(0).data(TASK_ROLE)
+    assert next_task.task_id == 2 and next_task.name == "water the plants"
+    assert next_task.due_date == today + 7 and next_task.recurrence == "1 week"
+    assert window.tasks_num.text() == "2" and window.completed_num.text() == "1"
+
+    edit_window = EditWindow(controller, name)
+    qtbot.addWidget(edit_window)
+    controller.show_edit_window(True, edit_window, 2)
+    assert edit_window.repeatBox.currentText() == "Weekly"
+
+    edit_window.repeatBox.setCurrentText("sometimes")
+    assert edit_window.next_dates_lbl.text().startswith("Not a rule")
+    qtbot.mouseClick(edit_window.save_changes_btn, QtCore.Qt.LeftButton)
+    assert data[-1]["recurrence"] == "1 week"
+
+    for text in ("every 00 days", "every 99999999 day"):
+        edit_window.repeatBox.setEditText(text)
+        assert edit_window.next_dates_lbl.text().startswith("Not a rule")
+    # a rule stored before the rules were checked has no tooltip
+    window.task_store.update_task(window.task_store.row_of(2), next_task._replace(recurrence="0 day"))
+    assert list_model.index(0).data(QtCore.Qt.ToolTipRole) is None
+
+    edit_window.repeatBox.setCurrentText("every 3 days")
+    assert edit_window.next_dates_lbl.text().startswith("Every 3 days, next: ")
+    qtbot.mouseClick(edit_window.save_changes_btn, QtCore.Qt.LeftButton)
+    assert data[-1]["recurrence"] == "3 day" and controller.tasks[2].recurrence == "3 day"
+
+
+def test_edit_invalid_stored_recurrence(qtbot, name, caplog):
+    """This test checks that the Edit window opens a task whose stored rule is not valid anymore as not repeating
+
+     Parameters
+    ----------
+    qtbot:
+        test utility for simulating interaction with PyQt widgets
+    name:
+        command line argument that indicates test mode for the app
+    caplog:
+        test utility that captures the log records
+    """
+
+    data = [
+        {"row_id": 1, "name": "water the plants", "due_date": None, "completed": 0, "notes": "",
+         "removed": 0, "time_added": 1651312800, "tag": 1, "recurrence": "0 day"},
+    ]
+    controller = MainWindowController(MockModel(data))
+    window = MainWindowView(controller, name)
+    qtbot.addWidget(window)
+    controller.on_start_up()
+
+    edit_window = EditWindow(controller, name)
+    qtbot.addWidget(edit_window)
+    controller.show_edit_window(True, edit_window, 1)
+    assert edit_window.edit_task_name_lineEdit.text() == "water the plants"
+    assert edit_window.repeatBox.currentText() == "Does not repeat"
+    assert edit_window.next_dates_lbl.text() == ""
+    assert "Not a valid recurrence rule of task 1: '0 day'" in caplog.text
+
+    qtbot.mouseClick(edit_window.save_changes_btn, QtCore.Qt.LeftButton)
+    assert data[0]["recurrence"] is None
@@ -5,12 +5,19 @@ import logging
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QDialog, QMessageBox
-from PyQt5.uic import loadUi
 
+from model.dates import format_due_date, parse_due_date, today_ordinal
+from model.recurrence import (
+    NO_RECURRENCE_TEXT, RECURRENCE_PRESETS, describe_occurrences, describe_recurrence, format_recurrence,
+    parse_recurrence,
+)
+from views.ui_edit_window import Ui_edit_window
 
-class EditWindow(QDialog):
+
+class EditWindow(QDialog, Ui_edit_window):
     """
-    A class used to represent Edit window
+    A class used to represent Edit window.
+    The widgets are created by Ui_edit_window, generated from views/edit_window.ui with pyuic5.
 
     Attributes
     ----------
@@ -22,29 +29,35 @@ class EditWindow(QDialog):
     due_date_list_options(self, due_date)
     due_date_select(self)
     task_info(self, task)
+    show_next_dates(self)
     get_changes(self)
     """
 
-    def __init__(self, controller, mode):
-        super().__init__()
+    def __init__(self, controller, mode, parent=None):
+        super().__init__(parent)
         self.controller = controller
         self.controller.set_edit_window(self)
         self.test_mode = mode
-        self.edit_ui = "views/edit_window.ui"
         self.confirm_dialog = None
 
-        loadUi(self.edit_ui, self)
+        self.setupUi(self)
 
         self.edit_task_name_lineEdit.setAttribute(Qt.WA_MacShowFocusRect, False)
         self.notes_lineEdit.setAttribute(Qt.WA_MacShowFocusRect, False)
         self.due_date_box.activated.connect(self.due_date_select)
         self.calendarWidget.selectionChanged.connect(self.pick_calendar_date)
         self.save_changes_btn.clicked.connect(self.save_changes)
+        # the tag names are kept by the controller, the box only shows them
+        self.tagBox.setModel(self.controller.tag_model)
         self.tagBox.activated.connect(self.tags_selection)
+        # the presets can be chosen or a custom rule like "every 3 days" typed in
+        self.repeatBox.addItems([NO_RECURRENCE_TEXT, *RECURRENCE_PRESETS])
+        self.repeatBox.currentTextChanged.connect(self.show_next_dates)
+        self.due_date_box.currentTextChanged.connect(self.show_next_dates)
         # self.due_date_list_options()
 
     def due_date_list_options(self, due_date):
-        """Show a list of due_date options in a dropdown list.
+        """Show a list of due_date options in a dropdown list, replacing the options of the previous task.
 
         Parameters
         ----------
@@ -60,8 +73,10 @@ class EditWindow(QDialog):
             3: "No due date",
             4: "Calendar",
         }
+        self.due_date_box.clear()
         for index, item in due_date_options.items():
             self.due_date_box.insertItem(index, item)
+        self.due_date_box.setCurrentIndex(0)
 
         self.calendarWidget.hide()
 
@@ -85,7 +100,7 @@ class EditWindow(QDialog):
         self.due_date_box.setCurrentIndex(0)
 
     def tags_list(self, current_tag):
-        """Show a list of tags in a dropdown list.
+        """Select the tag of the task in the dropdown list of tags.
 
         Parameters
         ----------
@@ -93,11 +108,6 @@ class EditWindow(QDialog):
             The current tag index for the selected task
         """
 
-        tags = self.controller.get_tags()
-
-        for idx, tag in enumerate(tags):
-            self.tagBox.insertItem(idx, tag)
-
         self.tagBox.setCurrentIndex(current_tag)
 
     def tags_selection(self):
@@ -118,19 +128,57 @@ class EditWindow(QDialog):
         """
 
         self.edit_task_name_lineEdit.setText(task.name)
-        self.due_date_list_options(task.due_date)
+        self.due_date_list_options(format_due_date(task.due_date))
         self.notes_lineEdit.setText(task.notes)
         self.tags_list(task.tag - 1)
+        try:
+            repeat_text = describe_recurrence(parse_recurrence(task.recurrence))
+        except ValueError:
+            # a rule stored before the intervals were limited, it is dropped if the task is saved
+            logging.warning(f'Not a valid recurrence rule of task {task.task_id}: {task.recurrence!r}')
+            repeat_text = NO_RECURRENCE_TEXT
+        self.repeatBox.setCurrentText(repeat_text)
+        self.show_next_dates()
+
+    def show_next_dates(self):
+        """Shows the next due dates of the chosen recurrence rule under the repeat box"""
+
+        try:
+            recurrence = format_recurrence(parse_recurrence(self.repeatBox.currentText()))
+        except ValueError:
+            self.next_dates_lbl.setText('Not a rule, try e.g. "every 3 days"')
+            return
+
+        try:
+            due_date = parse_due_date(self.due_date_box.currentText())
+        except ValueError:
+            # "Calendar" is chosen and no day is picked yet
+            due_date = None
+
+        try:
+            text = "" if recurrence is None else describe_occurrences(recurrence, due_date, today_ordinal())
+        except ValueError:
+            # the dates of the rule run out of the years that can be shown
+            text = "The next dates can't be shown"
+        self.next_dates_lbl.setText(text)
 
     def save_changes(self):
-        """Save changes after editing a task. New variables: task_name, due_date, notes"""
+        """Save changes after editing a task. New variables: task_name, due_date, notes, recurrence.
+        The chosen due date option is converted here into the ordinal of the day that is stored in db,
+        the recurrence into the stored rule."""
         logging.debug("Save btn was clicked")
         task_name = self.edit_task_name_lineEdit.text()
-        due_date = self.due_date_box.currentText()
         notes = self.notes_lineEdit.text()
 
-        logging.debug(f'Changes were saved:{task_name}, {due_date}, {notes}')
-        self.controller.save_changes(task_name, due_date, notes)
+        try:
+            due_date = parse_due_date(self.due_date_box.currentText())
+            recurrence = format_recurrence(parse_recurrence(self.repeatBox.currentText()))
+        except ValueError as error:
+            logging.warning(f'Changes were not saved: {error}')
+            return
+
+        logging.debug(f'Changes were saved:{task_name}, {due_date}, {notes}, {recurrence}')
+        self.controller.save_changes(task_name, due_date, notes, recurrence)
         self.show_confirm_dialog()
         self.close()
 
@@ -1,34 +1,87 @@
 """This module contains the functionality related to the ui for Main window"""
 
 import logging
-
-from PyQt5.QtCore import  QTimer
-from PyQt5.QtWidgets import QMainWindow, QListWidgetItem, QMessageBox
-from PyQt5.uic import loadUi
-from qtconsole.qtconsoleapp import QtCore
+import os
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QApplication, QFileDialog, QMainWindow, QMenu, QMessageBox, QSystemTrayIcon,
+)
+from model.importer import IMPORT_EXTENSIONS
 import views.edit_window
-
-
-class MainWindowView(QMainWindow):
+from views.task_filter_model import DEFAULT_SORT, SORT_ORDERS, TASK_FILTERS, TaskFilterModel
+from views.task_list_model import TASK_ROLE, TaskListModel
+from views.ui_mainwindow import Ui_MainWindow
+
+# the search runs once the user stopped typing for this number of milliseconds
+SEARCH_DELAY = 250
+# row of the Trash item in the left panel menu
+TRASH_ROW = 4
+# a reminder is shown in the tray or in the status bar for this number of milliseconds
+REMINDER_MESSAGE_MSECS = 15000
+# names of the tasks listed in one reminder, the others are only counted
+MAX_REMINDER_NAMES = 5
+IMPORT_SHORTCUT = "Ctrl+I"
+# the result of an import is shown in the status bar for this number of milliseconds
+IMPORT_MESSAGE_MSECS = 10000
+
+
+class MainWindowView(QMainWindow, Ui_MainWindow):  # pylint: disable=too-many-public-methods,too-many-instance-attributes
     """
-    A class used to represent Main window
+    A class used to represent Main window.
+    The widgets are created by Ui_MainWindow, generated from views/mainwindow.ui with pyuic5.
 
     Attributes
     ----------
     controller: object
         instance of class MainWindowController(QObject)
+    trash_shown: bool
+        True while the removed tasks are shown. The tasks can only be restored or deleted forever then.
+    task_store: object
+        instance of class TaskListModel with the loaded pages of the lists in TASK_FILTERS
+    filter_models: dict
+        list name -> instance of class TaskFilterModel that shows the list out of task_store
+    task_list_model: object
+        instance of class TaskListModel with the other lists: due tasks, the trash and search results
+    tray_icon: object
+        QSystemTrayIcon that shows the reminders, created with the first reminder. It stays None
+        if the desktop has no system tray, the reminders are shown in the status bar then.
 
     Methods
     -------
     disable_edit_menu(self)
     enable_edit_menu(self)
-    add_task(self, task_name)
+    add_task(self, task, in_shown_list)
+    has_filter(self, list_name)
+    show_filter(self, list_name)
+    set_filter_tasks(self, list_name, tasks, has_more)
+    clear_filters(self)
+    add_tasks_to_store(self, tasks)
+    set_tasks(self, tasks, has_more)
+    append_tasks(self, tasks, has_more)
+    set_today(self, today)
     update_task_count(self, num_tasks)
     update_overdue_task_count(self, num_tasks)
     update_completed_task_update(self, num_tasks)
     get_task_text(self)
-    item_click(self, item)
+    selected_task_ids(self)
+    on_selection_changed(self)
+    click_list_row(self, index)
+    apply_sort(self)
     click_edit_btn(self)
+    get_edit_window(self)
+    confirm_delete_tasks(self, task_ids)
+    click_restore_btn(self)
+    set_trash_mode(self, shown)
+    update_tasks(self, tasks)
+    show_task_menu(self, pos)
+    tag_selected_tasks(self, tag_id)
+    remove_tasks_from_list(self, task_ids)
+    run_search(self)
+    show_reminders(self, names)
+    click_import(self)
+    import_file(self, path)
 
     """
 
@@ -44,26 +97,63 @@ class MainWindowView(QMainWindow):
         self.controller = controller
         self.controller.set_view(self)
         self.test_mode = mode
-        self.main_window_ui = "views/mainwindow.ui"
-        loadUi(self.main_window_ui, self)
-
-        self.selected_item_name = None
+        self.setupUi(self)
+
+        self.selected_task_id = None
+        self.trash_shown = False
+        # built on the first edit and reused for every task after that
+        self.edit_window = None
+        self.tray_icon = None
+        self.task_store = TaskListModel(self)
+        self.filter_models = {}
+        for list_name in TASK_FILTERS:
+            filter_model = TaskFilterModel(list_name, self.task_store, self)
+            filter_model.more_requested.connect(self.controller.fetch_more_tasks)
+            self.filter_models[list_name] = filter_model
+        self.task_list_model = TaskListModel(self)
+        self.task_list_model.more_requested.connect(self.controller.fetch_more_tasks)
+        self._show_model(self.task_list_model)
+        # Ctrl and Shift add tasks to the selection, the edit menu acts on all selected tasks
+        self.task_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.task_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.task_list.customContextMenuRequested.connect(self.show_task_menu)
+        self.task_list.clicked.connect(self.click_list_row)
+
+        self.SortBox.addItems(SORT_ORDERS)
+        self.SortBox.setCurrentText(DEFAULT_SORT)
+        self.SortBox.currentTextChanged.connect(self.apply_sort)
+        self.GroupCheckbox.toggled.connect(self.apply_sort)
+        # the headers of the groups by tag show the tag names
+        self.controller.tag_model.modelReset.connect(self._set_tag_names)
 
         self.disable_edit_menu()
+        self.RestoreBtn.hide()
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_qline.textChanged.connect(self.search_timer.start)
 
-        self.task_list.itemClicked.connect(self.item_click)
         self.EditBtn.clicked.connect(self.click_edit_btn)
         self.DeleteBtn.clicked.connect(self.click_delete_btn)
+        self.RestoreBtn.clicked.connect(self.click_restore_btn)
         self.add_task_qline.returnPressed.connect(self.get_task_text)
         self.CompleteCheckbox.clicked.connect(self.complete_task)
+        self.left_panel_menu.currentRowChanged.connect(self.show_menu_tasks)
         self.IncompleteBtn.clicked.connect(self.show_incomplete_tasks)
         self.CompletedBtn.clicked.connect(self.show_complete_tasks)
 
+        import_action = self.menuBar().addMenu("File").addAction("Import tasks...")
+        import_action.setShortcut(QKeySequence(IMPORT_SHORTCUT))
+        import_action.triggered.connect(self.click_import)
+
     def disable_edit_menu(self):
         """Disables the edit menu"""
 
         self.EditBtn.setEnabled(False)
         self.DeleteBtn.setEnabled(False)
+        self.RestoreBtn.setEnabled(False)
         self.CompleteCheckbox.setEnabled(False)
 
     def enable_edit_menu(self):
@@ -71,21 +161,147 @@ class MainWindowView(QMainWindow):
 
         self.EditBtn.setEnabled(True)
         self.DeleteBtn.setEnabled(True)
+        self.RestoreBtn.setEnabled(True)
         self.CompleteCheckbox.setEnabled(True)
 
-    def add_task(self, task_name):
-        """Adds a new task to the task_list widget
+    def add_task(self, task, in_shown_list=True):
+        """Adds a new task to the task store, the cached lists sort it in. It is added to the other shown lists
+        only if it belongs to them.
+
+        Parameters
+        ----------
+        task: object
+            The instance of class Task (located in main_model.py file)
+        in_shown_list: bool
+            True if the task belongs to the shown list, e.g. it is due in the shown period or matches the search
+        """
+
+        self.task_store.append_task(task)
+        if in_shown_list and self.task_list.model() is self.task_list_model:
+            self.task_list_model.append_task(task)
+
+    def _show_model(self, model):
+        """Shows the model in the task_list view. The selection is dropped, it belongs to the previous model."""
+
+        if self.task_list.model() is model:
+            return
+
+        old_selection = self.task_list.selectionModel()
+        self.task_list.setModel(model)
+        if old_selection is not None:
+            old_selection.deleteLater()
+        self.task_list.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.disable_edit_menu()
+        # only the cached lists are sorted and grouped in memory, the other lists keep the order of their query
+        self.SortBox.setEnabled(model is not self.task_list_model)
+        self.GroupCheckbox.setEnabled(model is not self.task_list_model)
+
+    def has_filter(self, list_name):
+        """Returns True if the list is shown by a filter view of the task store
+
+        Parameters
+        ----------
+        list_name: str
+            name of a list, see TASK_LISTS in main_model.py
+        """
+
+        return list_name in self.filter_models
+
+    def show_filter(self, list_name):
+        """Shows a list whose pages are loaded into the task store already, no tasks are added
+
+        Parameters
+        ----------
+        list_name: str
+            one of TASK_FILTERS
+        """
+
+        filter_model = self.filter_models[list_name]
+        # the controller drops a page that was asked for before the list was switched
+        filter_model.cancel_fetch()
+        self._show_model(filter_model)
+
+    def set_filter_tasks(self, list_name, tasks, has_more):
+        """Adds the first page of a list to the task store and shows the list
+
+        Parameters
+        ----------
+        list_name: str
+            one of TASK_FILTERS
+        tasks: list
+            instances of class Task (located in main_model.py file)
+        has_more: bool
+            True if the tasks are the first page of a longer list
+        """
+
+        self.task_store.append_page(tasks, False)
+        self.filter_models[list_name].page_loaded(tasks, has_more)
+        self._show_model(self.filter_models[list_name])
+
+    def clear_filters(self):
+        """Empties the task store, the lists are loaded from the first page again when they are shown"""
+
+        self.task_store.set_tasks([])
+        for filter_model in self.filter_models.values():
+            filter_model.clear_pages()
+
+    def add_tasks_to_store(self, tasks):
+        """Adds tasks to the task store, the filter views sort them in. It is used for the tasks restored
+        from the trash and the next instances of the completed repeating tasks.
 
         Parameters
         ----------
-        task_name: str
-            The name of the task
+        tasks: list
+            instances of class Task
         """
 
-        item = QListWidgetItem(task_name)
-        item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
-        item.setCheckState(QtCore.Qt.Unchecked)
-        self.task_list.addItem(item)
+        # a page read while they were changed may have brought an older copy of them already
+        self.task_store.update_tasks(tasks)
+        self.task_store.append_page(tasks, False)
+
+    def set_tasks(self, tasks, has_more=False):
+        """Shows the given tasks in the task_list view replacing the current ones
+
+        Parameters
+        ----------
+        tasks: iterable
+            instances of class Task (located in main_model.py file)
+        has_more: bool
+            True if the tasks are the first page of the list, the next pages are loaded on scroll
+        """
+
+        self.task_list_model.set_tasks(tasks, has_more)
+        self._show_model(self.task_list_model)
+
+    def append_tasks(self, tasks, has_more):
+        """Adds the next page of tasks to the end of the task_list view
+
+        Parameters
+        ----------
+        tasks: list
+            instances of class Task (located in main_model.py file)
+        has_more: bool
+            True if there are more pages after this one
+        """
+
+        shown_model = self.task_list.model()
+        if shown_model is self.task_list_model:
+            self.task_list_model.append_page(tasks, has_more)
+        else:
+            self.task_store.append_page(tasks, False)
+            shown_model.page_loaded(tasks, has_more)
+
+    def set_today(self, today):
+        """Sets the current day that the overdue tasks in the list are highlighted by
+
+        Parameters
+        ----------
+        today: int
+            ordinal of the current day
+        """
+
+        self.task_store.set_today(today)
+        self.task_list_model.set_today(today)
 
     def update_task_count(self, num_tasks):
         """Updates the total amount of tasks that a user has
@@ -128,56 +344,79 @@ class MainWindowView(QMainWindow):
         self.controller.add_task_to_the_list(text)
         self.add_task_qline.clear()
 
-    def item_click(self, item):
-        """Disables or Enables the edit menu after item(a task) was clicked on
+    def selected_task_ids(self):
+        """Returns the ids of the selected tasks in the order of the list"""
+
+        indexes = sorted(self.task_list.selectionModel().selectedIndexes(), key=lambda index: index.row())
+        tasks = (index.data(TASK_ROLE) for index in indexes)
+        # group headers are not tasks
+        return [task.task_id for task in tasks if task is not None]
+
+    def on_selection_changed(self):
+        """Enables the edit menu while tasks are selected. Only one task at a time can be edited."""
+
+        task_ids = self.selected_task_ids()
+        self.CompleteCheckbox.setCheckState(Qt.Unchecked)
+        self.selected_task_id = task_ids[0] if len(task_ids) == 1 else None
+
+        if task_ids:
+            self.enable_edit_menu()
+            self.EditBtn.setEnabled(len(task_ids) == 1)
+        else:
+            self.disable_edit_menu()
+
+    def click_list_row(self, index):
+        """Collapses or expands a group after its header was clicked
 
         Parameters
         ----------
-        item: class 'PyQt5.QtWidgets.QListWidgetItem'
-            The task in the task_list that was clicked.
+        index: class 'PyQt5.QtCore.QModelIndex'
+            The index of the clicked row
         """
 
-        for i in range(self.task_list.count()):
-            if self.task_list.item(i) != item:
-                self.task_list.item(i).setCheckState(QtCore.Qt.Unchecked)
-                self.CompleteCheckbox.setCheckState(QtCore.Qt.Unchecked)
+        model = self.task_list.model()
+        if model is not self.task_list_model:
+            model.toggle_group(index.row())
 
-        if item.checkState():
-            item.setCheckState(QtCore.Qt.Unchecked)
-            self.disable_edit_menu()
+    def apply_sort(self):
+        """Sorts and groups the cached lists as chosen in the sort box and the group checkbox"""
 
-        else:
-            item.setCheckState(QtCore.Qt.Checked)
-            self.enable_edit_menu()
+        for filter_model in self.filter_models.values():
+            filter_model.set_sort(self.SortBox.currentText(), self.GroupCheckbox.isChecked())
 
-        self.selected_item_name = item.text()
+    def _set_tag_names(self):
+        """Passes the loaded tag names to the cached lists"""
+
+        for filter_model in self.filter_models.values():
+            filter_model.set_tag_names(self.controller.get_tags())
 
     def click_edit_btn(self):
         """Calls edit menu after edit button was clicked"""
 
         logging.debug("edit btn was clicked!!!!")
-        edit_window = views.edit_window.EditWindow(self.controller, self.test_mode)
-        task_id = self.task_list.currentRow() + 1  # because in db row_id starts with 1
-        logging.debug(f'Selected item name: {self.selected_item_name}')
+        logging.debug(f'Selected task id: {self.selected_task_id}')
+
+        self.controller.show_edit_window(self.test_mode, self.get_edit_window(), self.selected_task_id)
 
-        self.controller.show_edit_window(
-            self.test_mode, edit_window, task_id, self.selected_item_name
-        )
+    def get_edit_window(self):
+        """Returns the edit window. It is built once, show_edit_window fills it with the task to edit."""
+
+        if self.edit_window is None:
+            self.edit_window = views.edit_window.EditWindow(self.controller, self.test_mode, self)
+        return self.edit_window
 
     def click_delete_btn(self):
-        """Calls controller function to delete the selected task"""
-        task_id = (
-            self.task_list.currentRow() + 1
-        )
-        self.confirm_delete_task(task_id, self.selected_item_name)
+        """Calls controller function to delete the selected tasks"""
+
+        self.confirm_delete_tasks(self.selected_task_ids())
 
-    def confirm_delete_task(self, task_id, task_name):
-        """Shows confirmation message for deleting the selected task
+    def confirm_delete_tasks(self, task_ids):
+        """Shows confirmation message for deleting the selected tasks
 
         Parameters
         ----------
-        task_id: int
-            id of a task that equals rowid in db (to make it equal to rowid you need to add 1)
+        task_ids: list
+            ids of tasks that equal rowid in db
         """
         confirm_delete = False
 
@@ -187,7 +426,11 @@ class MainWindowView(QMainWindow):
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Question)
 
-            msg.setInformativeText("Are you sure you want to delete this item?")
+            items = "this item" if len(task_ids) == 1 else f"these {len(task_ids)} items"
+            if self.trash_shown:
+                msg.setInformativeText(f"Are you sure you want to delete {items} forever?")
+            else:
+                msg.setInformativeText(f"Are you sure you want to delete {items}?")
             msg.setWindowTitle("Message")
             msg.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
 
@@ -197,53 +440,132 @@ class MainWindowView(QMainWindow):
                 confirm_delete = True
 
         if confirm_delete:
-            self.controller.delete_task(task_id, task_name)
-            item_idx = task_id - 1
-            self.task_list.takeItem(item_idx)
+            if self.trash_shown:
+                self.controller.purge_tasks(task_ids)
+            else:
+                self.controller.delete_tasks(task_ids)
+            self._remove_tasks(task_ids)
+            self.disable_edit_menu()
         else:
             logging.debug("Cancel was clicked")
 
-    def update_task_name(self, task_name, task_id):
-        """Updates the name of the task in the list on the main window after editing
+    def click_restore_btn(self):
+        """Moves the selected tasks from the trash back to their lists"""
+
+        task_ids = self.selected_task_ids()
+        # the controller adds them to the task store once they are restored
+        self.task_list_model.remove_tasks(task_ids)
+        self.controller.restore_tasks(task_ids)
+        self.disable_edit_menu()
+
+    def set_trash_mode(self, shown):
+        """Switches the edit menu between the buttons for removed tasks and the ones for the other tasks
+
+        Parameters
+        ----------
+        shown: bool
+            True if the removed tasks are shown
+        """
+
+        self.trash_shown = shown
+        self.EditBtn.setVisible(not shown)
+        self.CompleteCheckbox.setVisible(not shown)
+        self.RestoreBtn.setVisible(shown)
+
+    def update_task(self, task):
+        """Updates the task in the list on the main window after editing
+
+        Parameters
+        ----------
+        task: object
+            The instance of class Task after editing
+        """
+
+        logging.debug("We are in update-task")
+        for model in (self.task_store, self.task_list_model):
+            row = model.row_of(task.task_id)
+            if row is not None:
+                model.update_task(row, task)
+
+    def update_tasks(self, tasks):
+        """Updates many tasks in the list on the main window at once, e.g. after they got a new tag
+
+        Parameters
+        ----------
+        tasks: list
+            instances of class Task
+        """
+
+        self.task_store.update_tasks(tasks)
+        self.task_list_model.update_tasks(tasks)
+
+    def _remove_tasks(self, task_ids):
+        """Removes the tasks from the task store and from the shown list"""
+
+        self.task_store.remove_tasks(task_ids)
+        self.task_list_model.remove_tasks(task_ids)
+
+    def show_task_menu(self, pos):
+        """Shows the context menu of the task list that sets a tag on the selected tasks
+
+        Parameters
+        ----------
+        pos: QPoint
+            position of the click in the task_list viewport
+        """
+
+        if self.trash_shown or not self.selected_task_ids():
+            return
+
+        menu = QMenu(self)
+        for tag_id, tag_name in enumerate(self.controller.get_tags(), 1):
+            action = menu.addAction(f"Tag: {tag_name}")
+            action.triggered.connect(lambda _checked, tag_id=tag_id: self.tag_selected_tasks(tag_id))
+        menu.exec_(self.task_list.viewport().mapToGlobal(pos))
+
+    def tag_selected_tasks(self, tag_id):
+        """Sets the tag on all selected tasks in one transaction
 
         Parameters
         ----------
-        task_name: str
-            new name of the task after editing
-        task_id: int
-            task id which equals rowid in db.
-            To get the right id of the task in the widget_list you need to substitute 1 from task_id
+        tag_id: int
+            id of the tag in db
         """
 
-        logging.debug("We are in update-task-name")
-        list_task_id = task_id - 1
-        self.task_list.item(list_task_id).setText(task_name)
+        self.controller.retag_tasks(self.selected_task_ids(), tag_id)
 
     def complete_task(self):
-        """Complete the task"""
+        """Complete the selected tasks"""
         if self.CompleteCheckbox.checkState():
-            task_id = self.task_list.currentRow() + 1
-            task_name = self.selected_item_name
-            self.controller.complete_task(task_id, task_name)
+            task_ids = self.selected_task_ids()
+            self.controller.complete_tasks(task_ids)
 
             if self.test_mode:
-                self.remove_task_from_list()
+                self.remove_tasks_from_list(task_ids)
             else:
-                QTimer.singleShot(1000, self.remove_task_from_list)
+                QTimer.singleShot(1000, lambda: self.remove_tasks_from_list(task_ids))
 
             logging.debug("Trying to complete this task")
         else:
             logging.debug("Task is not gonna be complete")
 
-    def remove_task_from_list(self):
-        """Remove task from the list after completion"""
-        self.task_list.takeItem(self.task_list.currentRow())
-        self.CompleteCheckbox.setCheckState(QtCore.Qt.Unchecked)
+    def remove_tasks_from_list(self, task_ids):
+        """Remove tasks from the list after completion. The filter views of the task store
+        move the completed tasks once the controller updated them.
+
+        Parameters
+        ----------
+        task_ids: list
+            ids of the completed tasks
+        """
+        self.task_list_model.remove_tasks(task_ids)
+        self.CompleteCheckbox.setCheckState(Qt.Unchecked)
         self.controller.update_task_overview()
 
     def show_incomplete_tasks(self):
         """Shows all incomplete tasks on the main page"""
 
+        self.set_trash_mode(False)
         self.set_default_completed_btn()
 
         if self.IncompleteBtn.isChecked():
@@ -257,6 +579,7 @@ class MainWindowView(QMainWindow):
     def show_complete_tasks(self):
         """Shows all incomplete tasks on the main page"""
 
+        self.set_trash_mode(False)
         self.set_default_incomplete_btn()
 
         if self.CompletedBtn.isChecked():
@@ -268,10 +591,44 @@ class MainWindowView(QMainWindow):
             self.clear_task_list()
             self.controller.update_task_list()
 
+    def run_search(self):
+        """Shows the tasks that match the text of the search field or all tasks if it is empty"""
+
+        self.search_timer.stop()
+        text = self.search_qline.text().strip()
+
+        self.set_trash_mode(False)
+        self.set_default_incomplete_btn()
+        self.set_default_completed_btn()
+        self.disable_edit_menu()
+        self.controller.search_tasks(text)
+
+    def show_menu_tasks(self, row):
+        """Shows the tasks of the item chosen in the left panel menu
+
+        Parameters
+        ----------
+        row: int
+            row of the item: All Tasks, Today, Tomorrow, This Week, Trash
+        """
+
+        periods = {1: "today", 2: "tomorrow", 3: "week"}
+
+        self.set_default_incomplete_btn()
+        self.set_default_completed_btn()
+        self.disable_edit_menu()
+        self.set_trash_mode(row == TRASH_ROW)
+        if row == TRASH_ROW:
+            self.controller.get_removed_tasks()
+        elif row in periods:
+            self.controller.get_due_tasks(periods[row])
+        elif row == 0:
+            self.controller.update_task_list()
+
     def clear_task_list(self):
         """Clear the task view list"""
 
-        self.task_list.clear()
+        self.task_list_model.set_tasks([])
 
     def set_default_incomplete_btn(self):
         """Set to the default state Incomplete btn"""
@@ -284,3 +641,61 @@ class MainWindowView(QMainWindow):
 
         self.CompletedBtn.setChecked(False)
         self.CompletedBtn.setStyleSheet("background-color: white;")
+
+    def show_reminders(self, names):
+        """Notifies about the tasks whose reminder time came: in the system tray or in the status bar
+
+        Parameters
+        ----------
+        names: list
+            names of the tasks, the earliest reminder first
+        """
+
+        title = "A task is due today" if len(names) == 1 else f"{len(names)} tasks are due today"
+        shown_names = names[:MAX_REMINDER_NAMES]
+        if len(names) > MAX_REMINDER_NAMES:
+            shown_names.append(f"and {len(names) - MAX_REMINDER_NAMES} more")
+
+        if self.tray_icon is None and QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(QApplication.windowIcon(), self)
+            self.tray_icon.show()
+
+        if self.tray_icon is not None and QSystemTrayIcon.supportsMessages():
+            self.tray_icon.showMessage(title, "\n".join(shown_names), QSystemTrayIcon.Information,
+                                       REMINDER_MESSAGE_MSECS)
+        else:
+            self.statusBar().showMessage(f"{title}: {', '.join(shown_names)}", REMINDER_MESSAGE_MSECS)
+        # flashes the task bar entry while the window is in the background
+        QApplication.alert(self)
+
+    def click_import(self):
+        """Asks for a .csv or .jsonl file exported from another tool and imports its tasks"""
+
+        patterns = " ".join(f"*{extension}" for extension in IMPORT_EXTENSIONS)
+        path, _file_filter = QFileDialog.getOpenFileName(self, "Import tasks", "", f"Tasks ({patterns})")
+        if path:
+            self.import_file(path)
+
+    def import_file(self, path):
+        """Imports the tasks of a file in the background and shows the result in the status bar
+
+        Parameters
+        ----------
+        path: str
+            path to a .csv or .jsonl file
+        """
+
+        file_name = os.path.basename(path)
+        self.statusBar().showMessage(f"Importing {file_name}...")
+
+        def on_finished(imported, skipped, error):
+            if error is not None:
+                message = f"{file_name} was not imported: {error}"
+            else:
+                message = f"Imported {imported} tasks from {file_name}"
+                if skipped:
+                    # the numbers of the skipped rows and the reasons are in the log
+                    message += f", skipped {len(skipped)} invalid rows"
+            self.statusBar().showMessage(message, IMPORT_MESSAGE_MSECS)
+
+        self.controller.import_tasks(path, on_finished)
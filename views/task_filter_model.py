@@ -0,0 +1,505 @@
+"""This module contains the filter views that show one task list out of the tasks kept in memory"""
+
+import bisect
+from collections import namedtuple
+from datetime import date
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QFont
+
+from model.dates import format_due_date
+from views.task_list_model import TASK_ROLE, row_ranges
+
+# list name -> test of a task. The loaded pages of these lists are kept in one shared TaskListModel,
+# switching between them shows another filter of it instead of querying the db again.
+TASK_FILTERS = {
+    "incomplete": lambda task: task.completed == 0 and task.removed == 0,
+    "completed": lambda task: task.completed == 1 and task.removed == 0,
+}
+
+# group: the value the tasks are grouped and sorted by first
+# order: the values that sort the tasks inside of a group, the task_id is added to make every key unique
+# label: the text of the group header, called with the group and the tag names
+SortOrder = namedtuple("SortOrder", "group order label")
+
+SORT_ORDERS = {
+    "Created": SortOrder(
+        lambda task: date.fromtimestamp(task.time_added).toordinal(),
+        lambda task: (task.time_added,),
+        lambda day, _tag_names: date.fromordinal(day).isoformat(),
+    ),
+    "Due date": SortOrder(
+        # the tasks without a due date come last
+        lambda task: (task.due_date is None, task.due_date or 0),
+        lambda task: (task.time_added,),
+        lambda group, _tag_names: format_due_date(None if group[0] else group[1]),
+    ),
+    "Tag": SortOrder(
+        lambda task: task.tag or 0,
+        lambda task: (task.time_added,),
+        lambda tag_id, tag_names: tag_names[tag_id - 1] if 0 < tag_id <= len(tag_names) else "No tag",
+    ),
+    "Name": SortOrder(
+        lambda task: task.name[:1].upper(),
+        lambda task: (task.name.casefold(),),
+        lambda letter, _tag_names: letter or "#",
+    ),
+}
+# the order of the pages of the lists
+DEFAULT_SORT = "Created"
+HEADER_FONT = QFont()
+HEADER_FONT.setBold(True)
+
+
+class TaskFilterModel(QAbstractListModel):  # pylint: disable=too-many-instance-attributes
+    """
+    A class used to show the tasks of one list out of the shared TaskListModel (the task store)
+    that holds the loaded pages of all lists in TASK_FILTERS.
+
+    The tasks of the list are kept in a sorted index of their sort keys. A task added to or changed
+    in the store is put into its place with a binary search and only its row is inserted, moved or
+    removed, so the list is never sorted or queried again after an edit. A completed task moves
+    from the incomplete view to the completed view the same way.
+
+    If the view is grouped, every group starts with a header row. Clicking a header collapses or
+    expands its group. The rows of the headers are counted again only after the groups changed.
+
+    Every view keeps its own page cursor. The store can hold tasks of the view that come after its
+    last loaded page, e.g. a task completed in the incomplete view. They are sorted in already and
+    the page that brings them later skips them. The tasks of the next pages are sorted in as well,
+    so an order other than DEFAULT_SORT covers the loaded pages.
+
+    Signals
+    -------
+    more_requested(object)
+        emitted with the last loaded Task of the view when the view needs the next page
+
+    Methods
+    -------
+    rowCount(self, parent)
+    data(self, index, role)
+    flags(self, index)
+    canFetchMore(self, parent)
+    fetchMore(self, parent)
+    set_sort(self, sort_name, grouped)
+    set_tag_names(self, tag_names)
+    is_header(self, row)
+    toggle_group(self, row)
+    page_loaded(self, tasks, has_more)
+    cancel_fetch(self)
+    clear_pages(self)
+    """
+
+    more_requested = pyqtSignal(object)
+
+    def __init__(self, list_name, store, parent=None):
+        """
+        Parameters
+        ----------
+        list_name: str
+            one of TASK_FILTERS
+        store: object
+            instance of class TaskListModel shared by all filter views
+        parent: object
+            QObject that owns the view
+        """
+
+        super().__init__(parent)
+        self.list_name = list_name
+        self._accepts = TASK_FILTERS[list_name]
+        self._store = store
+        self._sort = SORT_ORDERS[DEFAULT_SORT]
+        self._grouped = False
+        self._tag_names = []
+        # task_id -> Task of the list and its sort key (group, *order, task_id)
+        self._tasks = {}
+        self._key_of = {}
+        # the sorted index: the keys of all tasks of the list
+        self._keys = []
+        # sorted group values, the number of tasks in every group and the collapsed groups
+        self._groups = []
+        self._group_sizes = {}
+        self._collapsed = set()
+        # the groups whose header shows them collapsed, it changes after their rows are inserted or removed
+        self._collapsed_headers = set()
+        # the counts shown in the headers, they change after the rows of a group are inserted or removed
+        self._header_counts = {}
+        # row of the header of every group, counted again on the next lookup after the groups changed
+        self._header_rows = None
+        self._last_loaded = None
+        self._has_more = False
+        self._fetching = False
+
+        store.rowsInserted.connect(self._on_rows_inserted)
+        store.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        store.dataChanged.connect(self._on_data_changed)
+        store.modelReset.connect(self._rebuild)
+        self._rebuild()
+
+    def _key(self, task):
+        """Returns the sort key of a task"""
+
+        return (self._sort.group(task), *self._sort.order(task), task.task_id)
+
+    def _group_start(self, group):
+        """Returns the position of the first key of the group in the index"""
+
+        # (group,) sorts before every longer key that starts with the group
+        return bisect.bisect_left(self._keys, (group,))
+
+    def _headers(self):
+        """Returns the rows of the group headers"""
+
+        if self._header_rows is None:
+            self._header_rows = []
+            row = 0
+            for group in self._groups:
+                self._header_rows.append(row)
+                row += 1 if group in self._collapsed else 1 + self._group_sizes[group]
+        return self._header_rows
+
+    def _header_row(self, group):
+        """Returns the row of the header of a group"""
+
+        return self._headers()[bisect.bisect_left(self._groups, group)]
+
+    def _row_of_key(self, position, group):
+        """Returns the row of the key at the position of the index, None if its group is collapsed"""
+
+        if not self._grouped:
+            return position
+        if group in self._collapsed:
+            return None
+        return self._header_row(group) + 1 + position - self._group_start(group)
+
+    def _item_at(self, row):
+        """Returns the group of the header at the row and None, or None and the task_id at the row"""
+
+        if not self._grouped:
+            return None, self._keys[row][-1]
+
+        headers = self._headers()
+        group_idx = bisect.bisect_right(headers, row) - 1
+        group = self._groups[group_idx]
+        if row == headers[group_idx]:
+            return group, None
+        return None, self._keys[self._group_start(group) + row - headers[group_idx] - 1][-1]
+
+    def rowCount(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        """Returns the number of shown rows: the tasks and the group headers"""
+
+        if parent.isValid():
+            return 0
+        if not self._grouped:
+            return len(self._keys)
+        hidden = sum(self._group_sizes.get(group, 0) for group in self._collapsed)
+        return len(self._groups) + len(self._keys) - hidden
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Returns the data of a task like TaskListModel or the text of a group header
+
+        Parameters
+        ----------
+        index: QModelIndex
+        role: int
+            TASK_ROLE returns None for a group header
+        """
+
+        if not index.isValid() or index.row() >= self.rowCount():
+            return None
+
+        group, task_id = self._item_at(index.row())
+        if task_id is None:
+            return self._header_data(group, role)
+
+        if role in (Qt.ForegroundRole, Qt.ToolTipRole):
+            # the store knows the current day that the overdue tasks and the next due dates are counted from
+            return self._store.data(self._store.index(self._store.row_of(task_id)), role)
+
+        task = self._tasks[task_id]
+        if role == Qt.DisplayRole:
+            return task.name
+        if role == TASK_ROLE:
+            return task
+        return None
+
+    def _header_data(self, group, role):
+        """Returns the data of the header of a group: an arrow, the label of the group and its number of tasks"""
+
+        if role == Qt.DisplayRole:
+            arrow = "▸" if group in self._collapsed_headers else "▾"
+            return f"{arrow} {self._sort.label(group, self._tag_names)} ({self._header_counts[group]})"
+        if role == Qt.FontRole:
+            return HEADER_FONT
+        return None
+
+    def flags(self, index):
+        """Group headers can be clicked but not selected"""
+
+        if index.isValid() and self.is_header(index.row()):
+            return Qt.ItemIsEnabled
+        return super().flags(index)
+
+    def is_header(self, row):
+        """Returns True if the row is a group header
+
+        Parameters
+        ----------
+        row: int
+        """
+
+        return self._grouped and 0 <= row < self.rowCount() and self._item_at(row)[1] is None
+
+    def canFetchMore(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        """Returns True if the list has pages that are not loaded yet"""
+
+        return not parent.isValid() and self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        """Asks for the next page of the list. It is added to the store and passed to page_loaded."""
+
+        if self.canFetchMore(parent):
+            self._fetching = True
+            self.more_requested.emit(self._last_loaded)
+
+    def set_sort(self, sort_name, grouped):
+        """Sorts the list in another order and shows or hides the group headers
+
+        Parameters
+        ----------
+        sort_name: str
+            one of SORT_ORDERS
+        grouped: bool
+            True shows a header for every group
+        """
+
+        self._sort = SORT_ORDERS[sort_name]
+        self._grouped = grouped
+        self._collapsed = set()
+        self._collapsed_headers = set()
+        self._rebuild()
+
+    def set_tag_names(self, tag_names):
+        """Sets the names of the tags for the headers of the groups by tag
+
+        Parameters
+        ----------
+        tag_names: list
+            names ordered by tag id
+        """
+
+        self._tag_names = list(tag_names)
+        if self._grouped and self._groups:
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [Qt.DisplayRole])
+
+    def toggle_group(self, row):
+        """Collapses or expands the group of the header at the row
+
+        Parameters
+        ----------
+        row: int
+            row of a group header, other rows are ignored
+        """
+
+        if not self.is_header(row):
+            return
+
+        group = self._item_at(row)[0]
+        size = self._group_sizes[group]
+        if group in self._collapsed:
+            self.beginInsertRows(QModelIndex(), row + 1, row + size)
+            self._collapsed.discard(group)
+            self._header_rows = None
+            self.endInsertRows()
+            self._collapsed_headers.discard(group)
+        else:
+            self.beginRemoveRows(QModelIndex(), row + 1, row + size)
+            self._collapsed.add(group)
+            self._header_rows = None
+            self.endRemoveRows()
+            self._collapsed_headers.add(group)
+        self.dataChanged.emit(self.index(row), self.index(row), [Qt.DisplayRole])
+
+    def _rebuild(self):
+        """Builds the index again from all tasks of the store, after a reset or in a new sort order"""
+
+        self.beginResetModel()
+        tasks = (self._store.task_at(row) for row in range(self._store.rowCount()))
+        self._tasks = {task.task_id: task for task in tasks if self._accepts(task)}
+        self._key_of = {task_id: self._key(task) for task_id, task in self._tasks.items()}
+        self._keys = sorted(self._key_of.values())
+        self._group_sizes = {}
+        for key in self._keys:
+            self._group_sizes[key[0]] = self._group_sizes.get(key[0], 0) + 1
+        self._groups = sorted(self._group_sizes)
+        self._header_counts = dict(self._group_sizes)
+        self._header_rows = None
+        self.endResetModel()
+
+    def _insert(self, task):
+        """Puts a task into its place in the index and inserts its row"""
+
+        key = self._key(task)
+        group = key[0]
+        position = bisect.bisect_left(self._keys, key)
+        new_group = group not in self._group_sizes
+
+        if not self._grouped:
+            first = last = position
+        elif new_group:
+            # the header of the new group and the row of the task if the group is not collapsed
+            group_idx = bisect.bisect_left(self._groups, group)
+            headers = self._headers()
+            first = headers[group_idx] if group_idx < len(headers) else self.rowCount()
+            last = first + (group not in self._collapsed)
+        else:
+            first = last = self._row_of_key(position, group)
+
+        if first is not None:
+            self.beginInsertRows(QModelIndex(), first, last)
+        self._keys.insert(position, key)
+        self._key_of[task.task_id] = key
+        self._tasks[task.task_id] = task
+        if new_group:
+            bisect.insort(self._groups, group)
+            self._header_counts[group] = 1
+        self._group_sizes[group] = self._group_sizes.get(group, 0) + 1
+        self._header_rows = None
+        if first is not None:
+            self.endInsertRows()
+        self._update_header(group)
+
+    def _remove(self, task_id):
+        """Removes a task from the index and its row"""
+
+        key = self._key_of[task_id]
+        group = key[0]
+        position = bisect.bisect_left(self._keys, key)
+        removes_group = self._group_sizes[group] == 1
+
+        if not self._grouped:
+            first = last = position
+        elif removes_group:
+            first = self._header_row(group)
+            last = first + (group not in self._collapsed)
+        else:
+            first = last = self._row_of_key(position, group)
+
+        if first is not None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        self._forget(position)
+        if first is not None:
+            self.endRemoveRows()
+        self._update_header(group)
+
+    def _forget(self, position):
+        """Drops the key at the position of the index and the task it belongs to"""
+
+        key = self._keys.pop(position)
+        group = key[0]
+        del self._key_of[key[-1]]
+        del self._tasks[key[-1]]
+        self._group_sizes[group] -= 1
+        if self._group_sizes[group] == 0:
+            del self._group_sizes[group]
+            self._groups.remove(group)
+        self._header_rows = None
+
+    def _remove_tasks(self, task_ids):
+        """Removes tasks from the index. Without groups the adjacent rows are removed at once."""
+
+        if self._grouped:
+            for task_id in task_ids:
+                self._remove(task_id)
+            return
+
+        positions = sorted(bisect.bisect_left(self._keys, self._key_of[task_id]) for task_id in task_ids)
+        # from the bottom up, so the rows of the ranges above stay the same
+        for first, last in reversed(row_ranges(positions)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for position in range(last, first - 1, -1):
+                self._forget(position)
+            self.endRemoveRows()
+
+    def _update_header(self, group):
+        """Repaints the header of a group after its number of tasks changed"""
+
+        if group not in self._group_sizes:
+            self._header_counts.pop(group, None)
+            return
+        self._header_counts[group] = self._group_sizes[group]
+        if self._grouped:
+            row = self._header_row(group)
+            self.dataChanged.emit(self.index(row), self.index(row), [Qt.DisplayRole])
+
+    def _on_rows_inserted(self, _parent, first, last):
+        """Adds the tasks of the list that were added to the store"""
+
+        for row in range(first, last + 1):
+            task = self._store.task_at(row)
+            if self._accepts(task) and task.task_id not in self._tasks:
+                self._insert(task)
+
+    def _on_rows_about_to_be_removed(self, _parent, first, last):
+        """Removes the tasks of the list that are removed from the store"""
+
+        task_ids = (self._store.task_at(row).task_id for row in range(first, last + 1))
+        self._remove_tasks([task_id for task_id in task_ids if task_id in self._tasks])
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        """Moves the changed tasks to their new place, into the list or out of it"""
+
+        if roles and Qt.DisplayRole not in roles:
+            # e.g. the overdue tasks are highlighted on a new day, the tasks themselves did not change
+            if self._keys:
+                self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), roles)
+            return
+
+        tasks = [self._store.task_at(row) for row in range(top_left.row(), bottom_right.row() + 1)]
+        moved = []
+        for task in tasks:
+            key = self._key_of.get(task.task_id)
+            if key is None:
+                continue
+            if not self._accepts(task) or self._key(task) != key:
+                moved.append(task.task_id)
+                continue
+
+            # the task stays in its place
+            self._tasks[task.task_id] = task
+            row = self._row_of_key(bisect.bisect_left(self._keys, key), key[0])
+            if row is not None:
+                self.dataChanged.emit(self.index(row), self.index(row))
+
+        self._remove_tasks(moved)
+        for task in tasks:
+            if self._accepts(task) and task.task_id not in self._tasks:
+                self._insert(task)
+
+    def page_loaded(self, tasks, has_more):
+        """Moves the page cursor after a page of the list was added to the store
+
+        Parameters
+        ----------
+        tasks: list
+            instances of class Task in the order of the list
+        has_more: bool
+            True if there are more pages after this one
+        """
+
+        self._fetching = False
+        if tasks:
+            self._last_loaded = tasks[-1]
+        self._has_more = has_more and bool(tasks)
+
+    def cancel_fetch(self):
+        """Allows asking for the next page again, the page that was asked for is dropped by the controller"""
+
+        self._fetching = False
+
+    def clear_pages(self):
+        """Forgets the loaded pages, the list starts from the first page again"""
+
+        self._last_loaded = None
+        self._has_more = False
+        self._fetching = False
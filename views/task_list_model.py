@@ -0,0 +1,327 @@
+"""This module contains the Qt item model that backs the task list on the main window"""
+
+import logging
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+
+from model.dates import today_ordinal
+from model.recurrence import describe_occurrences
+
+TASK_ROLE = Qt.UserRole + 1
+OVERDUE_COLOR = QColor("#d9534f")
+
+
+def row_ranges(rows):
+    """Returns the ranges of adjacent rows as [first, last] pairs
+
+    Parameters
+    ----------
+    rows: list
+        sorted row numbers without repeats
+    """
+
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+
+class TaskListModel(QAbstractListModel):
+    """
+    A class used to represent the list of tasks shown in the task_list view.
+    Only the rows that are visible in the view are asked for their data, so the
+    cost of showing the list does not depend on the number of tasks.
+
+    The tasks can be loaded page by page. If set_tasks or append_page was told that there are
+    more tasks, the view asks for them with fetchMore when it is scrolled to the end and the
+    model emits more_requested with the last loaded task. The page is added with append_page.
+
+    Signals
+    -------
+    more_requested(object)
+        emitted with the last loaded Task when the view needs the next page
+
+    Methods
+    -------
+    rowCount(self, parent)
+    data(self, index, role)
+    canFetchMore(self, parent)
+    fetchMore(self, parent)
+    set_tasks(self, tasks, has_more)
+    append_page(self, tasks, has_more)
+    append_task(self, task)
+    remove_row(self, row)
+    remove_task(self, task_id)
+    remove_tasks(self, task_ids)
+    update_task(self, row, task)
+    update_tasks(self, tasks)
+    task_at(self, row)
+    row_of(self, task_id)
+    set_today(self, today)
+    """
+
+    more_requested = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = []
+        # task_id -> row, rebuilt on the next lookup after rows were removed or reset
+        self._rows = None
+        # the last loaded task is kept apart from the rows, removing rows does not change where the next page starts
+        self._last_loaded = None
+        self._has_more = False
+        self._fetching = False
+        # ordinal of the current day, incomplete tasks due before it are shown as overdue
+        self._today = None
+
+    def rowCount(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        """Returns the number of tasks in the model"""
+
+        if parent.isValid():
+            return 0
+        return len(self._tasks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Returns the data for the task at the given index
+
+        Parameters
+        ----------
+        index: QModelIndex
+        role: int
+            Qt.DisplayRole returns the task name, TASK_ROLE returns the whole Task,
+            Qt.ForegroundRole returns OVERDUE_COLOR for overdue tasks,
+            Qt.ToolTipRole returns the rule and the next due dates of a repeating task
+        """
+
+        if not index.isValid() or index.row() >= len(self._tasks):
+            return None
+
+        task = self._tasks[index.row()]
+        if role == Qt.DisplayRole:
+            return task.name
+        if role == TASK_ROLE:
+            return task
+        if role == Qt.ForegroundRole and self._is_overdue(task):
+            return OVERDUE_COLOR
+        if role == Qt.ToolTipRole and task.recurrence is not None and task.completed == 0:
+            # the next due dates are generated when the tooltip is shown, they are never stored
+            try:
+                return describe_occurrences(task.recurrence, task.due_date, self._today or today_ordinal())
+            except ValueError:
+                logging.warning(f'Not a valid recurrence rule of task {task.task_id}: {task.recurrence!r}')
+        return None
+
+    def _is_overdue(self, task):
+        """Returns True if the task is incomplete and was due before today"""
+
+        return (
+            self._today is not None and task.completed == 0
+            and task.due_date is not None and task.due_date < self._today
+        )
+
+    def canFetchMore(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        """Returns True if there are tasks that are not loaded yet"""
+
+        return not parent.isValid() and self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        """Asks for the next page. The rows are added once append_page is called with it."""
+
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        self.more_requested.emit(self._last_loaded)
+
+    def set_tasks(self, tasks, has_more=False):
+        """Replaces all tasks in the model with a single reset
+
+        Parameters
+        ----------
+        tasks: iterable
+            instances of class Task (located in main_model.py file)
+        has_more: bool
+            True if the tasks are the first page of a longer list
+        """
+
+        self.beginResetModel()
+        self._tasks = list(tasks)
+        self._rows = None
+        self._last_loaded = self._tasks[-1] if self._tasks else None
+        self._has_more = has_more and self._last_loaded is not None
+        self._fetching = False
+        self.endResetModel()
+
+    def append_page(self, tasks, has_more):
+        """Adds the next page of tasks to the end of the list
+
+        Parameters
+        ----------
+        tasks: list
+            instances of class Task that follow the last loaded task
+        has_more: bool
+            True if there are more pages after this one
+        """
+
+        self._fetching = False
+        if tasks:
+            self._last_loaded = tasks[-1]
+        self._has_more = has_more and bool(tasks)
+
+        # a task added while the list was loaded can be in the page already
+        tasks = [task for task in tasks if self.row_of(task.task_id) is None]
+        if not tasks:
+            return
+
+        first_row = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(tasks) - 1)
+        for row, task in enumerate(tasks, first_row):
+            self._tasks.append(task)
+            self._rows[task.task_id] = row
+        self.endInsertRows()
+
+    def append_task(self, task):
+        """Adds a task to the end of the list.
+
+        If not all pages are loaded, the task is not added now, it comes with the last page.
+
+        Parameters
+        ----------
+        task: object
+            The instance of class Task
+        """
+
+        if self._has_more or self.row_of(task.task_id) is not None:
+            return
+
+        row = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.append(task)
+        if self._rows is not None:
+            self._rows[task.task_id] = row
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        """Removes the task at the given row
+
+        Parameters
+        ----------
+        row: int
+        """
+
+        if row < 0 or row >= len(self._tasks):
+            return
+
+        self._remove_range(row, row)
+
+    def _remove_range(self, first_row, last_row):
+        """Removes the rows from first_row to last_row, both included, with a single removal"""
+
+        self.beginRemoveRows(QModelIndex(), first_row, last_row)
+        del self._tasks[first_row:last_row + 1]
+        self._rows = None
+        self.endRemoveRows()
+
+    def update_task(self, row, task):
+        """Replaces the task at the given row and repaints only that row
+
+        Parameters
+        ----------
+        row: int
+        task: object
+            The instance of class Task
+        """
+
+        if row < 0 or row >= len(self._tasks):
+            return
+
+        self._tasks[row] = task
+        if self._rows is not None:
+            self._rows[task.task_id] = row
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def update_tasks(self, tasks):
+        """Replaces many tasks and repaints the rows between the first and the last of them at once
+
+        Parameters
+        ----------
+        tasks: iterable
+            instances of class Task, the ones that are not in the list are skipped
+        """
+
+        rows = []
+        for task in tasks:
+            row = self.row_of(task.task_id)
+            if row is not None:
+                self._tasks[row] = task
+                rows.append(row)
+
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+    def task_at(self, row):
+        """Returns the task at the given row
+
+        Parameters
+        ----------
+        row: int
+        """
+
+        return self._tasks[row]
+
+    def row_of(self, task_id):
+        """Returns the row of the task with the given task_id or None
+
+        Parameters
+        ----------
+        task_id: int
+            id of a task that equals rowid in db
+        """
+
+        if self._rows is None:
+            self._rows = {task.task_id: row for row, task in enumerate(self._tasks)}
+        return self._rows.get(task_id)
+
+    def remove_task(self, task_id):
+        """Removes the task with the given task_id
+
+        Parameters
+        ----------
+        task_id: int
+            id of a task that equals rowid in db
+        """
+
+        row = self.row_of(task_id)
+        if row is not None:
+            self.remove_row(row)
+
+    def remove_tasks(self, task_ids):
+        """Removes the tasks with the given ids, one removal per range of adjacent rows
+
+        Parameters
+        ----------
+        task_ids: iterable
+            ids of tasks that equal rowid in db, the ones that are not in the list are skipped
+        """
+
+        rows = sorted({row for row in map(self.row_of, task_ids) if row is not None})
+        # from the bottom up, so the rows of the ranges above stay the same
+        for first_row, last_row in reversed(row_ranges(rows)):
+            self._remove_range(first_row, last_row)
+
+    def set_today(self, today):
+        """Sets the current day and repaints the rows, so the overdue tasks are highlighted again
+
+        Parameters
+        ----------
+        today: int
+            ordinal of the current day
+        """
+
+        self._today = today
+        if self._tasks:
+            self.dataChanged.emit(self.index(0), self.index(len(self._tasks) - 1), [Qt.ForegroundRole])
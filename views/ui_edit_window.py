@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'views/edit_window.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_edit_window(object):
+    def setupUi(self, edit_window):
+        edit_window.setObjectName("edit_window")
+        edit_window.resize(614, 474)
+        edit_window.setMinimumSize(QtCore.QSize(0, 0))
+        edit_window.setMaximumSize(QtCore.QSize(16777215, 800))
+        edit_window.setStyleSheet("background-color: #fff;\n"
+"color: black;\n"
+"font-weight: normal;\n"
+"font:  15pt \"Helvetica\";\n"
+"")
+        self.due_date_lbl = QtWidgets.QLabel(edit_window)
+        self.due_date_lbl.setGeometry(QtCore.QRect(40, 110, 60, 21))
+        self.due_date_lbl.setStyleSheet("font: 300 italic 16pt \"Helvetica Neue\";\n"
+"color: grey;\n"
+"padding-left: 5px;")
+        self.due_date_lbl.setAlignment(QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft|QtCore.Qt.AlignVCenter)
+        self.due_date_lbl.setObjectName("due_date_lbl")
+        self.note_lbl = QtWidgets.QLabel(edit_window)
+        self.note_lbl.setGeometry(QtCore.QRect(9, 300, 81, 21))
+        self.note_lbl.setStyleSheet("font: 300 italic 18pt \"Helvetica Neue\";")
+        self.note_lbl.setAlignment(QtCore.Qt.AlignCenter)
+        self.note_lbl.setObjectName("note_lbl")
+        self.edit_task_name_lineEdit = QtWidgets.QLineEdit(edit_window)
+        self.edit_task_name_lineEdit.setGeometry(QtCore.QRect(120, 30, 461, 41))
+        self.edit_task_name_lineEdit.setStyleSheet("QLineEdit#edit_task_name_lineEdit{\n"
+"    font: 200 italic 16pt \"Helvetica Neue\";\n"
+"    color: black;\n"
+"    background-color: white;\n"
+"    border: 1px solid grey;\n"
+"    border-width: 1px;\n"
+"    border-radius: 10px;\n"
+"    padding-left: 10px;\n"
+"}\n"
+"QLineEdit#edit_task_name_lineEdit:focus{    \n"
+"    outline: 0px;\n"
+"    outline: none;\n"
+"    outline-style: none;\n"
+"}")
+        self.edit_task_name_lineEdit.setText("")
+        self.edit_task_name_lineEdit.setFrame(False)
+        self.edit_task_name_lineEdit.setObjectName("edit_task_name_lineEdit")
+        self.notes_lineEdit = QtWidgets.QLineEdit(edit_window)
+        self.notes_lineEdit.setGeometry(QtCore.QRect(20, 330, 571, 41))
+        self.notes_lineEdit.setStyleSheet("color: black;\n"
+"background-color: white;\n"
+"border: 1px solid grey;\n"
+"border-width: 1px;\n"
+"border-radius: 10px;\n"
+"padding-left: 10px;\n"
+"outline: 0px;\n"
+"outline: none;\n"
+"outline-style: none;\n"
+"font: 200 italic 16pt \"Helvetica Neue\";")
+        self.notes_lineEdit.setText("")
+        self.notes_lineEdit.setFrame(False)
+        self.notes_lineEdit.setObjectName("notes_lineEdit")
+        self.save_changes_btn = QtWidgets.QPushButton(edit_window)
+        self.save_changes_btn.setGeometry(QtCore.QRect(440, 410, 151, 41))
+        self.save_changes_btn.setStyleSheet("border-radius: 10px;\n"
+"border : 2px solid grey;\n"
+"background-color: #dbe8f6;\n"
+"color: black;\n"
+"font: 300 italic 16pt \"Helvetica Neue\";")
+        self.save_changes_btn.setObjectName("save_changes_btn")
+        self.summary_lbl = QtWidgets.QLabel(edit_window)
+        self.summary_lbl.setGeometry(QtCore.QRect(10, 40, 101, 21))
+        self.summary_lbl.setStyleSheet("font: 300 italic 18pt \"Helvetica Neue\";")
+        self.summary_lbl.setAlignment(QtCore.Qt.AlignCenter)
+        self.summary_lbl.setObjectName("summary_lbl")
+        self.due_date_box = QtWidgets.QComboBox(edit_window)
+        self.due_date_box.setGeometry(QtCore.QRect(120, 110, 161, 21))
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.due_date_box.sizePolicy().hasHeightForWidth())
+        self.due_date_box.setSizePolicy(sizePolicy)
+        self.due_date_box.setMinimumSize(QtCore.QSize(25, 0))
+        self.due_date_box.setMaximumSize(QtCore.QSize(200, 200))
+        self.due_date_box.setStyleSheet("QComboBox{\n"
+"    font: italic 12pt \"Arial\";\n"
+"    subcontrol-origin: padding;\n"
+"    subcontrol-position: bottom right;\n"
+"    selection-background-color: white;\n"
+"    selection-color: rgb(162, 210, 255);\n"
+"    color: black;\n"
+"    border-style: solid;\n"
+"    border: 1px solid #1e1e1e;\n"
+"    border-radius: 5;\n"
+"    padding: 0px 20px 1px 20px;\n"
+"}\n"
+"/*QComboBox#due_date_box::drop-down{\n"
+"    subcontrol-origin: padding;\n"
+"    subcontrol-position: top right;\n"
+"     color: white;\n"
+"     border-radius: 5px;\n"
+"     padding-left: 10px;\n"
+"}*/\n"
+"")
+        self.due_date_box.setMaxVisibleItems(10)
+        self.due_date_box.setSizeAdjustPolicy(QtWidgets.QComboBox.AdjustToContentsOnFirstShow)
+        self.due_date_box.setMinimumContentsLength(100)
+        self.due_date_box.setFrame(False)
+        self.due_date_box.setObjectName("due_date_box")
+        self.tags_lbl = QtWidgets.QLabel(edit_window)
+        self.tags_lbl.setGeometry(QtCore.QRect(40, 160, 60, 21))
+        self.tags_lbl.setStyleSheet("font: 300 italic 16pt \"Helvetica Neue\";\n"
+"color: grey;\n"
+"padding-left: 5px;")
+        self.tags_lbl.setAlignment(QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft|QtCore.Qt.AlignVCenter)
+        self.tags_lbl.setObjectName("tags_lbl")
+        self.calendarWidget = QtWidgets.QCalendarWidget(edit_window)
+        self.calendarWidget.setGeometry(QtCore.QRect(310, 90, 231, 181))
+        self.calendarWidget.setHorizontalHeaderFormat(QtWidgets.QCalendarWidget.SingleLetterDayNames)
+        self.calendarWidget.setObjectName("calendarWidget")
+        self.tagBox = QtWidgets.QComboBox(edit_window)
+        self.tagBox.setGeometry(QtCore.QRect(120, 160, 161, 21))
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.tagBox.sizePolicy().hasHeightForWidth())
+        self.tagBox.setSizePolicy(sizePolicy)
+        self.tagBox.setMaximumSize(QtCore.QSize(200, 200))
+        self.tagBox.setStyleSheet("QComboBox{\n"
+"    font: italic 12pt \"Arial\";\n"
+"    subcontrol-origin: padding;\n"
+"    subcontrol-position: bottom right;\n"
+"    selection-background-color: white;\n"
+"    selection-color: rgb(162, 210, 255);\n"
+"    color: black;\n"
+"    border-style: solid;\n"
+"    border: 1px solid #1e1e1e;\n"
+"    border-radius: 5;\n"
+"    padding: 0px 20px 1px 20px;\n"
+"}\n"
+"QComboBox#tag_box ::drop-down{\n"
+"    subcontrol-origin: padding;\n"
+"    subcontrol-position: bottom right;\n"
+"     width: 50px;\n"
+"     color: white;\n"
+"     border-left-width: 0px;\n"
+"     border-left-color: darkgray;\n"
+"     border-left-style: solid; /* just a single line */\n"
+"     border-top-right-radius: 3px; /* same radius as the QComboBox */\n"
+"     border-bottom-right-radius: 3px;\n"
+"     padding-left: 10px;\n"
+"}\n"
+"")
+        self.tagBox.setSizeAdjustPolicy(QtWidgets.QComboBox.AdjustToContentsOnFirstShow)
+        self.tagBox.setMinimumContentsLength(100)
+        self.tagBox.setFrame(False)
+        self.tagBox.setObjectName("tagBox")
+        self.repeat_lbl = QtWidgets.QLabel(edit_window)
+        self.repeat_lbl.setGeometry(QtCore.QRect(40, 210, 70, 21))
+        self.repeat_lbl.setStyleSheet("font: 300 italic 16pt \"Helvetica Neue\";\n"
+"color: grey;\n"
+"padding-left: 5px;")
+        self.repeat_lbl.setAlignment(QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft|QtCore.Qt.AlignVCenter)
+        self.repeat_lbl.setObjectName("repeat_lbl")
+        self.repeatBox = QtWidgets.QComboBox(edit_window)
+        self.repeatBox.setGeometry(QtCore.QRect(120, 210, 161, 21))
+        self.repeatBox.setStyleSheet("QComboBox{\n"
+"    font: italic 12pt \"Arial\";\n"
+"    selection-background-color: white;\n"
+"    selection-color: rgb(162, 210, 255);\n"
+"    color: black;\n"
+"    border-style: solid;\n"
+"    border: 1px solid #1e1e1e;\n"
+"    border-radius: 5;\n"
+"    padding: 0px 20px 1px 20px;\n"
+"}\n"
+"")
+        self.repeatBox.setEditable(True)
+        self.repeatBox.setInsertPolicy(QtWidgets.QComboBox.NoInsert)
+        self.repeatBox.setObjectName("repeatBox")
+        self.next_dates_lbl = QtWidgets.QLabel(edit_window)
+        self.next_dates_lbl.setGeometry(QtCore.QRect(120, 240, 181, 41))
+        self.next_dates_lbl.setStyleSheet("font: italic 11pt \"Arial\";\n"
+"color: grey;")
+        self.next_dates_lbl.setText("")
+        self.next_dates_lbl.setWordWrap(True)
+        self.next_dates_lbl.setObjectName("next_dates_lbl")
+
+        self.retranslateUi(edit_window)
+        self.due_date_box.setCurrentIndex(-1)
+        QtCore.QMetaObject.connectSlotsByName(edit_window)
+
+    def retranslateUi(self, edit_window):
+        _translate = QtCore.QCoreApplication.translate
+        edit_window.setWindowTitle(_translate("edit_window", "Edit"))
+        self.due_date_lbl.setText(_translate("edit_window", "due"))
+        self.note_lbl.setText(_translate("edit_window", "Notes"))
+        self.save_changes_btn.setText(_translate("edit_window", "Save "))
+        self.summary_lbl.setText(_translate("edit_window", "Summary"))
+        self.tags_lbl.setText(_translate("edit_window", "tags"))
+        self.repeat_lbl.setText(_translate("edit_window", "repeat"))
+        self.repeatBox.setToolTip(_translate("edit_window", "Choose how often the task repeats or type e.g. \"every 3 days\""))
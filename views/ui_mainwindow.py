@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'views/mainwindow.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1200, 800)
+        MainWindow.setMinimumSize(QtCore.QSize(1200, 800))
+        MainWindow.setMaximumSize(QtCore.QSize(1200, 800))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setKerning(True)
+        MainWindow.setFont(font)
+        MainWindow.setStyleSheet("background-color: #d7e7f5;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.left_panel_menu = QtWidgets.QListWidget(self.centralwidget)
+        self.left_panel_menu.setGeometry(QtCore.QRect(0, 280, 171, 611))
+        self.left_panel_menu.setMaximumSize(QtCore.QSize(16777215, 800))
+        self.left_panel_menu.setStyleSheet("font: 14pt \"Chalkduster\";\n"
+"color: black;\n"
+"padding-left: 20px;")
+        self.left_panel_menu.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.left_panel_menu.setObjectName("left_panel_menu")
+        item = QtWidgets.QListWidgetItem()
+        self.left_panel_menu.addItem(item)
+        item = QtWidgets.QListWidgetItem()
+        self.left_panel_menu.addItem(item)
+        item = QtWidgets.QListWidgetItem()
+        self.left_panel_menu.addItem(item)
+        item = QtWidgets.QListWidgetItem()
+        self.left_panel_menu.addItem(item)
+        item = QtWidgets.QListWidgetItem()
+        self.left_panel_menu.addItem(item)
+        self.label = QtWidgets.QLabel(self.centralwidget)
+        self.label.setGeometry(QtCore.QRect(0, 0, 1271, 41))
+        self.label.setStyleSheet("background: #0060bf;")
+        self.label.setText("")
+        self.label.setObjectName("label")
+        self.widget = QtWidgets.QWidget(self.centralwidget)
+        self.widget.setGeometry(QtCore.QRect(179, 50, 600, 800))
+        self.widget.setMinimumSize(QtCore.QSize(600, 800))
+        self.widget.setMaximumSize(QtCore.QSize(700, 800))
+        self.widget.setStyleSheet("background-color: #fff;")
+        self.widget.setObjectName("widget")
+        self.search_qline = QtWidgets.QLineEdit(self.widget)
+        self.search_qline.setGeometry(QtCore.QRect(10, 20, 291, 32))
+        self.search_qline.setStyleSheet("font: 12pt \"Chalkduster\";\n"
+"color: black;\n"
+"background-color: white;\n"
+"border: 1px solid grey;\n"
+"border-width: 1px;\n"
+"border-radius: 10px;")
+        self.search_qline.setClearButtonEnabled(True)
+        self.search_qline.setObjectName("search_qline")
+        self.add_task_qline = QtWidgets.QLineEdit(self.widget)
+        self.add_task_qline.setGeometry(QtCore.QRect(10, 110, 551, 41))
+        self.add_task_qline.setStyleSheet("font: 12pt \"Chalkduster\";\n"
+"color: black;\n"
+"background-color: white;\n"
+"border: 1px solid grey;\n"
+"border-width: 1px;\n"
+"border-radius: 10px;")
+        self.add_task_qline.setFrame(True)
+        self.add_task_qline.setClearButtonEnabled(False)
+        self.add_task_qline.setObjectName("add_task_qline")
+        self.line_2 = QtWidgets.QFrame(self.widget)
+        self.line_2.setGeometry(QtCore.QRect(0, 170, 601, 20))
+        self.line_2.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line_2.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_2.setObjectName("line_2")
+        self.task_list = QtWidgets.QListView(self.widget)
+        self.task_list.setGeometry(QtCore.QRect(10, 190, 591, 551))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setKerning(True)
+        font.setStyleStrategy(QtGui.QFont.PreferDefault)
+        self.task_list.setFont(font)
+        self.task_list.setStyleSheet("color: black;\n"
+"font-weight: normal;\n"
+"font: 12pt \"Chalkduster\";\n"
+"")
+        self.task_list.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.task_list.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.task_list.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.task_list.setUniformItemSizes(True)
+        self.task_list.setObjectName("task_list")
+        self.IncompleteBtn = QtWidgets.QPushButton(self.widget)
+        self.IncompleteBtn.setEnabled(True)
+        self.IncompleteBtn.setGeometry(QtCore.QRect(320, 20, 113, 32))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setKerning(True)
+        self.IncompleteBtn.setFont(font)
+        self.IncompleteBtn.setStyleSheet("background-color: #dbe8f6;")
+        self.IncompleteBtn.setCheckable(True)
+        self.IncompleteBtn.setChecked(True)
+        self.IncompleteBtn.setAutoDefault(False)
+        self.IncompleteBtn.setDefault(False)
+        self.IncompleteBtn.setFlat(False)
+        self.IncompleteBtn.setObjectName("IncompleteBtn")
+        self.CompletedBtn = QtWidgets.QPushButton(self.widget)
+        self.CompletedBtn.setGeometry(QtCore.QRect(460, 20, 113, 32))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.CompletedBtn.setFont(font)
+        self.CompletedBtn.setCheckable(True)
+        self.CompletedBtn.setChecked(False)
+        self.CompletedBtn.setAutoDefault(False)
+        self.CompletedBtn.setDefault(False)
+        self.CompletedBtn.setFlat(False)
+        self.CompletedBtn.setObjectName("CompletedBtn")
+        self.EditBtn = QtWidgets.QPushButton(self.widget)
+        self.EditBtn.setGeometry(QtCore.QRect(120, 70, 80, 24))
+        self.EditBtn.setMouseTracking(False)
+        self.EditBtn.setStyleSheet("background-color: #dbe8f6;")
+        self.EditBtn.setFlat(False)
+        self.EditBtn.setObjectName("EditBtn")
+        self.CompleteCheckbox = QtWidgets.QCheckBox(self.widget)
+        self.CompleteCheckbox.setGeometry(QtCore.QRect(20, 70, 91, 21))
+        self.CompleteCheckbox.setStyleSheet("")
+        self.CompleteCheckbox.setObjectName("CompleteCheckbox")
+        self.DeleteBtn = QtWidgets.QPushButton(self.widget)
+        self.DeleteBtn.setGeometry(QtCore.QRect(210, 70, 80, 24))
+        self.DeleteBtn.setMouseTracking(False)
+        self.DeleteBtn.setStyleSheet("background-color: #dbe8f6;")
+        self.DeleteBtn.setFlat(False)
+        self.DeleteBtn.setObjectName("DeleteBtn")
+        self.RestoreBtn = QtWidgets.QPushButton(self.widget)
+        self.RestoreBtn.setGeometry(QtCore.QRect(300, 70, 80, 24))
+        self.RestoreBtn.setStyleSheet("background-color: #dbe8f6;")
+        self.RestoreBtn.setFlat(False)
+        self.RestoreBtn.setObjectName("RestoreBtn")
+        self.SortBox = QtWidgets.QComboBox(self.widget)
+        self.SortBox.setGeometry(QtCore.QRect(400, 70, 111, 24))
+        self.SortBox.setObjectName("SortBox")
+        self.GroupCheckbox = QtWidgets.QCheckBox(self.widget)
+        self.GroupCheckbox.setGeometry(QtCore.QRect(520, 70, 71, 21))
+        self.GroupCheckbox.setObjectName("GroupCheckbox")
+        self.label_2 = QtWidgets.QLabel(self.centralwidget)
+        self.label_2.setGeometry(QtCore.QRect(10, 50, 151, 171))
+        self.label_2.setText("")
+        self.label_2.setPixmap(QtGui.QPixmap("views/../../../Downloads/ddf131967dc6b75a17a355a19ea22c61.jpeg"))
+        self.label_2.setScaledContents(True)
+        self.label_2.setObjectName("label_2")
+        self.line_3 = QtWidgets.QFrame(self.centralwidget)
+        self.line_3.setGeometry(QtCore.QRect(0, 430, 181, 21))
+        self.line_3.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line_3.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_3.setObjectName("line_3")
+        self.all_tasks_lbl = QtWidgets.QLabel(self.centralwidget)
+        self.all_tasks_lbl.setGeometry(QtCore.QRect(800, 80, 131, 21))
+        self.all_tasks_lbl.setStyleSheet("color: black;\n"
+"font: 20pt \"Chalkduster\";")
+        self.all_tasks_lbl.setAlignment(QtCore.Qt.AlignCenter)
+        self.all_tasks_lbl.setObjectName("all_tasks_lbl")
+        self.alltasks_tasks = QtWidgets.QWidget(self.centralwidget)
+        self.alltasks_tasks.setGeometry(QtCore.QRect(810, 120, 71, 51))
+        self.alltasks_tasks.setStyleSheet("background-color: #dbe8f6;")
+        self.alltasks_tasks.setObjectName("alltasks_tasks")
+        self.tasks_label = QtWidgets.QLabel(self.alltasks_tasks)
+        self.tasks_label.setGeometry(QtCore.QRect(0, 30, 60, 20))
+        self.tasks_label.setStyleSheet("font: 12pt \"Chalkduster\";\n"
+"color: black;")
+        self.tasks_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.tasks_label.setObjectName("tasks_label")
+        self.tasks_num = QtWidgets.QLineEdit(self.alltasks_tasks)
+        self.tasks_num.setGeometry(QtCore.QRect(20, 0, 31, 21))
+        self.tasks_num.setStyleSheet("font: 19px \"Chalkduster\";\n"
+"color: #0060bf;")
+        self.tasks_num.setText("")
+        self.tasks_num.setFrame(False)
+        self.tasks_num.setAlignment(QtCore.Qt.AlignCenter)
+        self.tasks_num.setReadOnly(True)
+        self.tasks_num.setObjectName("tasks_num")
+        self.alltasks_overdue = QtWidgets.QWidget(self.centralwidget)
+        self.alltasks_overdue.setGeometry(QtCore.QRect(900, 120, 71, 51))
+        self.alltasks_overdue.setStyleSheet("background-color: #dbe8f6;")
+        self.alltasks_overdue.setObjectName("alltasks_overdue")
+        self.overdue_label = QtWidgets.QLabel(self.alltasks_overdue)
+        self.overdue_label.setGeometry(QtCore.QRect(0, 30, 60, 20))
+        self.overdue_label.setStyleSheet("font: 12pt \"Chalkduster\";\n"
+"color: black;")
+        self.overdue_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.overdue_label.setObjectName("overdue_label")
+        self.overdue_num = QtWidgets.QLineEdit(self.alltasks_overdue)
+        self.overdue_num.setGeometry(QtCore.QRect(20, 0, 31, 21))
+        self.overdue_num.setStyleSheet("color: red;\n"
+"font: 19px \"Chalkduster\";\n"
+"")
+        self.overdue_num.setText("")
+        self.overdue_num.setFrame(False)
+        self.overdue_num.setAlignment(QtCore.Qt.AlignCenter)
+        self.overdue_num.setReadOnly(True)
+        self.overdue_num.setObjectName("overdue_num")
+        self.alltasks_completed = QtWidgets.QWidget(self.centralwidget)
+        self.alltasks_completed.setGeometry(QtCore.QRect(990, 120, 81, 51))
+        self.alltasks_completed.setStyleSheet("background-color: #dbe8f6;\n"
+"font: 19px \"Chalkduster\";")
+        self.alltasks_completed.setObjectName("alltasks_completed")
+        self.completed_label = QtWidgets.QLabel(self.alltasks_completed)
+        self.completed_label.setGeometry(QtCore.QRect(0, 30, 71, 20))
+        self.completed_label.setStyleSheet("font: 12pt \"Chalkduster\";\n"
+"/*color: rgb(171, 171, 171);*/\n"
+"color: black;")
+        self.completed_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.completed_label.setObjectName("completed_label")
+        self.completed_num = QtWidgets.QLineEdit(self.alltasks_completed)
+        self.completed_num.setGeometry(QtCore.QRect(20, 0, 41, 21))
+        self.completed_num.setStyleSheet("font-size: 19px;\n"
+"/*color: rgb(171, 171, 171);*/\n"
+"color: rgb(0, 143, 0);")
+        self.completed_num.setText("")
+        self.completed_num.setFrame(False)
+        self.completed_num.setAlignment(QtCore.Qt.AlignCenter)
+        self.completed_num.setReadOnly(True)
+        self.completed_num.setObjectName("completed_num")
+        self.menu_header = QtWidgets.QLineEdit(self.centralwidget)
+        self.menu_header.setGeometry(QtCore.QRect(10, 250, 161, 21))
+        self.menu_header.setStyleSheet("font: 14pt \"Chalkduster\";\n"
+"color: black;")
+        self.menu_header.setFrame(False)
+        self.menu_header.setObjectName("menu_header")
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "To Do App"))
+        __sortingEnabled = self.left_panel_menu.isSortingEnabled()
+        self.left_panel_menu.setSortingEnabled(False)
+        item = self.left_panel_menu.item(0)
+        item.setText(_translate("MainWindow", "All Tasks"))
+        item = self.left_panel_menu.item(1)
+        item.setText(_translate("MainWindow", "Today"))
+        item = self.left_panel_menu.item(2)
+        item.setText(_translate("MainWindow", "Tomorrow"))
+        item = self.left_panel_menu.item(3)
+        item.setText(_translate("MainWindow", "This Week"))
+        item = self.left_panel_menu.item(4)
+        item.setText(_translate("MainWindow", "Trash"))
+        self.left_panel_menu.setSortingEnabled(__sortingEnabled)
+        self.search_qline.setPlaceholderText(_translate("MainWindow", "  Search..."))
+        self.add_task_qline.setPlaceholderText(_translate("MainWindow", "  Add a task..."))
+        self.IncompleteBtn.setText(_translate("MainWindow", "Incomplete"))
+        self.CompletedBtn.setText(_translate("MainWindow", "Completed"))
+        self.EditBtn.setText(_translate("MainWindow", "Edit"))
+        self.CompleteCheckbox.setText(_translate("MainWindow", "Complete"))
+        self.DeleteBtn.setText(_translate("MainWindow", "Delete"))
+        self.RestoreBtn.setText(_translate("MainWindow", "Restore"))
+        self.SortBox.setToolTip(_translate("MainWindow", "Sort by"))
+        self.GroupCheckbox.setToolTip(_translate("MainWindow", "Show a collapsible header for every group"))
+        self.GroupCheckbox.setText(_translate("MainWindow", "Group"))
+        self.all_tasks_lbl.setText(_translate("MainWindow", "All Tasks"))
+        self.tasks_label.setText(_translate("MainWindow", "tasks"))
+        self.overdue_label.setText(_translate("MainWindow", "overdue"))
+        self.completed_label.setText(_translate("MainWindow", "completed"))
+        self.menu_header.setText(_translate("MainWindow", "Inbox"))